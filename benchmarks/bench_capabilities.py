@@ -0,0 +1,65 @@
+"""
+Benchmark for cached cursor-movement sequences.
+
+Measures the cost of resolving one frame's worth of ``term.move(y, x)``
+calls through blessed directly versus through a CapabilityCache, and the
+cost of rendering a full 200x60 frame with the cache in place.
+
+Run with: python benchmarks/bench_capabilities.py
+"""
+
+import io
+import os
+import timeit
+
+from blessed import Terminal
+
+from term_windows import CapabilityCache, FrameWriter, Screen
+
+ROWS, COLS = 60, 200
+REPEAT = 200
+
+
+def make_terminal():
+    """Return a styling xterm Terminal that writes nowhere."""
+    os.environ['COLUMNS'], os.environ['LINES'] = str(COLS), str(ROWS)
+    return Terminal(kind='xterm-256color', stream=io.StringIO(), force_styling=True)
+
+
+def moves_uncached(term):
+    for y in range(ROWS):
+        term.move(y, 0)
+        term.move(y, COLS - 1)
+
+
+def moves_cached(caps):
+    for y in range(ROWS):
+        caps.move(y, 0)
+        caps.move(y, COLS - 1)
+
+
+def main():
+    term = make_terminal()
+    caps = CapabilityCache(term)
+    moves_cached(caps)  # warm the cache
+
+    uncached = timeit.timeit(lambda: moves_uncached(term), number=REPEAT) / REPEAT
+    cached = timeit.timeit(lambda: moves_cached(caps), number=REPEAT) / REPEAT
+    print(f'{2 * ROWS} moves per frame ({COLS}x{ROWS} bordered window)')
+    print(f'  term.move():        {uncached * 1e3:8.3f} ms/frame')
+    print(f'  CapabilityCache:    {cached * 1e3:8.3f} ms/frame')
+    print(f'  saving:             {(uncached - cached) * 1e3:8.3f} ms/frame '
+          f'({uncached / cached:.1f}x)')
+
+    screen = Screen(term, writer=FrameWriter(io.StringIO()))
+
+    def full_frame():
+        screen.invalidate()
+        screen.render()
+
+    full = timeit.timeit(full_frame, number=REPEAT) / REPEAT
+    print(f'  full frame render:  {full * 1e3:8.3f} ms/frame')
+
+
+if __name__ == '__main__':
+    main()
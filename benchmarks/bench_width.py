@@ -0,0 +1,84 @@
+"""
+Benchmark for display-width measurement.
+
+Measures the ASCII hot path of the width layer against the plain string
+operations it replaces (``len()`` and slicing), the same operations on CJK
+text, wrapping 10,000 lines of each, and a full TextWindow repaint of a
+200x60 terminal showing ASCII and CJK text.
+
+Run with: python benchmarks/bench_width.py
+"""
+
+import io
+import os
+import timeit
+from array import array
+
+from blessed import Terminal
+
+from term_windows import FrameWriter, TextWindow, slice_columns, text_width, wrap_spans
+
+ROWS, COLS = 60, 200
+REPEAT = 200
+ASCII_LINE = 'request handled in 12ms status ok worker 7 ' * 5
+CJK_LINE = '日本語のテキストを表示するウィンドウ' * 6
+
+
+def make_terminal():
+    """Return a styling xterm Terminal that writes nowhere."""
+    os.environ['COLUMNS'], os.environ['LINES'] = str(COLS), str(ROWS)
+    return Terminal(kind='xterm-256color', stream=io.StringIO(), force_styling=True)
+
+
+def per_line(func, number=200000):
+    """Return the cost of one call in nanoseconds."""
+    return timeit.timeit(func, number=number) / number * 1e9
+
+
+def wrap_time(line):
+    """Return the milliseconds taken to wrap 10,000 copies of line to 80 columns."""
+    text = '\n'.join([line] * 10000)
+    spans = [(i * (len(line) + 1), i * (len(line) + 1) + len(line)) for i in range(10000)]
+
+    def wrap_all():
+        out = array('Q')
+        for start, end in spans:
+            wrap_spans(text, 80, start, end, out)
+
+    return min(timeit.repeat(wrap_all, number=1, repeat=3)) * 1e3
+
+
+def frame_time(term, line):
+    """Return the milliseconds taken to repaint a TextWindow full of line."""
+    window = TextWindow('\n'.join([line] * ROWS * 4), term=term)
+    window.screen.writer = FrameWriter(io.StringIO())
+
+    def repaint():
+        window.redraw = True
+        window.draw()
+
+    repaint()
+    return timeit.timeit(repaint, number=REPEAT) / REPEAT * 1e3
+
+
+def main():
+    text_width(CJK_LINE)  # build the width table
+
+    print(f'{"per line":<24} {"ASCII":>9} {"CJK":>9}')
+    print(f'{"  len()":<24} {per_line(lambda: len(ASCII_LINE)):>7.0f}ns')
+    print(f'{"  text_width()":<24} {per_line(lambda: text_width(ASCII_LINE)):>7.0f}ns '
+          f'{per_line(lambda: text_width(CJK_LINE)):>7.0f}ns')
+    print(f'{"  line[8:88]":<24} {per_line(lambda: ASCII_LINE[8:88]):>7.0f}ns')
+    print(f'{"  slice_columns()":<24} {per_line(lambda: slice_columns(ASCII_LINE, 8, 88)):>7.0f}ns '
+          f'{per_line(lambda: slice_columns(CJK_LINE, 8, 88)):>7.0f}ns')
+
+    print(f'{"wrap 10,000 lines":<24} {wrap_time(ASCII_LINE):>7.0f}ms {wrap_time(CJK_LINE):>7.0f}ms')
+
+    term = make_terminal()
+    print(f'TextWindow repaint ({COLS}x{ROWS})')
+    print(f'  ASCII:                {frame_time(term, ASCII_LINE):8.3f} ms/frame')
+    print(f'  CJK:                  {frame_time(term, CJK_LINE):8.3f} ms/frame')
+
+
+if __name__ == '__main__':
+    main()
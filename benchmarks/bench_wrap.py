@@ -0,0 +1,77 @@
+"""
+Benchmark for the wrapping engine.
+
+Wraps generated log-like text of 1 MB, 10 MB and 100 MB to an 80-column
+window the way TextWindow used to (``textwrap.wrap`` per source line,
+building strings) and with ``wrap_spans`` (offsets only), and checks that
+both produce the same rows.
+
+Run with: python benchmarks/bench_wrap.py [SIZE_MB ...]
+"""
+
+import random
+import sys
+import textwrap
+import time
+from array import array
+
+from term_windows import line_spans, wrap_spans
+
+WIDTH = 80
+WORDS = (
+    'request handled in ms status ok error retrying connection pool worker '
+    'well-known re-entrant user-agent -- timeout cache miss hit'
+).split()
+
+
+def make_text(size_mb):
+    """Return about size_mb megabytes of short and paragraph-length lines."""
+    rng = random.Random(size_mb)
+    target = size_mb * 1024 * 1024
+    lines = []
+    size = 0
+    while size < target:
+        words = rng.choices(WORDS, k=rng.choice((4, 8, 12, 60)))
+        line = f'2024-05-01 12:00:{len(lines) % 60:02d} ' + ' '.join(words)
+        lines.append(line)
+        size += len(line) + 1
+    return '\n'.join(lines)
+
+
+def wrap_textwrap(text):
+    rows = []
+    for line in text.splitlines() or ['']:
+        rows.extend(textwrap.wrap(line, WIDTH) or [''])
+    return rows
+
+
+def wrap_engine(text):
+    spans = array('Q')
+    for start, end in line_spans(text):
+        before = len(spans)
+        wrap_spans(text, WIDTH, start, end, spans)
+        if len(spans) == before:
+            spans.append(start)
+            spans.append(start)
+    return spans
+
+
+def timed(func, text):
+    start = time.perf_counter()
+    result = func(text)
+    return time.perf_counter() - start, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1, 10, 100]
+    print(f'{"size":>6} {"textwrap":>10} {"wrap_spans":>11} {"speedup":>8}')
+    for size_mb in sizes:
+        text = make_text(size_mb)
+        old_time, rows = timed(wrap_textwrap, text)
+        new_time, spans = timed(wrap_engine, text)
+        assert rows == [text[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2)]
+        print(f'{size_mb:>4}MB {old_time:>9.2f}s {new_time:>10.2f}s {old_time / new_time:>7.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -11,8 +11,18 @@ from .term_windows import (
     OffsetDimensions,
     Window,
     TextWindow,
+    FileWindow,
+    LogWindow,
     WindowController,
+    Timer,
 )
+from .ansi import StyleSpans, parse_ansi
+from .cellwidth import cells, fit_columns, printable, slice_columns, text_width
+from .fileindex import FileIndex
+from .screen import CapabilityCache, CursorOptimizer, FrameWriter, Screen
+from .search import TextSearch
+from .textindex import LogIndex, WrapIndex
+from .wrapping import line_spans, wrap, wrap_spans
 
 __all__ = [
     'Dimensions',
@@ -20,7 +30,28 @@ __all__ = [
     'OffsetDimensions',
     'Window',
     'TextWindow',
+    'FileWindow',
+    'LogWindow',
     'WindowController',
+    'Timer',
+    'Screen',
+    'FrameWriter',
+    'CapabilityCache',
+    'CursorOptimizer',
+    'WrapIndex',
+    'LogIndex',
+    'FileIndex',
+    'TextSearch',
+    'StyleSpans',
+    'parse_ansi',
+    'wrap',
+    'wrap_spans',
+    'line_spans',
+    'text_width',
+    'fit_columns',
+    'slice_columns',
+    'cells',
+    'printable',
 ]
 
 __version__ = '0.1.0'
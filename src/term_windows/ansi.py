@@ -0,0 +1,186 @@
+"""
+ANSI-styled text.
+
+This module splits text containing ANSI escape sequences (as written by
+colorizing tools) into plain text and a table of style runs, once, so the
+plain text can be wrapped and searched like any other and the styles applied
+to the cells that end up on screen.
+"""
+
+import bisect
+import re
+from array import array
+from typing import Dict, Iterator, List, Tuple
+
+# CSI sequences (SGR and others), OSC strings, character set selections and
+# other short escapes, and stray escape characters
+_escape_re = re.compile(
+    r'\x1b(?:\[([0-?]*)[ -/]*([@-~])|\][^\x07\x1b]*(?:\x07|\x1b\\)?|[ -/]+[0-~]|[@-Z\\-_])?'
+)
+
+# SGR codes that switch an attribute on, and the codes that switch them off
+_ATTR_ON = frozenset((1, 2, 3, 4, 5, 7, 8, 9))
+_ATTR_OFF = {21: (1,), 22: (1, 2), 23: (3,), 24: (4,), 25: (5,), 27: (7,), 28: (8,), 29: (9,)}
+
+
+class StyleSpans:
+    """Style runs over a plain text.
+
+    ``starts[i]`` is the offset where ``attrs[i]`` takes effect; it lasts
+    until the next start. Attributes are complete SGR sequences (``''`` for
+    the default style), suitable for :meth:`Screen.put`, and equal styles
+    share one string.
+
+    Attributes:
+        starts: Start offset of each run, ascending
+        attrs: SGR sequence of each run
+    """
+
+    def __init__(self, starts: array, attrs: List[str]):
+        self.starts = starts
+        self.attrs = attrs
+
+    def runs(self, start: int, end: int) -> Iterator[Tuple[int, int, str]]:
+        """Yield (start, end, attr) for the styled runs that overlap text[start:end]."""
+        starts, attrs = self.starts, self.attrs
+        index = max(0, bisect.bisect_right(starts, start) - 1)
+        while index < len(starts) and starts[index] < end:
+            run_end = starts[index + 1] if index + 1 < len(starts) else end
+            if attrs[index] and run_end > start:
+                yield max(start, starts[index]), min(end, run_end), attrs[index]
+            index += 1
+
+    def __len__(self):
+        return len(self.starts)
+
+
+def parse_ansi(text: str) -> Tuple[str, StyleSpans]:
+    """Split ANSI-styled text into plain text and its style runs.
+
+    SGR sequences set the style of the text after them; other escape
+    sequences are dropped. Tabs are expanded to 8-column stops, as
+    :class:`WrapIndex` would, so offsets in the plain text are final.
+
+    Returns:
+        The plain text and its StyleSpans
+    """
+    pieces = []
+    length = column = 0
+    starts, attrs = array('Q'), []
+    # The SGR sequence of a style identifies it, so style changes are
+    # memoised as (style, parameters) -> style
+    states: Dict[str, Dict[str, str]] = {'': {}}
+    changes: Dict[Tuple[str, str], str] = {}
+    current = ''
+    pos = 0
+    expand = '\t' in text
+
+    def add(piece):
+        nonlocal column
+        if '\t' in piece:
+            # Expand relative to the column the piece starts at
+            piece = ('x' * column + piece).expandtabs()[column:]
+        line_end = max(piece.rfind('\n'), piece.rfind('\r'))
+        column = len(piece) - line_end - 1 if line_end >= 0 else column + len(piece)
+        return piece
+
+    for match in _escape_re.finditer(text):
+        start = match.start()
+        if start > pos:
+            piece = text[pos:start]
+            if expand:
+                piece = add(piece)
+            pieces.append(piece)
+            length += len(piece)
+        pos = match.end()
+        params, final = match.groups()
+        if final != 'm':
+            continue
+        attr = changes.get((current, params))
+        if attr is None:
+            state = dict(states[current])
+            _apply_sgr(state, params)
+            attr = _sgr(state)
+            states.setdefault(attr, state)
+            changes[current, params] = attr
+        if attr != current:
+            if starts and starts[-1] == length:
+                # Nothing was written in the previous style
+                starts.pop()
+                attrs.pop()
+            if (attrs[-1] if attrs else '') != attr:
+                starts.append(length)
+                attrs.append(attr)
+            current = attr
+    if pos < len(text):
+        piece = text[pos:]
+        pieces.append(add(piece) if expand else piece)
+    return ''.join(pieces), StyleSpans(starts, attrs)
+
+
+def _apply_sgr(state: Dict[str, str], params: str):
+    """Update a style with the parameters of one SGR sequence.
+
+    Parameters are separated by ``;``; a parameter with ``:`` subparameters
+    (``4:3``, ``38:2::r:g:b``) is one code with its arguments.
+    """
+    codes = params.split(';') if params else ['0']
+    i = 0
+    while i < len(codes):
+        parts = codes[i].split(':')
+        code = int(parts[0]) if parts[0].isdigit() else 0
+        if code == 0:
+            state.clear()
+        elif code == 4 and len(parts) > 1:
+            # Underline style: 4:0 is none, any other style is underlined
+            if parts[1] in ('', '0'):
+                state.pop('a4', None)
+            else:
+                state['a4'] = '4'
+        elif code in _ATTR_ON:
+            state[f'a{code}'] = str(code)
+        elif code in _ATTR_OFF:
+            for attr in _ATTR_OFF[code]:
+                state.pop(f'a{attr}', None)
+        elif 30 <= code <= 37 or 90 <= code <= 97:
+            state['fg'] = str(code)
+        elif 40 <= code <= 47 or 100 <= code <= 107:
+            state['bg'] = str(code)
+        elif code == 39:
+            state.pop('fg', None)
+        elif code == 49:
+            state.pop('bg', None)
+        elif code in (38, 48) and len(parts) > 1:
+            color = _color_args(parts[1], parts[2:])
+            if color:
+                state['fg' if code == 38 else 'bg'] = f'{code};{color}'
+        elif code in (38, 48) and i + 1 < len(codes):
+            # 256-color (5;n) or truecolor (2;r;g;b)
+            count = {'5': 2, '2': 4}.get(codes[i + 1], 1)
+            state['fg' if code == 38 else 'bg'] = ';'.join(codes[i:i + 1 + count])
+            i += count
+        i += 1
+
+
+def _color_args(kind: str, args: List[str]) -> str:
+    """Return the ``5;n`` or ``2;r;g;b`` form of colon-separated color arguments, or ''.
+
+    Truecolor may carry a color space id before r:g:b, usually left empty
+    (``2::r:g:b``).
+    """
+    if kind == '5' and args:
+        return f'5;{args[0] or 0}'
+    if kind == '2' and len(args) >= 3:
+        if len(args) >= 4:
+            args = args[1:]
+        return '2;' + ';'.join(arg or '0' for arg in args[:3])
+    return ''
+
+
+def _sgr(state: Dict[str, str]) -> str:
+    """Return the SGR sequence that sets a style from the default one."""
+    if not state:
+        return ''
+    params = [state[key] for key in sorted(k for k in state if k.startswith('a'))]
+    params += [state[key] for key in ('fg', 'bg') if key in state]
+    return f'\x1b[{";".join(params)}m'
@@ -0,0 +1,219 @@
+"""
+Display width of text.
+
+Terminals give East Asian wide characters (CJK ideographs, most emoji) two
+columns and combining marks none, so the length of a string is not the
+number of columns it takes on screen. This module measures text in columns,
+splits it into grapheme clusters (a character plus the marks that combine
+with it) and clips it to a range of columns. ASCII text, where length and
+width agree, is recognised with ``str.isascii()`` (a flag check) and takes
+the plain ``len()`` path. Other code points are looked up in a table
+computed once for the Basic Multilingual Plane, or through an LRU cache
+above it.
+"""
+
+import functools
+import re
+import unicodedata
+from typing import Iterator, List, Tuple
+
+_ZWJ = '\u200d'
+# Skin tone modifiers, which change the emoji before them
+_MODIFIER_FIRST, _MODIFIER_LAST = '\U0001F3FB', '\U0001F3FF'
+# Regional indicator letters, which pair up into flags
+_REGIONAL_FIRST, _REGIONAL_LAST = '\U0001F1E6', '\U0001F1FF'
+
+# Width of every BMP code point, and regexes matching runs of wide and of
+# zero-width BMP characters; built on first use
+_bmp_widths = None
+_wide_run_re = None
+_zero_run_re = None
+_astral_re = re.compile('[\U00010000-\U0010ffff]')
+# C0 and C1 control characters other than tab
+_control_re = re.compile('[\x00-\x08\x0a-\x1f\x7f-\x9f]')
+
+
+def _measure(char: str) -> int:
+    """Compute the column width of a character from the Unicode database."""
+    code = ord(char)
+    if 0x1160 <= code <= 0x11ff:
+        # Hangul medial vowels and final consonants join the preceding syllable
+        return 0
+    category = unicodedata.category(char)
+    if category in ('Mn', 'Me') or (category == 'Cf' and char != '\xad'):
+        return 0
+    return 2 if unicodedata.east_asian_width(char) in ('W', 'F') else 1
+
+
+def _run_re(widths: bytes, width: int):
+    """Compile a regex matching runs of the BMP characters of a width."""
+    ranges = []
+    code = 0
+    while code < len(widths):
+        if widths[code] != width:
+            code += 1
+            continue
+        start = code
+        while code < len(widths) and widths[code] == width:
+            code += 1
+        ranges.append(f'{re.escape(chr(start))}-{re.escape(chr(code - 1))}')
+    return re.compile(f'[{"".join(ranges)}]+')
+
+
+def _widths() -> bytes:
+    """Return the width table for the BMP, building it on first use."""
+    global _bmp_widths, _wide_run_re, _zero_run_re
+    if _bmp_widths is None:
+        widths = bytes(_measure(chr(code)) for code in range(0x10000))
+        _wide_run_re = _run_re(widths, 2)
+        _zero_run_re = _run_re(widths, 0)
+        _bmp_widths = widths
+    return _bmp_widths
+
+
+@functools.lru_cache(maxsize=4096)
+def _astral_width(char: str) -> int:
+    return _measure(char)
+
+
+def char_width(char: str) -> int:
+    """Return the number of columns a single character takes (0, 1 or 2).
+
+    Control characters count as one column, as they do for ASCII text.
+    """
+    code = ord(char)
+    if code < 0x80:
+        return 1
+    if code < 0x10000:
+        return _widths()[code]
+    return _astral_width(char)
+
+
+def clusters(text: str) -> Iterator[Tuple[int, int, int]]:
+    """Yield (start, end, width) for each grapheme cluster of text.
+
+    A cluster is a character followed by the zero-width characters that
+    combine with it, the skin tone modifiers that change it, and the
+    characters joined to it with a zero-width joiner (as in emoji
+    sequences); it takes the width of its first character. Two regional
+    indicators make one flag, two columns wide. Zero-width characters at
+    the start of the text form a cluster of their own, of width 0.
+    """
+    start = None
+    width = 0
+    joined = False
+    flag = False
+    for index, char in enumerate(text):
+        char_columns = char_width(char)
+        if start is not None:
+            if joined or not char_columns or _MODIFIER_FIRST <= char <= _MODIFIER_LAST:
+                joined = char == _ZWJ
+                flag = False
+                continue
+            if flag and _REGIONAL_FIRST <= char <= _REGIONAL_LAST:
+                width = 2
+                flag = False
+                continue
+            yield start, index, width
+        start, width, joined = index, char_columns, char == _ZWJ
+        flag = _REGIONAL_FIRST <= char <= _REGIONAL_LAST
+    if start is not None:
+        yield start, len(text), width
+
+
+def text_width(text: str) -> int:
+    """Return the number of columns text takes on screen."""
+    if text.isascii():
+        return len(text)
+    if _ZWJ in text or _astral_re.search(text):
+        return sum(width for _, _, width in clusters(text))
+    _widths()
+    # Runs of wide and zero-width characters are found by regex, so a line
+    # of CJK text is measured in a few matches rather than per character
+    return (len(text) + sum(map(len, _wide_run_re.findall(text)))
+            - sum(map(len, _zero_run_re.findall(text))))
+
+
+def fit_columns(text: str, start: int, end: int, columns: int) -> int:
+    """Return where the longest prefix of text[start:end] at most columns wide ends.
+
+    The prefix ends on a cluster boundary, so a wide character that would
+    straddle the limit is left out, and the zero-width characters that
+    follow the last character kept are kept with it. Only the characters up
+    to the limit are visited.
+    """
+    if text.isascii():
+        return min(end, start + max(0, columns))
+    used = 0
+    joined = False
+    index = start
+    while index < end:
+        char = text[index]
+        width = char_width(char)
+        if joined or not width or (index > start and _MODIFIER_FIRST <= char <= _MODIFIER_LAST):
+            joined = char == _ZWJ
+            index += 1
+            continue
+        step = 1
+        if (_REGIONAL_FIRST <= char <= _REGIONAL_LAST and index + 1 < end
+                and _REGIONAL_FIRST <= text[index + 1] <= _REGIONAL_LAST):
+            width, step = 2, 2
+        if used + width > columns:
+            break
+        used += width
+        joined = char == _ZWJ
+        index += step
+    return index
+
+
+def slice_columns(text: str, start: int, stop: int) -> str:
+    """Return the part of text shown between columns start and stop.
+
+    A wide character cut by either edge is replaced by a space for each of
+    its columns that falls inside the range, so the result is exactly as
+    wide as the columns the text covers there.
+    """
+    if text.isascii():
+        return text[start:stop] if 0 <= start <= stop else text[max(0, start):max(0, start, stop)]
+    start = max(0, start)
+    parts = []
+    column = 0
+    for cluster_start, cluster_end, width in clusters(text):
+        end = column + width
+        if column >= start and end <= stop:
+            parts.append(text[cluster_start:cluster_end])
+        elif column < stop and end > start:
+            parts.append(' ' * (min(end, stop) - max(column, start)))
+        column = end
+        if column >= stop:
+            break
+    return ''.join(parts)
+
+
+def cells(text: str) -> List[str]:
+    """Split text into screen cells.
+
+    Each cluster fills one cell, and a wide cluster is followed by an empty
+    string for the column it covers. Leading zero-width characters, which
+    have nothing to combine with, are dropped.
+    """
+    result = []
+    for start, end, width in clusters(text):
+        if width:
+            result.append(text[start:end])
+            if width == 2:
+                result.append('')
+    return result
+
+
+def printable(text: str) -> str:
+    """Return text with control characters replaced by U+FFFD.
+
+    Lines read from files and logs may hold escape sequences, bells and
+    other controls that would act on the terminal if written to it. Each
+    becomes one replacement character, one column wide like the control it
+    replaces, so offsets and widths are unchanged.
+    """
+    if text.isprintable():
+        return text
+    return _control_re.sub('\ufffd', text)
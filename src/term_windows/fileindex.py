@@ -0,0 +1,122 @@
+"""
+Line index over a memory-mapped file.
+
+This module lets a window page through files far larger than memory: the
+file is mapped rather than read, its line offsets are collected a chunk at a
+time (typically on a worker thread), and a line is only decoded when it
+is looked up.
+"""
+
+import mmap
+import os
+import threading
+from array import array
+from typing import Optional
+
+
+class FileIndex:
+    """Memory-mapped file exposed as a sequence of decoded lines.
+
+    Line start offsets are kept in an ``array('Q')`` that grows as
+    :meth:`index_more` scans the file. Lookups and the row count work on the
+    lines found so far, with :meth:`estimated_rows` extrapolating the total
+    from the bytes scanned, so the file can be shown and scrolled while it
+    is still being indexed. :meth:`index_more` may run on a worker thread
+    while another thread reads the index.
+
+    Attributes:
+        path: Path of the mapped file
+        encoding: Encoding used to decode lines
+        errors: Error handler used when decoding
+        size: File size in bytes when it was opened
+    """
+
+    #: Bytes scanned per call to index_more()
+    CHUNK_BYTES = 1 << 20
+
+    def __init__(self, path, encoding: str = 'utf-8', errors: str = 'replace'):
+        self.path = os.fspath(path)
+        self.encoding = encoding
+        self.errors = errors
+        self._file = open(self.path, 'rb')
+        self.size = os.fstat(self._file.fileno()).st_size
+        # Empty files cannot be mapped; they have a single blank line
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else None
+        # Start of every line, plus one past the end of the last complete line
+        self._starts = array('Q', [0, 1] if not self.size else [0])
+        self._indexed = 0
+        self._lock = threading.Lock()
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole file has been scanned."""
+        return self._indexed >= self.size
+
+    @property
+    def known_rows(self) -> int:
+        """Number of lines found so far."""
+        return len(self._starts) - 1
+
+    def estimated_rows(self) -> int:
+        """Return the line count, extrapolated from the bytes scanned while indexing."""
+        known = self.known_rows
+        if self.complete or not self._indexed:
+            return known
+        return max(known, round(known * self.size / self._indexed))
+
+    def index_more(self, max_bytes: Optional[int] = None) -> bool:
+        """Scan up to max_bytes more of the file for line breaks.
+
+        Returns:
+            True if part of the file is still unscanned
+        """
+        with self._lock:
+            pos = self._indexed
+            if pos >= self.size or self._map is None:
+                return False
+            end = min(self.size, pos + (max_bytes or self.CHUNK_BYTES))
+            found = array('Q')
+            find = self._map.find
+            newline = find(b'\n', pos, end)
+            while newline != -1:
+                found.append(newline + 1)
+                newline = find(b'\n', newline + 1, end)
+            self._starts.extend(found)
+            if end == self.size and self._starts[-1] < end:
+                # The last line has no line break
+                self._starts.append(end + 1)
+            self._indexed = end
+            return end < self.size
+
+    def ensure_rows(self, rows: int):
+        """Scan until at least rows lines are known (or the whole file is)."""
+        while self.known_rows < rows and self.index_more():
+            pass
+
+    def close(self):
+        """Release the mapping; a concurrent index_more() finishes its chunk first."""
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+        self._file.close()
+
+    def __getitem__(self, row: int) -> str:
+        if row < 0:
+            raise IndexError(row)
+        self.ensure_rows(row + 1)
+        if row >= self.known_rows:
+            raise IndexError(row)
+        if self._map is None:
+            return ''
+        data = self._map[self._starts[row]:self._starts[row + 1] - 1]
+        if data.endswith(b'\r'):
+            data = data[:-1]
+        line = data.decode(self.encoding, self.errors)
+        return line.expandtabs() if '\t' in line else line
+
+    def __len__(self):
+        """Return the exact line count; this scans the whole file."""
+        while self.index_more():
+            pass
+        return self.known_rows
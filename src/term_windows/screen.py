@@ -0,0 +1,532 @@
+"""
+Screen buffer for terminal-based UIs.
+
+This module provides a double-buffered grid of terminal cells. Windows draw
+into the grid, and only the cells that changed since the last flushed frame
+are sent to the terminal, batched into a single write per frame.
+"""
+
+import io
+import os
+import select
+import sys
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import List
+
+from .cellwidth import cells
+
+
+@dataclass
+class SavedRegion:
+    """A snapshot of screen cells, used to restore what a window covered.
+
+    Attributes:
+        y: Top row of the region
+        x: Left column of the region
+        width: Number of columns saved
+        height: Number of rows saved
+        chars: Saved glyphs, one list per row
+        attrs: Saved attributes, one list per row
+        lefts: First column saved on each row; a row is widened to take in
+            the wide characters its edges cut
+    """
+    y: int
+    x: int
+    width: int
+    height: int
+    chars: List[list] = field(default_factory=list, repr=False)
+    attrs: List[list] = field(default_factory=list, repr=False)
+    lefts: List[int] = field(default_factory=list, repr=False)
+
+
+class FrameWriter:
+    """Accumulates a frame of output and sends it with a single write.
+
+    Text is encoded as it is added, and :meth:`flush` hands the whole buffer
+    to ``os.write`` on the stream's file descriptor, retrying on partial
+    writes. Streams without a usable descriptor (such as test doubles) fall
+    back to ``stream.write()``.
+
+    Attributes:
+        stream: Output stream, typically the Terminal's stream
+        encoding: Encoding used for the pre-encoded buffer
+    """
+
+    def __init__(self, stream=None, encoding=None):
+        self.stream = stream if stream is not None else sys.__stdout__
+        stream_encoding = getattr(self.stream, 'encoding', None)
+        if not isinstance(stream_encoding, str):
+            stream_encoding = None
+        self.encoding = encoding or stream_encoding or 'utf-8'
+        self._buffer = bytearray()
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def write(self, text):
+        """Append text to the pending frame."""
+        self._buffer += text.encode(self.encoding, 'replace')
+
+    def flush(self):
+        """Send the pending frame to the terminal."""
+        if not self._buffer:
+            return
+        data, self._buffer = self._buffer, bytearray()
+        fd = self._fileno()
+        if fd is None:
+            self.stream.write(data.decode(self.encoding))
+            self.stream.flush()
+            return
+        # Anything printed through the text layer must land before the frame
+        self.stream.flush()
+        view = memoryview(data)
+        while view:
+            try:
+                written = os.write(fd, view)
+            except BlockingIOError:
+                select.select([], [fd], [])
+                continue
+            view = view[written:]
+
+    def _fileno(self):
+        """Return the stream's file descriptor, or None if it has none."""
+        try:
+            fd = self.stream.fileno()
+        except (AttributeError, OSError, ValueError, io.UnsupportedOperation):
+            return None
+        return fd if isinstance(fd, int) else None
+
+
+class CapabilityCache:
+    """Memoizes cursor-movement and capability strings for a Terminal.
+
+    Blessed resolves every ``term.move(y, x)`` or ``term.normal`` through its
+    formatting machinery. The strings only depend on the Terminal, so they are
+    computed once and reused until the cache is cleared. A new cache should be
+    used (or :meth:`clear` called) whenever the Terminal is replaced.
+
+    Attributes:
+        term: Blessed Terminal instance the strings are computed for
+    """
+
+    def __init__(self, term):
+        self.term = term
+        self._moves = {}
+        self._caps = {}
+
+    def move(self, y, x):
+        """Return the sequence moving the cursor to row y, column x."""
+        try:
+            return self._moves[y, x]
+        except KeyError:
+            seq = self._moves[y, x] = self.term.move(y, x)
+            return seq
+
+    def cap(self, name, *args):
+        """Return a capability string, calling it with args if given."""
+        key = (name, *args)
+        try:
+            return self._caps[key]
+        except KeyError:
+            value = getattr(self.term, name)
+            if args:
+                value = value(*args)
+            self._caps[key] = value
+            return value
+
+    def clear(self):
+        """Drop all cached strings."""
+        self._moves.clear()
+        self._caps.clear()
+
+
+class CursorOptimizer:
+    """Chooses the cheapest byte sequence for moving the cursor.
+
+    Like curses, the optimizer compares every way of reaching the target cell
+    and keeps the shortest: absolute positioning (CUP), horizontal absolute
+    (HPA), relative moves (CUF/CUB/CUU/CUD), carriage return plus line feeds,
+    or re-emitting the glyphs already on screen between the cursor and the
+    target. Capabilities the terminal lacks are skipped.
+
+    Attributes:
+        caps: CapabilityCache supplying the escape sequences
+        encoding: Encoding used to measure re-emitted glyphs
+    """
+
+    def __init__(self, caps, encoding='utf-8'):
+        self.caps = caps
+        self.encoding = encoding
+
+    def move(self, from_y, from_x, y, x, chars=None, attrs=None, pen=''):
+        """Return the cheapest sequence moving the cursor to row y, column x.
+
+        Args:
+            from_y: Current cursor row, or None if the position is unknown
+            from_x: Current cursor column
+            y: Target row
+            x: Target column
+            chars: Glyphs currently shown on the target row, if known
+            attrs: Attributes of those glyphs
+            pen: Attribute currently in effect; only glyphs drawn with it
+                can be re-emitted
+        """
+        cup = self.caps.move(y, x)
+        if from_y is None or not cup:
+            return cup
+        best = cup
+        if from_y == y:
+            return self._cheapest(best, self._horizontal(from_x, x, chars, attrs, pen))
+        dy = y - from_y
+        vertical = self._cap('move_down', dy) if dy > 0 else self._cap('move_up', -dy)
+        if vertical:
+            best = self._cheapest(best, vertical + self._horizontal(from_x, x, chars, attrs, pen))
+        if dy > 0:
+            cr, lf = self._cap('cr'), self._cap('cud1')
+            if cr and lf == '\n':
+                best = self._cheapest(
+                    best, cr + lf * dy + self._horizontal(0, x, chars, attrs, pen)
+                )
+        return best
+
+    def _horizontal(self, from_x, x, chars, attrs, pen):
+        """Return the cheapest same-row move, or None if there is none."""
+        if from_x == x:
+            return ''
+        best = self._cap('move_x', x) or None
+        if x > from_x:
+            best = self._cheapest(best, self._cap('move_right', x - from_x))
+            best = self._cheapest(best, self._reemit(from_x, x, chars, attrs, pen))
+        else:
+            best = self._cheapest(best, self._cap('move_left', from_x - x))
+            cr = self._cap('cr')
+            if cr:
+                if x == 0:
+                    best = self._cheapest(best, cr)
+                else:
+                    forward = self._cheapest(
+                        self._cap('move_right', x), self._reemit(0, x, chars, attrs, pen)
+                    )
+                    if forward:
+                        best = self._cheapest(best, cr + forward)
+        return best
+
+    def _reemit(self, start, end, chars, attrs, pen):
+        """Return the glyphs in start..end if they can simply be re-drawn."""
+        if chars is None or any(attr != pen for attr in attrs[start:end]):
+            return None
+        if start < len(chars) and chars[start] == '':
+            # The cursor is on the covered half of a wide glyph
+            return None
+        return ''.join(chars[start:end])
+
+    def _cheapest(self, best, candidate):
+        """Return whichever of two sequences is shorter in bytes."""
+        if candidate is None:
+            return best
+        if best is None or self._cost(candidate) < self._cost(best):
+            return candidate
+        return best
+
+    def _cost(self, seq):
+        return len(seq) if seq.isascii() else len(seq.encode(self.encoding, 'replace'))
+
+    def _cap(self, name, *args):
+        value = self.caps.cap(name, *args)
+        return value if isinstance(value, str) else ''
+
+
+class Screen:
+    """A double-buffered grid of terminal cells.
+
+    Each cell holds a glyph and an attribute string (an SGR sequence such as
+    ``term.bold`` or ``''`` for normal text). A glyph is a grapheme cluster;
+    a wide one is followed by a cell holding ``''``, which is covered by it. Drawing only updates the front
+    buffer; :meth:`flush` compares it against the last flushed frame and emits
+    the cells that differ.
+
+    Flushes can be batched with :meth:`frame`: inside a frame, :meth:`flush`
+    is deferred until the outermost frame ends, so a window stack can be drawn
+    and sent to the terminal as a single update.
+
+    Attributes:
+        term: Blessed Terminal instance used for cursor movement and styling
+        caps: CapabilityCache for the Terminal's escape sequences
+        cursor: CursorOptimizer used to move between changed cells
+        writer: FrameWriter that sends each flushed frame to the terminal
+        width: Number of columns in the grid
+        height: Number of rows in the grid
+    """
+
+    _screens = weakref.WeakKeyDictionary()
+
+    def __init__(self, term, writer=None):
+        self.term = term
+        self.caps = CapabilityCache(term)
+        self.writer = writer if writer is not None else FrameWriter(term.stream)
+        self.cursor = CursorOptimizer(self.caps, self.writer.encoding)
+        self.width = term.width
+        self.height = term.height
+        self._chars = [[' '] * self.width for _ in range(self.height)]
+        self._attrs = [[''] * self.width for _ in range(self.height)]
+        # Last flushed frame; None means the terminal contents are unknown
+        self._shown_chars = None
+        self._shown_attrs = None
+        self._dirty = set()
+        self._frame_depth = 0
+        # Sequences (such as hardware scrolls) to send ahead of the next diff
+        self._prefix = []
+
+    @classmethod
+    def for_terminal(cls, term):
+        """Return the shared screen for a Terminal, creating it if needed."""
+        screen = cls._screens.get(term)
+        if screen is None:
+            screen = cls._screens[term] = cls(term)
+        return screen
+
+    def put(self, y, x, text, attr=''):
+        """Write text into the front buffer, clipped to the screen bounds.
+
+        Args:
+            y: Row of the first character
+            x: Column of the first character
+            text: Text to write (must not contain control characters); a
+                wide character takes two cells
+            attr: SGR attribute string applied to every written cell
+        """
+        if not 0 <= y < self.height:
+            return
+        # Other text is split into cells, with '' for the second column of
+        # a wide character
+        split = not text.isascii()
+        glyphs = cells(text) if split else text
+        if x < 0:
+            glyphs = glyphs[-x:]
+            x = 0
+        end = min(self.width, x + len(glyphs))
+        if end <= x:
+            return
+        chars = self._chars[y]
+        if chars[x] == '' and x > 0:
+            # Overwriting the right half of a wide character
+            chars[x - 1] = ' '
+        if split:
+            kept = glyphs[:end - x]
+            # A wide character cut by the screen edge shows as a space
+            if kept[0] == '':
+                kept[0] = ' '
+            if len(glyphs) > end - x and glyphs[end - x] == '':
+                kept[-1] = ' '
+            chars[x:end] = kept
+        else:
+            chars[x:end] = glyphs[:end - x]
+        self._attrs[y][x:end] = [attr] * (end - x)
+        if end < self.width and chars[end] == '':
+            # Overwriting the left half of a wide character
+            chars[end] = ' '
+        self._dirty.add(y)
+
+    def fill(self, y, x, width, height, char=' ', attr=''):
+        """Fill a rectangle of the front buffer with a single glyph."""
+        row = char * max(0, width)
+        for row_y in range(y, y + height):
+            self.put(row_y, x, row, attr)
+
+    def cell(self, y, x):
+        """Return the (glyph, attribute) pair stored at a cell."""
+        return self._chars[y][x], self._attrs[y][x]
+
+    def row_text(self, y):
+        """Return the glyphs of a row as a string."""
+        return ''.join(self._chars[y])
+
+    def save(self, y, x, width, height):
+        """Snapshot a rectangle of the front buffer.
+
+        The rectangle is clipped to the screen, and the returned region records
+        the requested bounds so callers can tell whether it still matches.
+        Wide characters cut by its left or right edge are saved whole.
+        """
+        region = SavedRegion(y, x, width, height)
+        left, right = max(0, x), max(0, min(self.width, x + width))
+        for row in range(max(0, y), min(self.height, y + height)):
+            chars = self._chars[row]
+            start, stop = left, right
+            if start < stop:
+                if start > 0 and chars[start] == '':
+                    start -= 1
+                if stop < self.width and chars[stop] == '':
+                    stop += 1
+            region.chars.append(chars[start:stop])
+            region.attrs.append(self._attrs[row][start:stop])
+            region.lefts.append(start)
+        return region
+
+    def restore(self, region):
+        """Copy a saved region back into the front buffer."""
+        top = max(0, region.y)
+        rows = zip(region.lefts, region.chars, region.attrs)
+        for offset, (left, chars, attrs) in enumerate(rows):
+            row = top + offset
+            if row >= self.height:
+                break
+            end = min(self.width, left + len(chars))
+            if end <= left:
+                continue
+            line = self._chars[row]
+            if left > 0 and line[left] == '':
+                # The cells beside the region changed since it was saved;
+                # as in put(), a wide character split by the restore is blanked
+                line[left - 1] = ' '
+            line[left:end] = chars[:end - left]
+            self._attrs[row][left:end] = attrs[:end - left]
+            if end < self.width and line[end] == '':
+                line[end] = ' '
+            self._dirty.add(row)
+
+    def scroll(self, top, bottom, lines, left=0, right=None):
+        """Scroll a band of rows using the terminal's scroll region.
+
+        Rows ``top`` to ``bottom`` (inclusive) of the front buffer are shifted
+        up by ``lines`` (down if negative) between columns ``left`` and
+        ``right``, and the exposed rows are blanked for the caller to redraw.
+        The terminal is scrolled with DECSTBM plus index or reverse index, so
+        unchanged rows are not re-sent. Hardware scrolling moves whole rows;
+        cells outside the column range are repaired by the next diff.
+
+        Returns:
+            True if a hardware scroll was queued, False if the caller's redraw
+            will be sent as ordinary cell updates.
+        """
+        right = self.width if right is None else min(right, self.width)
+        top, bottom = max(0, top), min(self.height - 1, bottom)
+        count = bottom - top + 1
+        if lines == 0 or abs(lines) >= count:
+            return False
+        self._shift_rows(self._chars, self._attrs, top, bottom, lines, left, right)
+        self._dirty.update(range(top, bottom + 1))
+        if self._shown_chars is None:
+            return False
+
+        region = self.caps.cap('change_scroll_region', top, bottom)
+        reset = self.caps.cap('change_scroll_region', 0, self.height - 1)
+        step = self.caps.cap('ind' if lines > 0 else 'ri')
+        if not all(isinstance(seq, str) and seq for seq in (region, reset, step)):
+            return False
+        anchor = bottom if lines > 0 else top
+        self._prefix.append(region + self.caps.move(anchor, 0) + step * abs(lines) + reset)
+        self._shift_rows(self._shown_chars, self._shown_attrs, top, bottom, lines, 0, self.width)
+        return True
+
+    @staticmethod
+    def _shift_rows(chars, attrs, top, bottom, lines, left, right):
+        """Shift cells between two columns of a band of rows, blanking the gap."""
+        band = range(top, bottom + 1)
+        char_rows = [chars[y][left:right] for y in band]
+        attr_rows = [attrs[y][left:right] for y in band]
+        blank_chars = [[' '] * (right - left) for _ in range(abs(lines))]
+        blank_attrs = [[''] * (right - left) for _ in range(abs(lines))]
+        if lines > 0:
+            char_rows = char_rows[lines:] + blank_chars
+            attr_rows = attr_rows[lines:] + blank_attrs
+        else:
+            char_rows = blank_chars + char_rows[:lines]
+            attr_rows = blank_attrs + attr_rows[:lines]
+        for y, row_chars, row_attrs in zip(band, char_rows, attr_rows):
+            chars[y][left:right] = row_chars
+            attrs[y][left:right] = row_attrs
+
+    def invalidate(self):
+        """Forget the terminal contents so the next flush repaints everything."""
+        self._shown_chars = None
+        self._shown_attrs = None
+        self._prefix.clear()
+
+    @contextmanager
+    def frame(self):
+        """Batch all flushes inside the block into one update."""
+        self._frame_depth += 1
+        try:
+            yield self
+        finally:
+            self._frame_depth -= 1
+        self.flush()
+
+    def flush(self):
+        """Send changed cells to the terminal, unless a frame is in progress."""
+        if self._frame_depth:
+            return
+        output = self.render()
+        if output:
+            self.writer.write(output)
+            self.writer.flush()
+
+    def render(self):
+        """Return the escape sequences that bring the terminal up to date.
+
+        The front buffer is copied into the shown buffer, so calling this
+        twice in a row returns an empty string the second time.
+        """
+        move = self.cursor.move
+        width = self.width
+        full = self._shown_chars is None
+        if full:
+            self._shown_chars = [[None] * width for _ in range(self.height)]
+            self._shown_attrs = [[None] * width for _ in range(self.height)]
+            rows = range(self.height)
+        else:
+            rows = sorted(self._dirty)
+        self._dirty.clear()
+
+        parts = self._prefix
+        self._prefix = []
+        pen = ''
+        # Anything may have moved the cursor since the last frame
+        cursor_y = cursor_x = None
+        for y in rows:
+            chars, attrs = self._chars[y], self._attrs[y]
+            shown_chars, shown_attrs = self._shown_chars[y], self._shown_attrs[y]
+            if chars == shown_chars and attrs == shown_attrs:
+                continue
+            x = 0
+            while x < width:
+                if chars[x] == shown_chars[x] and attrs[x] == shown_attrs[x]:
+                    x += 1
+                    continue
+                start = x
+                while x < width and (chars[x] != shown_chars[x] or attrs[x] != shown_attrs[x]):
+                    x += 1
+                # A wide glyph is sent whole, from its first cell
+                if chars[start] == '' and start > 0:
+                    start -= 1
+                while x < width and chars[x] == '':
+                    x += 1
+                parts.append(move(cursor_y, cursor_x, y, start, shown_chars, shown_attrs, pen))
+                pen = self._emit_run(parts, chars, attrs, start, x, pen)
+                # Writing the last column leaves the cursor in an ambiguous state
+                cursor_y, cursor_x = (y, x) if x < width else (None, None)
+            shown_chars[:] = chars
+            shown_attrs[:] = attrs
+        if pen:
+            parts.append(self.caps.cap('normal'))
+        return ''.join(parts)
+
+    def _emit_run(self, parts, chars, attrs, start, end, pen):
+        """Append cells start..end of a row, switching attributes as needed."""
+        x = start
+        while x < end:
+            attr = attrs[x]
+            run_end = x + 1
+            while run_end < end and attrs[run_end] == attr:
+                run_end += 1
+            if attr != pen:
+                if pen:
+                    parts.append(self.caps.cap('normal'))
+                parts.append(attr)
+                pen = attr
+            parts.append(''.join(chars[x:run_end]))
+            x = run_end
+        return pen
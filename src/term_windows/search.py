@@ -0,0 +1,91 @@
+"""
+Incremental literal search over a text.
+
+This module finds every occurrence of a string in a text a chunk at a time,
+so a window can show the first hits while the rest of a large text is still
+being searched (typically on a worker thread), and keeps the hit offsets
+sorted so stepping from one hit to the next is a binary search.
+"""
+
+import bisect
+from array import array
+from typing import Optional
+
+
+class TextSearch:
+    """Occurrences of a literal string in a text, found incrementally.
+
+    Hits are the start offsets of non-overlapping matches, kept in an
+    ``array('Q')`` in text order. :meth:`search_more` scans the next chunk
+    of the text; it may run on a worker thread while another thread reads
+    the hits found so far.
+
+    Attributes:
+        text: Text being searched
+        query: String searched for
+    """
+
+    #: Characters scanned per call to search_more()
+    CHUNK_CHARS = 1 << 20
+
+    def __init__(self, text: str, query: str):
+        self.text = text
+        self.query = query
+        self.hits = array('Q')
+        self._searched = 0
+        self._complete = not query
+
+    @property
+    def complete(self) -> bool:
+        """Whether the whole text has been searched."""
+        return self._complete
+
+    @property
+    def searched(self) -> int:
+        """Offset up to which the text has been searched."""
+        return self._searched
+
+    def search_more(self, max_chars: Optional[int] = None) -> bool:
+        """Search up to max_chars more of the text.
+
+        Returns:
+            True if part of the text is still unsearched
+        """
+        if self._complete:
+            return False
+        text, query = self.text, self.query
+        pos = self._searched
+        stop = min(len(text), pos + (max_chars or self.CHUNK_CHARS))
+        # Matches starting before stop may run past it
+        end = min(len(text), stop + len(query) - 1)
+        found = array('Q')
+        find = text.find
+        hit = find(query, pos, end)
+        while hit != -1:
+            found.append(hit)
+            pos = hit + len(query)
+            hit = find(query, pos, end)
+        self.hits.extend(found)
+        self._searched = max(stop, pos)
+        if stop == len(text):
+            self._complete = True
+        return not self._complete
+
+    def next_hit(self, offset: int) -> Optional[int]:
+        """Return the index of the first hit found at or after offset, or None."""
+        index = bisect.bisect_left(self.hits, offset)
+        return index if index < len(self.hits) else None
+
+    def previous_hit(self, offset: int) -> Optional[int]:
+        """Return the index of the last hit found before offset, or None."""
+        index = bisect.bisect_left(self.hits, offset) - 1
+        return index if index >= 0 else None
+
+    def hits_between(self, start: int, end: int) -> range:
+        """Return the indexes of the hits that overlap text[start:end]."""
+        first = bisect.bisect_right(self.hits, start - len(self.query))
+        return range(first, bisect.bisect_left(self.hits, end))
+
+    def __len__(self):
+        """Return the number of hits found so far."""
+        return len(self.hits)
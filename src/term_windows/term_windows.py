@@ -5,30 +5,120 @@ This module provides the base classes for creating terminal windows with borders
 layout constraints, input handling, and a reusable controller for window stacks.
 """
 
+import asyncio
+import collections
+import concurrent.futures
+import functools
+import heapq
+import inspect
+import itertools
+import os
+import selectors
 import signal
-import textwrap
+import threading
 import time
+import weakref
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from blessed import Terminal
 
+from .ansi import parse_ansi
+from .cellwidth import fit_columns, printable, slice_columns, text_width
+from .fileindex import FileIndex
+from .screen import SavedRegion, Screen
+from .search import TextSearch
+from .textindex import LogIndex, WrapIndex
 
-@dataclass
-class Dimensions:
+
+class _Observable:
+    """Something layouts can be derived from.
+
+    Derived layouts register with :meth:`_watch` and have their
+    ``_invalidate_layout()`` called whenever :meth:`_notify` reports a
+    change. Observers are held weakly, so a window that is dropped does not
+    stay registered with a shared rectangle.
+    """
+
+    def _watch(self, observer):
+        """Invalidate observer whenever this changes."""
+        observers = self.__dict__.get('_observers')
+        if observers is None:
+            observers = self.__dict__['_observers'] = weakref.WeakSet()
+        observers.add(observer)
+
+    def _unwatch(self, observer):
+        """Stop invalidating observer."""
+        observers = self.__dict__.get('_observers')
+        if observers is not None:
+            observers.discard(observer)
+
+    def _notify(self):
+        """Invalidate every observer."""
+        for observer in list(self.__dict__.get('_observers') or ()):
+            observer._invalidate_layout()
+
+
+@dataclass(init=False)
+class Dimensions(_Observable):
     """Represents window dimensions (position and size).
     
     All fields are optional and can be None, int, or float.
     Float values are interpreted as relative values (0.0 to 1.0) when used
     in ConstrainedDimensions, representing a fraction of the container size.
+
+    Assigning a field invalidates the ConstrainedDimensions and
+    OffsetDimensions derived from it.
     """
     x: Optional[Union[int, float]] = None
     y: Optional[Union[int, float]] = None
     width: Optional[Union[int, float]] = None
     height: Optional[Union[int, float]] = None
 
+    def __init__(self, x: Optional[Union[int, float]] = None, y: Optional[Union[int, float]] = None,
+                 width: Optional[Union[int, float]] = None, height: Optional[Union[int, float]] = None):
+        # Damage rectangles are created per row while drawing, so the fields
+        # are stored directly rather than through __setattr__
+        fields = self.__dict__
+        fields['x'], fields['y'], fields['width'], fields['height'] = x, y, width, height
+
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if self.__dict__.get('_observers'):
+            self._notify()
+
+
+class _DerivedDimensions(_Observable):
+    """A rectangle resolved from two others and cached until either changes.
+
+    ``x``, ``y``, ``width`` and ``height`` are computed on first access and
+    then stored on the instance, so reading them again is a plain attribute
+    lookup. Assigning a field of either source rectangle, or replacing one,
+    drops the cached values (and those of any rectangle derived from this
+    one).
+    """
+
+    _FIELDS = ('x', 'y', 'width', 'height')
+
+    def _set_source(self, name: str, value):
+        """Replace a source rectangle and watch it for changes."""
+        old = self.__dict__.get(name)
+        if old is not None:
+            old._unwatch(self)
+        self.__dict__[name] = value
+        value._watch(self)
+        self._invalidate_layout()
+
+    def _invalidate_layout(self):
+        """Drop the resolved rectangle."""
+        cached = self.__dict__
+        if any(field in cached for field in self._FIELDS):
+            for field in self._FIELDS:
+                cached.pop(field, None)
+            self._notify()
+
 
-class ConstrainedDimensions:
+class ConstrainedDimensions(_DerivedDimensions):
     """Dimensions that are constrained within a parent container.
     
     This class is used to constrain window dimensions within a parent container,
@@ -45,6 +135,10 @@ class ConstrainedDimensions:
     dynamic resizing: when the terminal window is resized, all UI elements using
     relative dimensions automatically resize proportionally, maintaining their
     layout relationships.
+
+    The resolved rectangle is computed once and cached until a field of
+    ``base`` or ``constraints`` is assigned, so drawing code can read
+    ``x``, ``y``, ``width`` and ``height`` as often as it likes.
     
     Attributes:
         base: The base dimensions to constrain (desired position/size)
@@ -55,6 +149,22 @@ class ConstrainedDimensions:
         self.base = base
         self.constraints = constraints
 
+    @property
+    def base(self) -> Dimensions:
+        return self.__dict__['_base']
+
+    @base.setter
+    def base(self, value: Dimensions):
+        self._set_source('_base', value)
+
+    @property
+    def constraints(self) -> Dimensions:
+        return self.__dict__['_constraints']
+
+    @constraints.setter
+    def constraints(self, value: Dimensions):
+        self._set_source('_constraints', value)
+
     @staticmethod
     def _clamp(val, minval, maxval):
         """Clamp a value between min and max, handling relative float values."""
@@ -64,7 +174,7 @@ class ConstrainedDimensions:
         else:
             return max(minval, min(maxval, val))
 
-    @property
+    @functools.cached_property
     def x(self):
         """X position, centered if base.x is None."""
         if self.base.x is None:
@@ -76,7 +186,7 @@ class ConstrainedDimensions:
                 self.constraints.x + self.constraints.width
             )
 
-    @property
+    @functools.cached_property
     def y(self):
         """Y position, centered if base.y is None."""
         if self.base.y is None:
@@ -88,7 +198,7 @@ class ConstrainedDimensions:
                 self.constraints.y + self.constraints.height
             )
 
-    @property
+    @functools.cached_property
     def width(self):
         """Width, constrained to fit within parent."""
         if self.base.width is None:
@@ -100,7 +210,7 @@ class ConstrainedDimensions:
         )
         return clamped or self.constraints.width
 
-    @property
+    @functools.cached_property
     def height(self):
         """Height, constrained to fit within parent."""
         if self.base.height is None:
@@ -113,10 +223,12 @@ class ConstrainedDimensions:
         return clamped or self.constraints.height
 
 
-class OffsetDimensions:
+class OffsetDimensions(_DerivedDimensions):
     """Dimensions offset from a base position.
     
     This is used to calculate content area within a window (accounting for borders).
+    Like ConstrainedDimensions, the result is cached until ``base`` or
+    ``offsets`` changes.
     
     Attributes:
         base: The base dimensions
@@ -128,32 +240,90 @@ class OffsetDimensions:
         self.offsets = offsets
 
     @property
+    def base(self) -> Dimensions:
+        return self.__dict__['_base']
+
+    @base.setter
+    def base(self, value: Dimensions):
+        self._set_source('_base', value)
+
+    @property
+    def offsets(self) -> Dimensions:
+        return self.__dict__['_offsets']
+
+    @offsets.setter
+    def offsets(self, value: Dimensions):
+        self._set_source('_offsets', value)
+
+    @functools.cached_property
     def x(self):
         """X position with offset applied."""
         return self.base.x + self.offsets.x if self.base.x is not None else None
 
-    @property
+    @functools.cached_property
     def y(self):
         """Y position with offset applied."""
         return self.base.y + self.offsets.y if self.base.y is not None else None
 
-    @property
+    @functools.cached_property
     def width(self):
         """Width with offset applied."""
         return self.base.width + self.offsets.width if self.base.width is not None else None
 
-    @property
+    @functools.cached_property
     def height(self):
         """Height with offset applied."""
         return self.base.height + self.offsets.height if self.base.height is not None else None
 
 
+def _intersect(a: Dimensions, b: Dimensions) -> Optional[Dimensions]:
+    """Return the overlap of two rectangles, or None if they do not overlap."""
+    x, y = max(a.x, b.x), max(a.y, b.y)
+    right = min(a.x + a.width, b.x + b.width)
+    bottom = min(a.y + a.height, b.y + b.height)
+    if right <= x or bottom <= y:
+        return None
+    return Dimensions(x, y, right - x, bottom - y)
+
+
+def _merge_rects(rects: List[Dimensions]) -> List[Dimensions]:
+    """Merge overlapping or edge-sharing rectangles into their bounding boxes.
+
+    Rectangles are combined when they overlap, or when they touch and their
+    bounding box covers no extra cells, so the result has no overlaps.
+    """
+    merged = list(rects)
+    changed = True
+    while changed:
+        changed = False
+        for i in range(len(merged)):
+            for j in range(i + 1, len(merged)):
+                a, b = merged[i], merged[j]
+                x, y = min(a.x, b.x), min(a.y, b.y)
+                width = max(a.x + a.width, b.x + b.width) - x
+                height = max(a.y + a.height, b.y + b.height) - y
+                if (_intersect(a, b) is None
+                        and width * height != a.width * a.height + b.width * b.height):
+                    continue
+                merged[i] = Dimensions(x, y, width, height)
+                del merged[j]
+                changed = True
+                break
+            if changed:
+                break
+    return merged
+
+
 class Window:
     """Base class for terminal windows.
     
     Provides border drawing, input handling, and layout management.
     Windows can have child windows that appear on top (modal dialogs).
     
+    Setting ``redraw = True`` requests a full redraw. To repaint only part of
+    a window, call :meth:`invalidate` with the damaged rectangle; during the
+    next ``draw()`` the merged rectangles are available as ``damage``.
+    
     Attributes:
         title: Window title displayed in top border
         border: Whether to draw a border around the window
@@ -164,7 +334,10 @@ class Window:
         position: ConstrainedDimensions for window position and size
         content: OffsetDimensions for content area (inside borders)
         term: Blessed Terminal instance
+        screen: Screen buffer the window draws into
         redraw: Whether the window needs to be redrawn
+        damage: Rectangles (in screen coordinates) being repainted by the
+            current draw()
     """
     
     def __init__(self, title="", width=None, height=None, border=True, 
@@ -176,6 +349,9 @@ class Window:
         self.closed = False
         self.child = None
         self.controller = None
+        self.damage: List[Dimensions] = []
+        self._redraw = False
+        self._damage: List[Dimensions] = []
         
         if term is None:
             term = Terminal()
@@ -204,48 +380,111 @@ class Window:
         self._term = value
         self.handle_resize()
 
+    @property
+    def screen(self):
+        """Screen buffer the window draws into.
+
+        Windows managed by a controller share the controller's screen; other
+        windows share the screen associated with their Terminal.
+        """
+        if self.controller is not None:
+            return self.controller.screen
+        return Screen.for_terminal(self.term)
+
+    @property
+    def redraw(self):
+        """Whether the window needs to be redrawn."""
+        return self._redraw
+
+    @redraw.setter
+    def redraw(self, value):
+        """Request (or cancel) a redraw of the whole window."""
+        self._redraw = bool(value)
+        self._damage = []
+
+    @property
+    def rect(self) -> Dimensions:
+        """Screen rectangle covered by the window, including its border."""
+        position = self.position
+        return Dimensions(position.x, position.y, position.width, position.height)
+
+    def invalidate(self, rect: Optional[Dimensions] = None):
+        """Mark part of the window as needing a redraw.
+        
+        Args:
+            rect: Damaged rectangle in screen coordinates, or None for the
+                whole window. Rectangles recorded before the next draw() are
+                merged into a minimal set.
+        """
+        if rect is None:
+            self.redraw = True
+        elif not self._redraw:
+            self._redraw = True
+            self._damage = [rect]
+        elif self._damage:
+            self._damage = _merge_rects(self._damage + [rect])
+
+    def is_damaged(self, rect: Dimensions) -> bool:
+        """Return whether a rectangle overlaps the damage being repainted."""
+        return any(_intersect(rect, damaged) is not None for damaged in self.damage)
+
+    def _take_damage(self) -> List[Dimensions]:
+        """Return the pending damage and clear the redraw request."""
+        damage = self._damage or [self.rect]
+        self.redraw = False
+        return damage
+
     def draw(self):
         """Draw the window border and content.
         
-        Subclasses should call super().draw() first, then draw their content.
+        Subclasses should draw inside ``with self.screen.frame():``, calling
+        super().draw() first and then drawing their content into
+        ``self.screen``; the border and content are sent as one update when
+        the block ends. Only the parts of the window listed in
+        ``self.damage`` need to be repainted.
         """
-        self.redraw = False
+        if self.redraw:
+            self.damage = self._take_damage()
         if not self.border:
             return
+        screen = self.screen
+        x, y = self.position.x, self.position.y
+        width, height = self.position.width, self.position.height
         
         # Top border with title
-        title_text = f' {self.title} '.center(self.position.width - 2, '-')
-        title_text = title_text[:self.position.width - 2]
+        title = f' {self.title} '
+        title_text = title.center(len(title) + max(0, width - 2 - text_width(title)), '-')
+        title_text = slice_columns(title_text, 0, width - 2)
         corner = '+' if self.scroll_pos is None else '^'
-        print(
-            self.term.move(self.position.y, self.position.x) +
-            '+' + title_text + corner,
-            end=''
-        )
+        top_line = '+' + title_text + corner
         
         # Bottom border with status bar
         info = f' {self.status_bar} ' if self.status_bar else ''
-        dashes = '-' * max(0, self.position.width - 2 - len(info))
+        dashes = '-' * max(0, width - 2 - text_width(info))
         corner = '+' if self.scroll_pos is None else 'v'
-        print(
-            self.term.move(self.position.y + self.position.height - 1, self.position.x) +
-            '+' + dashes + info + corner,
-            end=''
-        )
+        bottom_line = slice_columns('+' + dashes + info, 0, width - 1) + corner
         
         # Left and right borders (with scrollbar indicator)
         scroll_row = None if self.scroll_pos is None else int(self.scroll_pos * self.content.height)
-        for row in range(self.content.height):
-            right_char = '=' if row == scroll_row else '|'
-            print(
-                self.term.move(self.content.y + row, self.position.x) +
-                '|' +
-                (' ' * (self.position.width - 2)) +
-                self.term.move(self.content.y + row, self.position.x + self.position.width - 1) +
-                right_char,
-                end=''
-            )
-        print('', end='', flush=True)
+        for area in self.damage:
+            area = _intersect(area, self.rect)
+            if area is None:
+                continue
+            start, end = area.x - x, area.x + area.width - x
+            for row_y in range(area.y, area.y + area.height):
+                if row_y == y:
+                    line = top_line
+                elif row_y == y + height - 1:
+                    line = bottom_line
+                else:
+                    right_char = '=' if row_y - self.content.y == scroll_row else '|'
+                    line = '|' + (' ' * (width - 2)) + right_char
+                if line.isascii():
+                    screen.put(row_y, area.x, line[start:end])
+                else:
+                    # Cutting the row could split a wide character
+                    screen.put(row_y, x, line)
+        screen.flush()
 
     def handle_input(self, key):
         """Handle keyboard input.
@@ -268,6 +507,7 @@ class Window:
         self.position.constraints.y = 0
         self.position.constraints.width = self.term.width
         self.position.constraints.height = self.term.height
+        self.redraw = True
 
     def close(self):
         """Mark the window as closed.
@@ -288,83 +528,521 @@ class TextWindow(Window):
     """A window that displays scrollable text content.
     
     Automatically wraps text to fit the window width and provides
-    keyboard scrolling controls.
+    keyboard scrolling controls. Scrolling by less than a page moves the
+    visible lines with the terminal's scroll region and only draws the
+    newly exposed lines and the scrollbar.
+
+    Wrapping is lazy: only the lines around the viewport are wrapped when
+    drawn, and the index from source lines to wrapped rows that sizes the
+    scrollbar is completed on one of the controller's worker threads while
+    the window is shown, with the status bar reporting progress. A resize
+    that re-wraps the text cancels the job for the old width.
+
+    ``/`` prompts for a string to search for, and ``n``/``N`` move to the
+    next and previous hit. The source text is searched rather than the
+    wrapped rows, so hits are offsets that stay valid across resizes and
+    are mapped to rows through the line index. Long texts are searched on
+    a worker thread, with hits highlighted as they are found.
+
+    With ``wrap=False`` source lines are shown whole, one per row, and the
+    left/right arrows scroll sideways; only the visible columns are drawn,
+    and a resize does not need to re-index the text.
+
+    Text containing ANSI escape sequences (colorized tool output) is split
+    once into plain text and a table of style runs: the plain text is what
+    is wrapped, searched and measured, and each drawn row is styled from
+    the runs it covers.
+
+    Attributes:
+        text: The text shown, without escape sequences
+        styles: StyleSpans of an ANSI-styled text, or None
+        wrap: Whether lines are wrapped to the window width
+        hscroll: Column shown at the left edge when lines are not wrapped
     """
+
+    #: Whether ``/`` searches the text
+    SEARCHABLE = True
+    #: Whether ANSI escape sequences in the text are parsed into styles
+    ANSI_STYLES = True
+    #: Columns moved by the left/right arrows when lines are not wrapped
+    HSCROLL_STEP = 8
+    #: Source lines indexed between progress reports
+    INDEX_SLICE = 2000
+    #: Wrap widths remembered per window, so resizing back and forth is instant
+    WRAP_CACHE_SIZE = 4
+    #: Texts up to this many characters are indexed in full on resize, so
+    #: the window can shrink to fit them
+    EAGER_INDEX_CHARS = 65536
     
-    def __init__(self, text, *args, **kwargs):
+    def __init__(self, text, *args, wrap: bool = True, **kwargs):
         """Initialize a text window.
         
         Args:
             text: Text content (string, list, or tuple of lines)
             *args, **kwargs: Passed to Window.__init__()
+            wrap: Wrap lines to the window width; if False, long lines are
+                clipped and can be scrolled sideways
         """
-        self.text = "\n".join(text) if isinstance(text, (list, tuple)) else text
+        self.wrap = wrap
         self.scroll = 0
-        self._lines = []
+        self.hscroll = 0
+        self._pending_scroll = 0
+        self.styles = None
+        self._wrap_cache = collections.OrderedDict()
+        self._indexing = None
+        self._search = None
+        self._search_hit = None
+        self._search_from = 0
+        self._search_prompt = None
+        self._searching = None
+        self.text = text
         super().__init__(*args, **kwargs)
 
+    @property
+    def text(self) -> str:
+        """The text shown, without escape sequences."""
+        return self._text
+
+    @text.setter
+    def text(self, value):
+        """Replace the text, parsing its ANSI styles again and dropping any search.
+
+        The new text is wrapped lazily at the current width; call
+        handle_resize() to fit the window to it.
+        """
+        text = "\n".join(value) if isinstance(value, (list, tuple)) else value
+        styles = None
+        if self.ANSI_STYLES and '\x1b' in text:
+            text, styles = parse_ansi(text)
+        self._text = text
+        self.styles = styles
+        self._cancel_search()
+        self._search = None
+        self._search_hit = None
+        self._cancel_indexing()
+        if hasattr(self, '_lines'):
+            self._lines = self._wrap_index(self._lines.width)
+        else:
+            self._lines = WrapIndex(text, 1)
+        self.scroll = 0
+        self.hscroll = 0
+        self._pending_scroll = 0
+        self.redraw = True
+
+    def _wrap_index(self, width: Optional[int]) -> WrapIndex:
+        """Return the text wrapped to width, reusing a recent wrap of the same text."""
+        key = (id(self.text), width)
+        index = self._wrap_cache.get(key)
+        # The cached index holds a reference to its text, so a matching id
+        # can only be reused by the same object
+        if index is not None and index.text is self.text:
+            self._wrap_cache.move_to_end(key)
+            return index
+        if self._lines.text is self.text:
+            index = self._lines.with_width(width)
+        else:
+            index = WrapIndex(self.text, width)
+        self._wrap_cache[key] = index
+        while len(self._wrap_cache) > self.WRAP_CACHE_SIZE:
+            self._wrap_cache.popitem(last=False)
+        return index
+
+    def _total_lines(self) -> int:
+        """Return the wrapped line count, indexing enough to scroll a page past the viewport.
+
+        While indexing is incomplete the count is an estimate that is never
+        smaller than what is known, so scrolling bounds stay exact.
+        """
+        self._lines.ensure_rows(self.scroll + 2 * self.content.height)
+        return self._lines.estimated_rows()
+
+    def _invalidate_scrollbar(self):
+        """Repaint the scrollbar marker on the right border."""
+        self.invalidate(Dimensions(
+            self.position.x + self.position.width - 1, self.content.y, 1, self.content.height
+        ))
+
+    def _invalidate_status_bar(self):
+        """Repaint the bottom border, where the status bar is shown."""
+        self.invalidate(Dimensions(
+            self.position.x, self.position.y + self.position.height - 1, self.position.width, 1
+        ))
+
+    def _start_indexing(self):
+        """Start completing the line index on a worker thread."""
+        controller = self.controller
+        stop = threading.Event()
+        job = controller.submit(self._index_in_background, self._lines, controller, stop)
+        self._indexing = (job, stop)
+
+    def _cancel_indexing(self):
+        """Stop indexing a wrap that is no longer shown."""
+        if self._indexing:
+            job, stop = self._indexing
+            job.cancel()
+            stop.set()
+        self._indexing = None
+
+    def _index_in_background(self, lines, controller, stop):
+        """Index the rest of the text, reporting progress to the UI loop after each slice.
+
+        Runs on a worker thread until the index is complete, the job is
+        cancelled, or the window leaves the controller.
+        """
+        try:
+            while not stop.is_set() and self.controller is controller:
+                more = lines.index_more(self.INDEX_SLICE)
+                controller.post(self._indexing_progress, lines)
+                if not more:
+                    break
+        finally:
+            controller.post(self._indexing_stopped, stop)
+
+    def _indexing_progress(self, lines):
+        """Refresh the scrollbar and loading status as the index grows."""
+        if lines is self._lines:
+            # The estimated total only moves the scrollbar marker
+            self._invalidate_scrollbar()
+            self._invalidate_status_bar()
+
+    def _indexing_stopped(self, stop):
+        """Forget a finished indexing job, so draw() can start another if needed."""
+        if self._indexing and self._indexing[1] is stop:
+            self._indexing = None
+
+    def search(self, query: str):
+        """Search the text for query and show the first hit at or below the top of the view.
+
+        The first chunk of the text is searched at once. Under a controller
+        the rest is searched on a worker thread; until a hit is found the
+        view stays where it is. An empty query clears the search.
+
+        Raises:
+            RuntimeError: If the window is not SEARCHABLE
+        """
+        if not self.SEARCHABLE:
+            raise RuntimeError(f"{type(self).__name__} does not support search.")
+        self._cancel_search()
+        self._search = TextSearch(self._lines.expanded_text, query) if query else None
+        self._search_hit = None
+        self._invalidate_content()
+        self._invalidate_status_bar()
+        if self._search is None:
+            return
+        self._search_from = self._view_offset()
+        self._search.search_more()
+        self._show_first_hit()
+        if not self._search.complete and self.controller is not None:
+            controller = self.controller
+            stop = threading.Event()
+            job = controller.submit(self._search_in_background, self._search, controller, stop)
+            self._searching = (job, stop)
+
+    def _cancel_search(self):
+        """Stop searching for a query that has been replaced."""
+        if self._searching:
+            job, stop = self._searching
+            job.cancel()
+            stop.set()
+        self._searching = None
+
+    def _search_in_background(self, search, controller, stop):
+        """Search the rest of the text, reporting each chunk's hits to the UI loop."""
+        while not stop.is_set() and self.controller is controller:
+            first_new = len(search)
+            more = search.search_more()
+            controller.post(self._search_progress, search, first_new)
+            if not more:
+                break
+
+    def _search_progress(self, search, first_new):
+        """Show hits found by the search thread."""
+        if search is not self._search:
+            return
+        self._invalidate_status_bar()
+        if self._search_hit is None:
+            self._show_first_hit()
+        elif len(self._visible_hits(range(first_new, len(search)))):
+            self._invalidate_content()
+
+    def _show_first_hit(self):
+        """Move to the first hit below where the search started, once it is found."""
+        search = self._search
+        index = search.next_hit(self._search_from)
+        if index is None and search.complete and len(search):
+            index = 0  # Wrap around to the top
+        if index is not None:
+            self._show_hit(index)
+
+    def _step_search(self, direction: int):
+        """Move to the next (1) or previous (-1) hit, wrapping around at the ends.
+
+        Steps from the current hit while it is on screen, and from the top
+        of the view otherwise.
+        """
+        search = self._search
+        if search is None or not len(search):
+            return
+        if self._search_hit is not None and len(self._visible_hits(range(self._search_hit, self._search_hit + 1))):
+            offset = search.hits[self._search_hit]
+            index = search.next_hit(offset + 1) if direction > 0 else search.previous_hit(offset)
+        else:
+            offset = self._view_offset()
+            index = search.next_hit(offset) if direction > 0 else search.previous_hit(offset)
+        if index is None:
+            if not search.complete:
+                return
+            index = 0 if direction > 0 else len(search) - 1
+        self._show_hit(index)
+
+    def _show_hit(self, index: int):
+        """Make a hit current and scroll it into the middle of the view if it is off screen."""
+        self._search_hit = index
+        self._invalidate_status_bar()
+        hit = self._search.hits[index]
+        row = self._lines.row_of(hit)
+        if not self.wrap:
+            width = self.content.width - 2
+            column = text_width(self._lines.expanded_text[self._lines.row_span(row)[0]:hit])
+            if not self.hscroll <= column <= self.hscroll + width - text_width(self._search.query):
+                self.hscroll = max(0, column - width // 2)
+                self._invalidate_content()
+        height = self.content.height
+        if self.scroll <= row < self.scroll + height:
+            return
+        max_scroll = max(0, self._total_lines() - height)
+        target = max(0, min(row - height // 2, max_scroll))
+        self._scroll_by(target - self.scroll)
+
+    def _view_offset(self) -> int:
+        """Return the text offset at the top of the view."""
+        if self.scroll >= self._lines.known_rows:
+            return len(self._lines.expanded_text)
+        return self._lines.row_span(self.scroll)[0]
+
+    def _visible_hits(self, hits: range) -> range:
+        """Return the part of a range of hit indexes that is on screen."""
+        lines = self._lines
+        last = min(self.scroll + self.content.height, lines.known_rows) - 1
+        if last < self.scroll:
+            return range(0)
+        visible = self._search.hits_between(lines.row_span(self.scroll)[0], lines.row_span(last)[1])
+        return range(max(hits.start, visible.start), min(hits.stop, visible.stop))
+
+    def _invalidate_content(self):
+        """Repaint the text area."""
+        self.invalidate(Dimensions(self.content.x, self.content.y, self.content.width, self.content.height))
+
+    def _search_status(self) -> str:
+        """Return the status bar text describing the search, or '' when there is none."""
+        search = self._search
+        if search is None:
+            return ''
+        more = '' if search.complete else '+'
+        if not len(search):
+            return f'/{search.query}: {"searching" if more else "not found"}, '
+        current = '-' if self._search_hit is None else self._search_hit + 1
+        return f'/{search.query}: {current}/{len(search)}{more}, n/N=Next/Prev, '
+
+    def _visible_span(self, text: str) -> Tuple[int, int]:
+        """Return the offsets of the part of a row's text that is in view."""
+        width = self.content.width - 2
+        left = fit_columns(text, 0, len(text), self.hscroll)
+        # One more column takes in a wide character cut by the right edge
+        return left, fit_columns(text, 0, len(text), self.hscroll + width + 1)
+
+    def _put_columns(self, screen, y: int, text: str, start: int, end: int, attr: str):
+        """Draw text[start:end] of a row with attr, clipped to the columns in view."""
+        column = (start if text.isascii() else text_width(text[:start])) - self.hscroll
+        width = self.content.width - 2
+        piece = slice_columns(text[start:end], -column, width - column)
+        if piece:
+            screen.put(y, self.content.x + 1 + max(0, column), piece, attr)
+
+    def _draw_styles(self, screen, row: int, y: int, text: str):
+        """Apply the ANSI styles of the text to a drawn row."""
+        start = self._lines.row_span(row)[0]
+        first, last = self._visible_span(text)
+        for run_start, run_end, attr in self.styles.runs(start + first, start + last):
+            self._put_columns(screen, y, text, run_start - start, run_end - start, attr)
+
+    def _draw_hits(self, screen, row: int, y: int, text: str):
+        """Highlight the search hits on a drawn row."""
+        search = self._search
+        start = self._lines.row_span(row)[0]
+        first, last = self._visible_span(text)
+        attr = screen.caps.cap('reverse')
+        for index in search.hits_between(start + first, start + last):
+            hit = search.hits[index] - start
+            left, right = max(hit, first), min(hit + len(search.query), last)
+            if left < right:
+                self._put_columns(screen, y, text, left, right, attr)
+
     def draw(self):
         """Draw the window with text content."""
-        max_content_height = self.content.height
-        total_lines = len(self._lines)
-        below_the_fold = total_lines - max_content_height
-        
-        # Update scroll position indicator
-        self.scroll_pos = None
-        if below_the_fold > 0:
-            self.scroll_pos = self.scroll / below_the_fold
-            self.status_bar = '[Arrows/PgUp/PgDn=Scroll, Esc=Close]'
-        else:
-            self.status_bar = '[Esc=Close]'
-        
-        # Draw border
-        super().draw()
-        
-        # Draw text lines
-        for i in range(max_content_height):
-            line_idx = self.scroll + i
-            if line_idx < total_lines:
-                line = self._lines[line_idx][:self.content.width - 2]
+        # One frame, so the border pass that blanks the content area is not
+        # sent on its own when drawn outside a controller
+        with self.screen.frame():
+            border_state = (self.scroll_pos is None, self.status_bar)
+            max_content_height = self.content.height
+            total_lines = self._total_lines()
+            if not self._lines.complete and not self._indexing and self.controller is not None:
+                self._start_indexing()
+            below_the_fold = total_lines - max_content_height
+            info = self._search_status()
+            if self._indexing and not self._lines.complete:
+                info += f'Loading {100 * self._lines.known_rows // max(1, total_lines)}%, '
+
+            # Update scroll position indicator
+            self.scroll_pos = None
+            if below_the_fold > 0:
+                self.scroll_pos = self.scroll / below_the_fold
+                self.status_bar = f'[{info}Arrows/PgUp/PgDn=Scroll, Esc=Close]'
             else:
-                line = ""
-            print(
-                self.term.move(self.content.y + i, self.content.x + 1) + 
-                line.ljust(self.content.width - 2),
-                end=''
-            )
-        print('', end='', flush=True)
+                self.status_bar = f'[{info}Esc=Close]'
+            if self._search_prompt is not None:
+                self.status_bar = f'[/{self._search_prompt}]'
+
+            # Move lines already on screen instead of redrawing them; this must
+            # happen before the border pass blanks the exposed rows
+            if self.redraw:
+                self.damage = self._take_damage()
+            screen = self.screen
+            if self._pending_scroll and self.damage != [self.rect]:
+                screen.scroll(
+                    self.content.y, self.content.y + max_content_height - 1,
+                    self._pending_scroll,
+                    self.content.x, self.content.x + self.content.width
+                )
+            self._pending_scroll = 0
+            if (self.scroll_pos is None, self.status_bar) != border_state:
+                # The corners show whether the text scrolls, and the bottom
+                # border holds the status bar
+                x, width = self.position.x, self.position.width
+                self.damage = _merge_rects(self.damage + [
+                    Dimensions(x, self.position.y, width, 1),
+                    Dimensions(x, self.position.y + self.position.height - 1, width, 1),
+                ])
+
+            # Draw border
+            super().draw()
+
+            # Draw text lines
+            for i in range(max_content_height):
+                if not self.is_damaged(Dimensions(self.content.x, self.content.y + i, self.content.width, 1)):
+                    continue
+                line_idx = self.scroll + i
+                width = self.content.width - 2
+                if line_idx < self._lines.known_rows:
+                    # Controls in the text must not reach the terminal
+                    text = printable(self._lines[line_idx])
+                    line = slice_columns(text, self.hscroll, self.hscroll + width)
+                else:
+                    text = line = ""
+                screen.put(
+                    self.content.y + i, self.content.x + 1,
+                    line + ' ' * (width - text_width(line))
+                )
+                if self.styles is not None and line:
+                    self._draw_styles(screen, line_idx, self.content.y + i, text)
+                if self._search is not None and line:
+                    self._draw_hits(screen, line_idx, self.content.y + i, text)
 
     def handle_input(self, key):
-        """Handle scrolling input."""
+        """Handle scrolling and search input."""
+        if self._search_prompt is not None:
+            self._edit_search_prompt(key)
+            return
+        if self.SEARCHABLE and not key.is_sequence:
+            match str(key):
+                case '/':
+                    self._search_prompt = ''
+                    self._invalidate_status_bar()
+                    return
+                case 'n':
+                    self._step_search(1)
+                    return
+                case 'N':
+                    self._step_search(-1)
+                    return
+        if not self.wrap and key.name in ('KEY_LEFT', 'KEY_RIGHT'):
+            self._hscroll_by(self.HSCROLL_STEP if key.name == 'KEY_RIGHT' else -self.HSCROLL_STEP)
+            return
         max_content_height = self.content.height
-        total_lines = len(self._lines)
+        total_lines = self._total_lines()
         
         if total_lines > max_content_height:
             match key.name:
                 case 'KEY_DOWN':
                     if self.scroll < total_lines - max_content_height:
-                        self.scroll += 1
-                        self.redraw = True
+                        self._scroll_by(1)
                 case 'KEY_UP':
                     if self.scroll > 0:
-                        self.scroll -= 1
-                        self.redraw = True
+                        self._scroll_by(-1)
                 case 'KEY_PGDOWN':
                     if self.scroll < total_lines - max_content_height:
-                        self.scroll = min(
+                        self._scroll_by(min(
                             self.scroll + max_content_height, 
                             total_lines - max_content_height
-                        )
-                        self.redraw = True
+                        ) - self.scroll)
                 case 'KEY_PGUP':
                     if self.scroll > 0:
-                        self.scroll = max(self.scroll - max_content_height, 0)
-                        self.redraw = True
+                        self._scroll_by(max(self.scroll - max_content_height, 0) - self.scroll)
                 case _:
                     super().handle_input(key)
         else:
             super().handle_input(key)
 
+    def _hscroll_by(self, delta):
+        """Scroll unwrapped lines sideways and redraw the text area.
+
+        Scrolling right stops once the longest row on screen is in view.
+        """
+        width = self.content.width - 2
+        rows = range(self.scroll, min(self.scroll + self.content.height, self._lines.known_rows))
+        longest = max((text_width(self._lines[row]) for row in rows), default=0)
+        hscroll = self.hscroll + delta
+        if delta > 0:
+            hscroll = min(hscroll, max(self.hscroll, longest - width))
+        hscroll = max(0, hscroll)
+        if hscroll != self.hscroll:
+            self.hscroll = hscroll
+            self._invalidate_content()
+
+    def _edit_search_prompt(self, key):
+        """Edit the search prompt; Enter searches and Esc cancels."""
+        match key.name:
+            case 'KEY_ENTER':
+                query, self._search_prompt = self._search_prompt, None
+                self.search(query)
+            case 'KEY_ESCAPE':
+                self._search_prompt = None
+            case 'KEY_BACKSPACE' | 'KEY_DELETE':
+                self._search_prompt = self._search_prompt[:-1]
+            case _:
+                if not key.is_sequence and str(key).isprintable():
+                    self._search_prompt += str(key)
+        self._invalidate_status_bar()
+
+    def _scroll_by(self, delta):
+        """Scroll the text and invalidate only what the scroll exposes.
+        
+        Scrolls of a page or more, or while a full redraw is pending, fall
+        back to redrawing the whole window.
+        """
+        self.scroll += delta
+        pending = self._pending_scroll + delta
+        height = self.content.height
+        if (self.redraw and not self._damage) or abs(pending) >= height:
+            self.redraw = True
+            self._pending_scroll = 0
+            return
+        self._pending_scroll = pending
+        if pending:
+            exposed_y = self.content.y + height - pending if pending > 0 else self.content.y
+            self.invalidate(Dimensions(self.content.x, exposed_y, self.content.width, abs(pending)))
+        self._invalidate_scrollbar()
+
     def handle_resize(self):
         """Recalculate text wrapping on resize."""
         super().handle_resize()
@@ -372,30 +1050,266 @@ class TextWindow(Window):
         max_win_height = int(self.position.constraints.height * 0.9)
         max_content_width = max_win_width + self.content.offsets.width - 2
         
-        # Re-wrap text
-        self._lines = []
-        for line in self.text.splitlines() or ['']:
-            self._lines.extend(textwrap.wrap(line, max_content_width) or [''])
+        # Re-wrap lazily; only the first screenful is needed to size the window
+        lines = self._wrap_index(max_content_width if self.wrap else None)
+        if lines is not self._lines:
+            self._cancel_indexing()
+            self._lines = lines
+        if len(self.text) <= self.EAGER_INDEX_CHARS:
+            len(self._lines)
+        else:
+            self._lines.ensure_rows(max_win_height)
         
         # Adjust window size to fit content
-        max_line_length = max(len(line) + 2 for line in self._lines) if self._lines else 0
+        max_line_length = self._lines.max_length() + 2
         self.position.base.width = max(
             10, 
             min(max_win_width, max_line_length - self.content.offsets.width)
         )
         self.position.base.height = max(
             6, 
-            min(max_win_height, len(self._lines) - self.content.offsets.height)
+            min(max_win_height, self._lines.known_rows - self.content.offsets.height)
         )
+        self._pending_scroll = 0
         self.redraw = True
 
 
+class FileWindow(TextWindow):
+    """A window that pages through a file without reading it into memory.
+
+    The file is memory-mapped, and once a controller shows the window its
+    line offsets are indexed on the controller's worker pool; only the
+    visible lines are decoded. Until indexing finishes, the scrollbar uses
+    an estimate of the line count. Lines are clipped to the window rather than wrapped.
+    Closing the window (Esc) releases the file.
+    """
+
+    SEARCHABLE = False
+    #: Bytes of the file indexed between progress reports
+    INDEX_SLICE = FileIndex.CHUNK_BYTES
+
+    def __init__(self, path, *args, encoding='utf-8', **kwargs):
+        """Initialize a file window.
+
+        Args:
+            path: Path of the file to show
+            *args, **kwargs: Passed to Window.__init__(); the title defaults
+                to the file name
+            encoding: Encoding of the file; undecodable bytes are replaced
+        """
+        self.path = os.fspath(path)
+        self._file_index = FileIndex(self.path, encoding)
+        if not args:
+            kwargs.setdefault('title', os.path.basename(self.path))
+        super().__init__('', *args, wrap=False, **kwargs)
+
+    def handle_resize(self):
+        """Fit the window to the terminal; file lines are clipped, so nothing is re-wrapped."""
+        Window.handle_resize(self)
+        self._lines = self._file_index
+        max_win_width = int(self.position.constraints.width * 0.9)
+        max_win_height = int(self.position.constraints.height * 0.9)
+        self._lines.ensure_rows(max_win_height)
+        self.position.base.width = max(10, max_win_width)
+        self.position.base.height = max(
+            6,
+            min(max_win_height, self._lines.known_rows - self.content.offsets.height)
+        )
+        self._pending_scroll = 0
+
+    def close(self):
+        """Close the window, stop indexing and release the file."""
+        indexing = self._indexing
+        self._cancel_indexing()
+        super().close()
+        if indexing:
+            # A running job may be scanning the mapping; let it finish its slice
+            concurrent.futures.wait([indexing[0]])
+        self._file_index.close()
+
+
+class LogWindow(TextWindow):
+    """A text window that grows as text is appended, for tailing logs.
+
+    :meth:`append` wraps only the new text, so keeping up with a busy log
+    costs time proportional to what arrives rather than to the size of the
+    log. While the view is at the bottom the window follows the output,
+    moving the rows already on screen with the terminal's scroll region;
+    scrolling up stops following, and scrolling back to the bottom resumes
+    it. The window fills the space a TextWindow may use instead of fitting
+    its text, so it does not change size as the log grows.
+
+    Passing ``max_lines`` or ``max_bytes`` bounds the scrollback: the
+    oldest lines are evicted as new ones arrive, and a view scrolled up
+    stays on the same rows until they are evicted themselves.
+
+    Attributes:
+        follow: Whether the view stays at the bottom as text is appended
+    """
+
+    SEARCHABLE = False
+    ANSI_STYLES = False
+
+    def __init__(self, text='', *args, max_lines: Optional[int] = None,
+                 max_bytes: Optional[int] = None, **kwargs):
+        """Initialize a log window.
+
+        Args:
+            text: Initial content (string, list, or tuple of lines)
+            *args, **kwargs: Passed to Window.__init__()
+            max_lines: Most lines kept in the scrollback, or None for no limit
+            max_bytes: Most UTF-8 bytes kept in the scrollback, or None for no limit
+        """
+        self.follow = True
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        super().__init__(text, *args, **kwargs)
+        self._lines = self._log
+
+    @property
+    def text(self) -> str:
+        """The text shown so far; it is joined on access."""
+        return self._log.text
+
+    @text.setter
+    def text(self, value: str):
+        """Replace the whole log."""
+        width = 1
+        if hasattr(self, '_log'):
+            self._cancel_indexing()
+            width = self._log.width
+        self._log = LogIndex(value, width, self.max_lines, self.max_bytes)
+        self._lines = self._log
+        self.scroll = 0
+        self.redraw = True
+
+    def append(self, text: str):
+        """Add text to the end of the log.
+
+        Text without a trailing line break leaves the last line open, and
+        the next call continues it.
+        """
+        dropped = self._log.dropped_rows
+        changed = self._log.append(text)
+        lines = self._lines
+        evicted = lines.dropped_rows - dropped
+        if evicted > self.scroll:
+            # Rows that were on screen were evicted
+            self.scroll = 0
+            self.redraw = True
+        else:
+            self.scroll -= evicted
+        if not lines.complete:
+            # Still re-wrapping after a resize; indexing will reach the new lines
+            self._invalidate_scrollbar()
+            return
+        height = self.content.height
+        if self.follow:
+            bottom = max(0, lines.known_rows - height)
+            if bottom != self.scroll:
+                self._scroll_by(bottom - self.scroll)
+        first = max(changed, self.scroll) - self.scroll
+        if first < height:
+            self.invalidate(Dimensions(
+                self.content.x, self.content.y + first, self.content.width, height - first
+            ))
+        self._invalidate_scrollbar()
+
+    def draw(self):
+        """Draw the window, moving to the bottom first while following."""
+        if self.follow and self._lines.complete:
+            bottom = max(0, self._lines.known_rows - self.content.height)
+            if self.scroll != bottom:
+                self.scroll = bottom
+                self.redraw = True
+        super().draw()
+
+    def handle_input(self, key):
+        """Handle scrolling input, following again once the bottom is reached."""
+        scroll = self.scroll
+        super().handle_input(key)
+        if self.scroll != scroll:
+            self.follow = self.scroll >= self._lines.estimated_rows() - self.content.height
+
+    def handle_resize(self):
+        """Fill the available space and re-wrap the log lazily at the new width."""
+        Window.handle_resize(self)
+        max_win_width = int(self.position.constraints.width * 0.9)
+        max_win_height = int(self.position.constraints.height * 0.9)
+        self.position.base.width = max(10, max_win_width)
+        self.position.base.height = max(6, max_win_height)
+        width = max(1, max_win_width + self.content.offsets.width - 2) if self.wrap else None
+        if width != self._log.width:
+            self._cancel_indexing()
+            self._log = self._log.with_width(width)
+        self._lines = self._log
+        # A short log is wrapped at once so it can be followed right away;
+        # a long one follows once the controller finishes indexing it
+        self._lines.index_more(self.INDEX_SLICE)
+        self._pending_scroll = 0
+
+
+class Timer:
+    """Handle for a callback scheduled on a :class:`WindowController`.
+
+    Attributes:
+        when: Deadline on the ``time.monotonic()`` clock
+        callback: Function to call when the timer fires
+        args: Positional arguments for the callback
+        interval: Repeat interval in seconds, or None for a one-shot timer
+        cancelled: Whether :meth:`cancel` has been called
+    """
+
+    def __init__(self, when: float, callback: Callable, args=(), interval: Optional[float] = None):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.interval = interval
+        self.cancelled = False
+
+    def cancel(self):
+        """Prevent the timer from firing (again)."""
+        self.cancelled = True
+
+
 class WindowController:
     """Abstract helper that manages a window stack and event loop.
 
     Subclasses are responsible for pushing their initial windows (typically in
     ``__init__``) using :meth:`push_window`. The controller handles keyboard routing,
     redraws, terminal resize, and window lifecycle management.
+
+    The controller owns the :class:`Screen` that its windows draw into; each
+    redraw is flushed as one frame containing only the cells that changed.
+    When a window is pushed on top of another, the cells under it are saved
+    and restored when it is popped, so the parent does not need a redraw.
+
+    All keystrokes that are already buffered when the loop wakes up are
+    dispatched before the next frame is drawn (at most ``max_keys_per_frame``
+    of them), so key auto-repeat does not leave the display lagging behind.
+
+    When the terminal has a keyboard file descriptor, the loop blocks in a
+    selector on that descriptor and on a self-pipe written by the SIGWINCH
+    handler, so an idle UI uses no CPU. The wait only times out when the top
+    window overrides :meth:`Window.tick` or the controller overrides
+    :meth:`on_tick`, in which case ticks run every ``inkey_timeout`` seconds.
+    Without a keyboard descriptor the controller falls back to polling with
+    ``inkey(timeout=inkey_timeout)`` and ``idle_sleep``.
+
+    Applications built on asyncio can use :meth:`run_async` instead of
+    :meth:`run`; there, ``tick()`` and ``on_tick()`` may be coroutines.
+
+    Work that should happen at a specific time is better scheduled with
+    :meth:`call_later`, :meth:`call_at` or :meth:`call_every` than done in a
+    tick hook: timers live in a heap whose earliest deadline bounds the wait
+    for input, so the loop sleeps until exactly the next timer is due.
+
+    Windows and timers are only touched from the thread running the loop.
+    Other threads hand work over with :meth:`post` or
+    :meth:`request_redraw`, which queue it and wake the loop immediately.
+    Slow work can be started on the controller's worker threads with
+    :meth:`submit`; the pool is created on first use and shut down when
+    the loop exits.
     """
 
     def __init__(
@@ -405,12 +1319,30 @@ class WindowController:
         inkey_timeout: float = 0.1,
         idle_sleep: float = 0.01,
         register_resize_handler: bool = True,
+        max_keys_per_frame: int = 32,
+        max_workers: Optional[int] = None,
     ):
         self.term = term or Terminal()
+        self.screen = Screen(self.term)
         self.inkey_timeout = inkey_timeout
         self.idle_sleep = idle_sleep
+        self.max_keys_per_frame = max_keys_per_frame
         self.window_stack: List[Window] = []
+        self._save_unders: Dict[Window, SavedRegion] = {}
         self._resize_pending = False
+        self._selector: Optional[selectors.BaseSelector] = None
+        self._wakeup_fds = None
+        self._keys_pending = False
+        self._next_tick = 0.0
+        self._async_wakeup = None
+        self._posted = collections.deque()
+        self._timers: List[tuple] = []
+        self._timer_seq = itertools.count()
+        self._tasks: Dict[object, asyncio.Task] = {}
+        self._task_error: Optional[BaseException] = None
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._register_resize_handler = register_resize_handler
         if register_resize_handler:
             signal.signal(signal.SIGWINCH, self._handle_sigwinch)
 
@@ -418,32 +1350,181 @@ class WindowController:
         """Refresh Terminal on resize and trigger a redraw."""
         self.term = Terminal()
         self._resize_pending = True
+        self._wakeup()
 
     def push_window(self, window: Window):
         """Push a window onto the stack."""
         window.term = self.term
         window.redraw = True
         window.controller = self
+        if self.window_stack:
+            rect = self._window_rect(window)
+            self._save_unders[window] = self.screen.save(*rect)
         self.window_stack.append(window)
 
     def pop_window(self):
-        """Pop the top window off the stack."""
+        """Pop the top window off the stack.
+
+        The cells saved when the window was pushed are restored. If they are
+        no longer valid (the window moved, or the screen was rebuilt), the new
+        top window is redrawn instead.
+        """
         if self.window_stack:
             popped = self.window_stack.pop()
             popped.controller = None
+            saved = self._save_unders.pop(popped, None)
             if self.window_stack:
                 parent = self.window_stack[-1]
                 parent.child = None
-                parent.redraw = True
+                rect = self._window_rect(popped)
+                if saved is not None and (saved.y, saved.x, saved.width, saved.height) == rect:
+                    self.screen.restore(saved)
+                else:
+                    parent.invalidate()
             return popped
         return None
 
+    @staticmethod
+    def _window_rect(window: Window):
+        """Return the (y, x, width, height) a window covers on screen."""
+        position = window.position
+        return position.y, position.x, position.width, position.height
+
     def current_window(self) -> Optional[Window]:
         """Return the top-most window, if any."""
         return self.window_stack[-1] if self.window_stack else None
 
     def on_tick(self):
-        """Optional hook executed once per loop iteration after window ticks."""
+        """Optional hook executed after window ticks.
+
+        Only called periodically when overridden; prefer :meth:`call_every`
+        for work on a fixed schedule.
+        """
+
+    def post(self, callback: Callable, *args):
+        """Run callback(*args) on the UI loop as soon as possible.
+
+        Safe to call from any thread (and from signal handlers); the loop is
+        woken immediately through its wakeup pipe.
+        """
+        self._posted.append((callback, args))
+        self._wakeup()
+
+    def request_redraw(self, window: Optional[Window] = None, rect: Optional[Dimensions] = None):
+        """Ask the UI loop to redraw a window (the top window by default).
+
+        Safe to call from any thread.
+
+        Args:
+            window: Window to invalidate, or None for whichever window is on top
+            rect: Damaged rectangle, or None for the whole window
+        """
+        self.post(self._invalidate, window, rect)
+
+    def submit(self, fn: Callable, *args) -> concurrent.futures.Future:
+        """Run fn(*args) on a worker thread.
+
+        The function must not touch windows or the screen; it should hand
+        its results back with :meth:`post`. Pending work is cancelled when
+        the loop exits, and running work should check for cancellation itself.
+
+        Returns:
+            A future for the result
+        """
+        if self._executor is None:
+            self._executor = concurrent.futures.ThreadPoolExecutor(
+                self.max_workers, thread_name_prefix='term_windows'
+            )
+        return self._executor.submit(fn, *args)
+
+    def _shutdown_workers(self):
+        """Cancel pending worker jobs without waiting for running ones."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _invalidate(self, window, rect):
+        """Invalidate a posted redraw target on the UI loop."""
+        window = window or self.current_window()
+        if window is not None:
+            window.invalidate(rect)
+
+    def _run_posted(self):
+        """Run callbacks queued by post().
+
+        Only the callbacks queued when this starts are run, so a callback that
+        posts again does not starve the loop.
+
+        Returns:
+            (owner, result) pairs, so awaitable results can be scheduled; each
+            posted call gets an owner of its own, as its arguments may be
+            unhashable and identical posts must not replace each other's task
+        """
+        results = []
+        for _ in range(len(self._posted)):
+            callback, args = self._posted.popleft()
+            results.append((object(), callback(*args)))
+        return results
+
+    def call_at(self, when: float, callback: Callable, *args) -> Timer:
+        """Schedule callback(*args) at a ``time.monotonic()`` deadline."""
+        return self._schedule(Timer(when, callback, args))
+
+    def call_later(self, delay: float, callback: Callable, *args) -> Timer:
+        """Schedule callback(*args) to run after delay seconds."""
+        return self._schedule(Timer(time.monotonic() + delay, callback, args))
+
+    def call_every(self, interval: float, callback: Callable, *args) -> Timer:
+        """Schedule callback(*args) every interval seconds until cancelled."""
+        return self._schedule(Timer(time.monotonic() + interval, callback, args, interval))
+
+    def _schedule(self, timer: Timer) -> Timer:
+        """Add a timer to the heap and wake the loop to recompute its timeout."""
+        heapq.heappush(self._timers, (timer.when, next(self._timer_seq), timer))
+        self._wakeup()
+        return timer
+
+    def _next_deadline(self) -> Optional[float]:
+        """Return the earliest pending timer deadline, dropping cancelled timers."""
+        while self._timers and self._timers[0][2].cancelled:
+            heapq.heappop(self._timers)
+        return self._timers[0][0] if self._timers else None
+
+    def _run_timers(self):
+        """Fire every timer whose deadline has passed.
+
+        Returns:
+            (timer, result) pairs, so awaitable results can be scheduled
+        """
+        results = []
+        now = time.monotonic()
+        while self._timers and self._timers[0][0] <= now:
+            _, _, timer = heapq.heappop(self._timers)
+            if timer.cancelled:
+                continue
+            if timer.interval is not None:
+                # Keep a steady cadence, but do not try to catch up after a stall
+                timer.when += timer.interval
+                if timer.when <= now:
+                    timer.when = now + timer.interval
+                heapq.heappush(self._timers, (timer.when, next(self._timer_seq), timer))
+            if timer not in self._tasks:
+                results.append((timer, timer.callback(*timer.args)))
+        return results
+
+    def _run_due(self, every_iteration: bool = False):
+        """Run posted callbacks, due timers and, once their interval has elapsed, the tick hooks.
+
+        Returns:
+            (owner, result) pairs from the callbacks that ran
+        """
+        results = self._run_posted() + self._run_timers()
+        if every_iteration:
+            results += self._tick()
+        elif time.monotonic() >= self._next_tick:
+            self._next_tick = time.monotonic() + self.inkey_timeout
+            results += self._tick()
+        return results
 
     def run(self):
         """Enter the main event loop."""
@@ -454,27 +1535,243 @@ class WindowController:
             )
 
         with self.term.fullscreen(), self.term.cbreak(), self.term.hidden_cursor():
-            self._redraw_top(force=True)
+            self._open_selector()
+            try:
+                self._run_loop()
+            finally:
+                self._close_selector()
+                self._shutdown_workers()
 
-            while self.window_stack:
-                if self._resize_pending:
-                    self._process_resize()
+    def _run_loop(self):
+        """Dispatch input, redraw and tick until the window stack is empty."""
+        self._redraw_top(force=True)
+        self._next_tick = time.monotonic() + self.inkey_timeout
+
+        while self.window_stack:
+            if self._resize_pending:
+                self._process_resize()
+
+            self._dispatch_keys(self._read_keys())
+            if not self.window_stack:
+                break
 
-                window = self.current_window()
-                key = self.term.inkey(timeout=self.inkey_timeout)
+            self._run_due(every_iteration=self._selector is None)
+            self._redraw_top()
+
+            if self._selector is None:
+                time.sleep(self.idle_sleep)
 
-                if key and window:
-                    self._handle_key(window, key)
+    async def run_async(self):
+        """Run the event loop as a coroutine on the running asyncio loop.
+
+        The keyboard is watched with ``loop.add_reader()`` and SIGWINCH with
+        ``loop.add_signal_handler()``, so other tasks keep running while the
+        UI waits for input. If a window's ``tick()`` (or the controller's
+        ``on_tick()``) returns an awaitable, it is run as a task; the UI keeps
+        rendering meanwhile and is woken when the task finishes. The same
+        applies to timer callbacks. A tick or timer whose task is still
+        running is not started again.
+        """
+        if not self.window_stack:
+            raise RuntimeError(
+                "WindowController.run_async() called with no windows. "
+                "Call push_window() before run_async()."
+            )
+
+        loop = asyncio.get_running_loop()
+        wake = asyncio.Event()
+        self._async_wakeup = lambda: loop.call_soon_threadsafe(wake.set)
+        keyboard_fd = getattr(self.term, '_keyboard_fd', None)
+        if not isinstance(keyboard_fd, int):
+            keyboard_fd = None
+        signal_installed = False
+
+        with self.term.fullscreen(), self.term.cbreak(), self.term.hidden_cursor():
+            try:
+                if keyboard_fd is not None:
+                    loop.add_reader(keyboard_fd, wake.set)
+                if self._register_resize_handler:
+                    try:
+                        loop.add_signal_handler(
+                            signal.SIGWINCH, self._handle_sigwinch, signal.SIGWINCH, None
+                        )
+                        signal_installed = True
+                    except (NotImplementedError, RuntimeError, ValueError):
+                        pass  # Not the main thread: keep the plain signal handler
+
+                self._redraw_top(force=True)
+                self._next_tick = time.monotonic() + self.inkey_timeout
+                while self.window_stack:
+                    timeout = self._next_timeout()
+                    if keyboard_fd is None:
+                        timeout = self.inkey_timeout if timeout is None else min(timeout, self.inkey_timeout)
+                    try:
+                        await asyncio.wait_for(wake.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    wake.clear()
+                    if self._task_error is not None:
+                        error, self._task_error = self._task_error, None
+                        raise error
+
+                    if self._resize_pending:
+                        self._process_resize()
+
+                    self._dispatch_keys(self._drain_keys(self.term.inkey(timeout=0)))
                     if not self.window_stack:
                         break
 
-                self._redraw_top()
+                    for owner, result in self._run_due():
+                        if inspect.isawaitable(result):
+                            self._start_task(owner, result)
+                    self._redraw_top()
+            finally:
+                if keyboard_fd is not None:
+                    loop.remove_reader(keyboard_fd)
+                if signal_installed:
+                    loop.remove_signal_handler(signal.SIGWINCH)
+                    signal.signal(signal.SIGWINCH, self._handle_sigwinch)
+                for task in self._tasks.values():
+                    task.cancel()
+                self._tasks.clear()
+                self._async_wakeup = None
+                self._shutdown_workers()
 
-                if self.window_stack:
-                    self.window_stack[-1].tick()
-                    self.on_tick()
+    def _tick(self):
+        """Call the tick hooks of the top window and the controller.
 
-                time.sleep(self.idle_sleep)
+        Returns:
+            (owner, result) pairs, so awaitable results can be scheduled
+        """
+        results = []
+        top = self.current_window()
+        if top is not None and top not in self._tasks:
+            results.append((top, top.tick()))
+        if self not in self._tasks:
+            results.append((self, self.on_tick()))
+        return results
+
+    def _start_task(self, owner, awaitable):
+        """Run an awaitable tick or timer result as a task that wakes the loop when done."""
+        task = asyncio.ensure_future(awaitable)
+        self._tasks[owner] = task
+
+        def done(task):
+            self._tasks.pop(owner, None)
+            if not task.cancelled() and task.exception() is not None:
+                self._task_error = task.exception()
+            self._wakeup()
+
+        task.add_done_callback(done)
+
+    def _open_selector(self):
+        """Watch the keyboard and a wakeup self-pipe, if the terminal allows it."""
+        # Blessed does not expose its keyboard descriptor publicly
+        keyboard_fd = getattr(self.term, '_keyboard_fd', None)
+        if not isinstance(keyboard_fd, int):
+            return
+        self._wakeup_fds = os.pipe()
+        for fd in self._wakeup_fds:
+            os.set_blocking(fd, False)
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(keyboard_fd, selectors.EVENT_READ, 'keyboard')
+        self._selector.register(self._wakeup_fds[0], selectors.EVENT_READ, 'wakeup')
+
+    def _close_selector(self):
+        """Release the selector and the wakeup pipe."""
+        if self._selector is not None:
+            self._selector.close()
+            self._selector = None
+        if self._wakeup_fds is not None:
+            for fd in self._wakeup_fds:
+                os.close(fd)
+            self._wakeup_fds = None
+
+    def _wakeup(self):
+        """Interrupt a blocking wait in the event loop.
+
+        May be called from any thread, so the wakeup targets are read once.
+        """
+        async_wakeup = self._async_wakeup
+        if async_wakeup is not None:
+            try:
+                async_wakeup()
+            except RuntimeError:
+                pass  # asyncio loop already closed
+            return
+        fds = self._wakeup_fds
+        if fds is None:
+            return
+        try:
+            os.write(fds[1], b'\0')
+        except OSError:
+            pass  # Pipe full or closed: the loop is already awake
+
+    def _wants_ticks(self) -> bool:
+        """Return whether the top window or controller overrides a tick hook."""
+        if type(self).on_tick is not WindowController.on_tick:
+            return True
+        top = self.current_window()
+        return top is not None and type(top).tick is not Window.tick
+
+    def _next_timeout(self) -> Optional[float]:
+        """Return how long the loop may block, or None to wait indefinitely."""
+        if self._keys_pending or self._resize_pending or self._posted:
+            return 0
+        deadline = self._next_deadline()
+        if self._wants_ticks() and (deadline is None or self._next_tick < deadline):
+            deadline = self._next_tick
+        if deadline is None:
+            return None
+        return max(0.0, deadline - time.monotonic())
+
+    def _wait(self, timeout: Optional[float]) -> bool:
+        """Block until input, a wakeup, or the timeout; True if keys are readable."""
+        keyboard = False
+        for selector_key, _ in self._selector.select(timeout):
+            if selector_key.data == 'keyboard':
+                keyboard = True
+            else:
+                try:
+                    while os.read(selector_key.fd, 512):
+                        pass
+                except BlockingIOError:
+                    pass
+        return keyboard or self._keys_pending
+
+    def _read_keys(self):
+        """Wait for a keystroke, then drain any others that are already buffered.
+
+        Returns at most ``max_keys_per_frame`` keys so that an input flood
+        cannot starve rendering; the rest are read on the next iteration.
+        """
+        if self._selector is None:
+            key = self.term.inkey(timeout=self.inkey_timeout)
+        elif self._wait(self._next_timeout()):
+            key = self.term.inkey(timeout=0)
+        else:
+            key = ''
+        return self._drain_keys(key)
+
+    def _drain_keys(self, key):
+        """Collect key and every keystroke already buffered behind it."""
+        keys = []
+        while key:
+            keys.append(key)
+            if len(keys) >= self.max_keys_per_frame:
+                break
+            key = self.term.inkey(timeout=0)
+        # Keys may remain in Blessed's buffer where the selector cannot see them
+        self._keys_pending = len(keys) >= self.max_keys_per_frame
+        return keys
+
+    def _dispatch_keys(self, keys):
+        """Route each key to whichever window is on top when it arrives."""
+        for key in keys:
+            window = self.current_window()
+            if window is None:
+                return
+            self._handle_key(window, key)
 
     def _handle_key(self, window: Window, key):
         """Dispatch keyboard input to the active window."""
@@ -491,18 +1788,27 @@ class WindowController:
     def _process_resize(self):
         """Re-render windows after a terminal resize."""
         self._resize_pending = False
-        print(self.term.clear(), end="")
+        # A fresh screen has unknown contents, so the next frame repaints fully
+        self.screen = Screen(self.term)
+        self._save_unders.clear()
         for win in self.window_stack:
             win.term = self.term
             win.redraw = True
         self._redraw_top(force=True)
 
     def _redraw_top(self, force: bool = False):
-        """Redraw the top-most window if it requested it."""
+        """Redraw the top-most window if it requested it.
+
+        Cells changed outside of ``draw()``, such as restored save-under
+        regions, are flushed in the same frame.
+        """
         top = self.current_window()
         if not top:
             return
-        if force or getattr(top, "redraw", False):
-            top.redraw = False
-            top.draw()
+        with self.screen.frame():
+            if force:
+                top.invalidate()
+            if top.redraw:
+                top.damage = top._take_damage()
+                top.draw()
 
@@ -0,0 +1,469 @@
+"""
+Lazily wrapped text for scrolling windows.
+
+This module maps the source lines of a text to the rows they occupy once
+wrapped to a given width. Rows are kept as (start, end) offsets into the
+text rather than as strings, and the index is filled in incrementally from
+the top, so a window can show the first page of a huge text without
+wrapping all of it.
+"""
+
+import bisect
+import sys
+import threading
+from array import array
+from typing import Optional, Tuple
+
+from .cellwidth import text_width
+from .wrapping import line_spans, wrap_spans
+
+
+class WrapIndex:
+    """A text wrapped to a fixed width, exposed as a sequence of rows.
+
+    Each wrapped row is stored as a start and an end offset in one
+    ``array('Q')``, and ``first_row[i]`` is the first row of source line
+    ``i``; a row is only sliced out of the text when it is looked up. Both
+    are known for the source lines up to :attr:`indexed`. Looking up a row
+    beyond that point indexes just enough further lines to reach it, and
+    :meth:`index_more` lets an event loop finish the index a slice at a
+    time; it may run on a worker thread while another thread reads the
+    index. Tabs are expanded to 8-column stops before wrapping, as textwrap
+    does. With a width of None lines are not wrapped: each source line is
+    one row, whatever its length.
+
+    Attributes:
+        text: Source text
+        width: Wrap width in columns, or None to keep lines whole
+    """
+
+    def __init__(self, text: str, width: Optional[int]):
+        self.text = text
+        self.width = None if width is None else max(1, width)
+        self._text = text.expandtabs() if '\t' in text else text
+        self._reset()
+
+    def _reset(self):
+        """Start indexing from the top of the text."""
+        self._lock = threading.Lock()
+        self._lines = line_spans(self._text)
+        self._line_starts = array('Q')
+        self._first_row = array('Q', [0])
+        self._rows = array('Q')
+        self._indexed_chars = 0
+        self._longest = 0
+        self._complete = False
+
+    def with_width(self, width: Optional[int]) -> 'WrapIndex':
+        """Return an index of the same text at another width, sharing its tab-expanded copy."""
+        index = WrapIndex.__new__(WrapIndex)
+        index.text = self.text
+        index.width = None if width is None else max(1, width)
+        index._text = self._text
+        index._reset()
+        return index
+
+    @property
+    def indexed(self) -> int:
+        """Number of source lines whose rows are known."""
+        return len(self._line_starts)
+
+    @property
+    def complete(self) -> bool:
+        """Whether every source line has been indexed."""
+        return self._complete
+
+    @property
+    def known_rows(self) -> int:
+        """Number of rows in the indexed source lines."""
+        return len(self._rows) // 2
+
+    def estimated_rows(self) -> int:
+        """Return the total row count, extrapolated while indexing is incomplete."""
+        known = self.known_rows
+        if self._complete or not self._indexed_chars:
+            return known
+        return max(known, round(known * len(self._text) / self._indexed_chars))
+
+    def index_more(self, max_lines: int = 1000) -> bool:
+        """Index up to max_lines more source lines.
+
+        Returns:
+            True if unindexed source lines remain
+        """
+        with self._lock:
+            return self._index_more(max_lines)
+
+    def _index_more(self, max_lines: int) -> bool:
+        """Index more source lines; the caller holds the lock."""
+        if self._complete:
+            return False
+        text, width = self._text, self.width
+        rows, first_row, line_starts = self._rows, self._first_row, self._line_starts
+        longest = self._longest
+        plain = text.isascii()
+        end = self._indexed_chars
+        for _ in range(max_lines):
+            span = next(self._lines, None)
+            if span is None:
+                self._complete = True
+                if not line_starts:
+                    # Empty text still has one blank row
+                    line_starts.append(0)
+                    rows.extend((0, 0))
+                    first_row.append(1)
+                break
+            start, end = span
+            line_starts.append(start)
+            count = len(rows)
+            if width is None:
+                rows.extend(span)
+            else:
+                wrap_spans(text, width, start, end, rows)
+            if len(rows) == count:
+                rows.extend((start, start))
+            first_row.append(len(rows) // 2)
+            # A line is at most twice as wide as it is long
+            if end - start > longest or (not plain and 2 * (end - start) > longest):
+                longest = max(longest, end - start if plain else text_width(text[start:end]))
+        self._indexed_chars = end
+        self._longest = longest
+        return not self._complete
+
+    def ensure_rows(self, rows: int):
+        """Index source lines until at least rows rows are known (or all are)."""
+        while self.known_rows < rows and self.index_more(64):
+            pass
+
+    def row_span(self, row: int) -> Tuple[int, int]:
+        """Return the (start, end) offsets of a wrapped row in the tab-expanded text.
+
+        Raises:
+            IndexError: If row is past the end of the text
+        """
+        if row < 0:
+            raise IndexError(row)
+        self.ensure_rows(row + 1)
+        if row >= self.known_rows:
+            raise IndexError(row)
+        return self._rows[2 * row], self._rows[2 * row + 1]
+
+    def locate(self, row: int) -> Tuple[int, int]:
+        """Return the (source line, row within that line) of a wrapped row.
+
+        Raises:
+            IndexError: If row is past the end of the text
+        """
+        self.row_span(row)
+        line_no = bisect.bisect_right(self._first_row, row) - 1
+        return line_no, row - self._first_row[line_no]
+
+    def first_row(self, line_no: int) -> int:
+        """Return the first wrapped row of a source line, indexing up to it."""
+        while self.indexed < line_no and self.index_more(max(64, line_no - self.indexed)):
+            pass
+        return self._first_row[line_no]
+
+    @property
+    def expanded_text(self) -> str:
+        """The tab-expanded text that row offsets refer to."""
+        return self._text
+
+    def row_of(self, offset: int) -> int:
+        """Return the wrapped row showing an offset in the tab-expanded text, indexing up to it.
+
+        Offsets in whitespace dropped at a wrap belong to the row before it.
+        """
+        while self._indexed_chars <= offset and self.index_more(64):
+            pass
+        line_no = max(0, bisect.bisect_right(self._line_starts, offset) - 1)
+        rows = self._rows
+        first, end = self._first_row[line_no], self._first_row[line_no + 1]
+        return bisect.bisect_right(range(first, end), offset, key=lambda row: rows[2 * row]) - 1 + first
+
+    def max_length(self) -> int:
+        """Return an upper bound on the width of any row, in columns.
+
+        Once the whole text is indexed this is the widest source line (or
+        the wrap width if a line had to be wrapped); before that, rows still
+        to be wrapped may be as wide as the wrap width, or of any length
+        when lines are not wrapped.
+        """
+        if self.width is None:
+            return self._longest if self._complete else sys.maxsize
+        if not self._complete:
+            return self.width
+        return min(self.width, self._longest)
+
+    def __getitem__(self, row: int) -> str:
+        start, end = self.row_span(row)
+        return self._text[start:end]
+
+    def __len__(self):
+        """Return the exact row count; this indexes the whole text."""
+        while self.index_more(10000):
+            pass
+        return self.known_rows
+
+    def __iter__(self):
+        for row in range(len(self)):
+            yield self[row]
+
+
+# Characters str.splitlines() breaks on
+_LINE_BREAKS = '\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029'
+
+
+class LogIndex(WrapIndex):
+    """Wrapped text that grows at the end, for logs shown while they are written.
+
+    Source lines are kept as separate strings so :meth:`append` costs time
+    proportional to the appended text: only the new lines (and a last line
+    that had no line break yet) are wrapped. Rows are (start, end) offsets
+    into their source line. The initial text, and the same lines at a new
+    width, are indexed lazily from the top like :class:`WrapIndex`.
+
+    With ``max_lines`` or ``max_bytes`` set the index is a bounded
+    scrollback: once appending goes over capacity the oldest lines are
+    evicted, and rows and source lines are renumbered from the first line
+    kept. Evicted entries are dropped from the arrays in batches, once they
+    outnumber the live ones, so eviction is amortised O(1) per line and
+    memory stays bounded. Lines evicted before they were wrapped are never
+    wrapped. The last line is always kept.
+
+    Attributes:
+        width: Wrap width in columns
+        max_lines: Most source lines kept, or None
+        max_bytes: Most UTF-8 bytes kept (counting line breaks), or None
+        dropped_rows: Number of rows evicted so far
+    """
+
+    def __init__(self, text: str, width: Optional[int], max_lines: Optional[int] = None,
+                 max_bytes: Optional[int] = None):
+        self.width = None if width is None else max(1, width)
+        self.max_lines = max_lines
+        self.max_bytes = max_bytes
+        self._source = []
+        self._open = False
+        self._bytes = 0
+        self._reset()
+        self._add(text)
+        self._evict()
+
+    def _reset(self):
+        """Start indexing from the first line."""
+        # Evicted lines at the start of _source, and their rows, are kept
+        # until they outnumber the live ones
+        self._lock = threading.Lock()
+        self._head = 0
+        self._first_row = array('Q', [0])
+        self._rows = array('Q')
+        self._longest = 0
+        self.dropped_rows = 0
+
+    @property
+    def text(self) -> str:
+        """The text held, joined on access."""
+        lines = self._source[self._head:]
+        text = '\n'.join(lines)
+        return text if self._open or not lines else text + '\n'
+
+    def with_width(self, width: Optional[int]) -> 'LogIndex':
+        """Return an index of the same lines at another width.
+
+        The new index takes over the lines, and this one is left empty;
+        appends must go to the new index from then on.
+        """
+        with self._lock:
+            del self._source[:self._head]
+            source, self._source = self._source, []
+        index = LogIndex.__new__(LogIndex)
+        index.width = None if width is None else max(1, width)
+        index.max_lines = self.max_lines
+        index.max_bytes = self.max_bytes
+        index._source = source
+        index._open = self._open
+        index._bytes = self._bytes
+        index._reset()
+        return index
+
+    @property
+    def indexed(self) -> int:
+        """Number of source lines whose rows are known."""
+        return len(self._first_row) - 1 - self._head
+
+    @property
+    def complete(self) -> bool:
+        """Whether every source line has been indexed."""
+        return len(self._first_row) - 1 == len(self._source)
+
+    @property
+    def known_rows(self) -> int:
+        """Number of rows in the indexed source lines."""
+        return len(self._rows) // 2 - self._first_row[self._head]
+
+    @property
+    def source_lines(self) -> int:
+        """Number of source lines held."""
+        return len(self._source) - self._head
+
+    def estimated_rows(self) -> int:
+        """Return the total row count, extrapolated while indexing is incomplete."""
+        known = self.known_rows
+        if self.complete or not self.indexed:
+            return known
+        return max(known, round(known * self.source_lines / self.indexed))
+
+    def _index_more(self, max_lines: int) -> bool:
+        """Index more source lines; the caller holds the lock."""
+        source, width = self._source, self.width
+        rows, first_row = self._rows, self._first_row
+        longest = self._longest
+        start = len(first_row) - 1
+        stop = min(len(source), start + max_lines)
+        for line_no in range(start, stop):
+            line = source[line_no]
+            count = len(rows)
+            if width is None:
+                rows.extend((0, len(line)))
+            else:
+                wrap_spans(line, width, 0, len(line), rows)
+            if len(rows) == count:
+                rows.extend((0, 0))
+            first_row.append(len(rows) // 2)
+            if len(line) > longest or (not line.isascii() and 2 * len(line) > longest):
+                longest = max(longest, text_width(line))
+        self._longest = longest
+        return stop < len(source)
+
+    def append(self, text: str) -> int:
+        """Add text at the end, wrapping only what changed.
+
+        Text that does not end with a line break leaves the last line open;
+        the next append continues it. Lines over capacity are evicted before
+        the new ones are wrapped; check :attr:`dropped_rows` to see how far
+        the remaining rows moved up.
+
+        Returns:
+            The first row whose contents changed
+        """
+        if not text:
+            return self.known_rows
+        with self._lock:
+            return self._append(text)
+
+    def _append(self, text: str) -> int:
+        """Append text; the caller holds the lock."""
+        was_complete = self.complete
+        changed = self.known_rows
+        if self._open and was_complete:
+            # The open line is wrapped again with its continuation
+            del self._rows[2 * self._first_row[-2]:]
+            self._first_row.pop()
+            changed = self.known_rows
+        dropped = self.dropped_rows
+        self._add(text)
+        self._evict()
+        if was_complete:
+            self._index_more(len(self._source))
+        return max(0, changed - (self.dropped_rows - dropped))
+
+    def _add(self, text: str):
+        """Split text into source lines without wrapping them."""
+        if not text:
+            return
+        source = self._source
+        if self._open:
+            last = source.pop()
+            if self.max_bytes is not None:
+                self._bytes -= _size(last)
+            text = last + text
+        if '\t' in text:
+            text = text.expandtabs()
+        lines = text.splitlines()
+        self._open = text[-1] not in _LINE_BREAKS
+        source.extend(lines)
+        if self.max_bytes is not None:
+            self._bytes += sum(_size(line) for line in lines)
+
+    def _evict(self):
+        """Drop the oldest lines until the index is within capacity."""
+        source, head = self._source, self._head
+        stop = head
+        if self.max_lines is not None:
+            stop = max(stop, len(source) - max(1, self.max_lines))
+        if self.max_bytes is not None:
+            size = self._bytes - sum(_size(source[line_no]) for line_no in range(head, stop))
+            while size > self.max_bytes and stop < len(source) - 1:
+                size -= _size(source[stop])
+                stop += 1
+            self._bytes = size
+        if stop <= head:
+            return
+        first_row = self._first_row
+        rows = len(self._rows) // 2
+        # Lines evicted before they were wrapped get no rows
+        while len(first_row) - 1 < stop:
+            first_row.append(rows)
+        self.dropped_rows += first_row[stop] - first_row[head]
+        for line_no in range(head, stop):
+            source[line_no] = None
+        self._head = stop
+        if stop > len(source) - stop:
+            self._compact()
+
+    def _compact(self):
+        """Release the evicted lines and their rows."""
+        head = self._head
+        base = self._first_row[head]
+        del self._source[:head]
+        del self._rows[:2 * base]
+        self._first_row = array('Q', [row - base for row in self._first_row[head:]])
+        self._head = 0
+
+    def row_span(self, row: int) -> Tuple[int, int]:
+        """Return the (start, end) offsets of a wrapped row in its source line.
+
+        Raises:
+            IndexError: If row is past the end of the text
+        """
+        if row < 0:
+            raise IndexError(row)
+        self.ensure_rows(row + 1)
+        if row >= self.known_rows:
+            raise IndexError(row)
+        row += self._first_row[self._head]
+        return self._rows[2 * row], self._rows[2 * row + 1]
+
+    def locate(self, row: int) -> Tuple[int, int]:
+        """Return the (source line, row within that line) of a wrapped row.
+
+        Raises:
+            IndexError: If row is past the end of the text
+        """
+        self.row_span(row)
+        row += self._first_row[self._head]
+        line_no = bisect.bisect_right(self._first_row, row) - 1
+        return line_no - self._head, row - self._first_row[line_no]
+
+    def first_row(self, line_no: int) -> int:
+        """Return the first wrapped row of a source line, indexing up to it."""
+        while self.indexed < line_no and self.index_more(max(64, line_no - self.indexed)):
+            pass
+        return self._first_row[line_no + self._head] - self._first_row[self._head]
+
+    def max_length(self) -> int:
+        """Return an upper bound on the width of any indexed row, in columns."""
+        return self._longest if self.width is None else min(self.width, self._longest)
+
+    def __getitem__(self, row: int) -> str:
+        line_no, _ = self.locate(row)
+        row += self._first_row[self._head]
+        return self._source[line_no + self._head][self._rows[2 * row]:self._rows[2 * row + 1]]
+
+
+def _size(line: str) -> int:
+    """Return the UTF-8 size of a source line and its line break."""
+    if line.isascii():
+        return len(line) + 1
+    return len(line.encode('utf-8', 'surrogatepass')) + 1
@@ -0,0 +1,269 @@
+"""
+Text wrapping engine.
+
+This module finds the rows a text wraps to as (start, end) offsets into the
+text instead of building strings. Line breaks follow the rules of
+:func:`textwrap.wrap` (break on whitespace, after hyphens in hyphenated
+words and around em-dashes, split words longer than the width, drop
+whitespace at row boundaries), so rows come out as textwrap would produce
+them for text without tabs. Lines that fit the width are not tokenized at
+all, and lines where hyphens cannot split words (no ``--`` and no hyphen
+before a letter) find each row with a single regex match rather than by
+visiting every word.
+
+Widths are display columns: wide characters count two and combining marks
+none, so text containing them wraps where textwrap (which counts
+characters) would not. Rows still never split a grapheme cluster.
+"""
+
+import bisect
+import re
+from array import array
+from typing import Iterator, List, Optional, Tuple
+
+from .cellwidth import fit_columns
+
+_WHITESPACE = '\t\n\x0b\x0c\r '
+_TO_SPACE = str.maketrans(_WHITESPACE, ' ' * len(_WHITESPACE))
+
+# Chunks are runs of whitespace and non-whitespace, further split where
+# textwrap.TextWrapper.wordsep_re splits words at hyphens: after the hyphen
+# of a hyphenated word, and around an em-dash (group 1) between words
+_letter = r'[^\d\W]'
+_hyphen_re = re.compile(r'--|-[^\d\W]')
+_hyphen_break_re = re.compile(
+    r'-(?:(?:(?<={0}{0}-)|(?<={0}-{0}-))(?={0}-?{0})|(?<=[\w!"\'&.,?]-)(-+)(?=\w))'.format(_letter)
+)
+_space_run_re = re.compile('[{0}]+'.format(re.escape(_WHITESPACE)))
+_word_run_re = re.compile('[^{0}]+'.format(re.escape(_WHITESPACE)))
+_through_last_space_re = re.compile('.*[{0}]'.format(re.escape(_WHITESPACE)), re.S)
+_through_last_word_re = re.compile('.*[^{0}]'.format(re.escape(_WHITESPACE)), re.S)
+_line_break_re = re.compile('\r\n|[\n\r\x0b\x0c\x1c\x1d\x1e\x85\u2028\u2029]')
+
+
+def _is_blank(text: str, start: int, end: int) -> bool:
+    """Return whether the chunk text[start:end] is dropped at row boundaries."""
+    char = text[start]
+    if char in _WHITESPACE:
+        return True
+    return char.isspace() and not text[start:end].strip()
+
+
+class _RunChunks:
+    """Chunk boundaries of text whose chunks are whitespace and word runs.
+
+    Boundaries are found with a regex match per row instead of visiting
+    every chunk.
+    """
+
+    def __init__(self, text: str, end: int):
+        self.text = text
+        self.end = end
+
+    def last_boundary(self, start: int, limit: int) -> int:
+        """Return the last boundary in (start, limit], or start if there is none."""
+        text = self.text
+        space = text[limit] in _WHITESPACE
+        if space != (text[limit - 1] in _WHITESPACE):
+            return limit
+        regex = _through_last_word_re if space else _through_last_space_re
+        match = regex.match(text, start, limit)
+        return match.end() if match else start
+
+    def chunk_end(self, pos: int) -> int:
+        """Return the end of the chunk containing pos."""
+        regex = _space_run_re if self.text[pos] in _WHITESPACE else _word_run_re
+        return regex.match(self.text, pos, self.end).end()
+
+    def chunk_start(self, start: int, end: int) -> int:
+        """Return where the chunk ending at end begins, but not before start."""
+        text = self.text
+        regex = _through_last_word_re if text[end - 1] in _WHITESPACE else _through_last_space_re
+        match = regex.match(text, start, end - 1)
+        return match.end() if match else start
+
+
+class _HyphenChunks(_RunChunks):
+    """Chunk boundaries of text that hyphens may split further.
+
+    textwrap's splitter also breaks after the hyphen of a hyphenated word
+    and on both sides of an em-dash between words. Those breaks only occur
+    next to hyphens, so they are collected with one search over the text
+    and merged with the whitespace-run boundaries.
+    """
+
+    def __init__(self, text: str, start: int, end: int):
+        super().__init__(text, end)
+        breaks = []
+        for match in _hyphen_break_re.finditer(text, start, end):
+            if match.lastindex:
+                breaks.append(match.start())
+            breaks.append(match.end())
+        self.breaks = breaks
+
+    def last_boundary(self, start: int, limit: int) -> int:
+        boundary = super().last_boundary(start, limit)
+        index = bisect.bisect_right(self.breaks, limit) - 1
+        return max(boundary, self.breaks[index]) if index >= 0 else boundary
+
+    def chunk_end(self, pos: int) -> int:
+        end = super().chunk_end(pos)
+        index = bisect.bisect_right(self.breaks, pos)
+        return min(end, self.breaks[index]) if index < len(self.breaks) else end
+
+    def chunk_start(self, start: int, end: int) -> int:
+        chunk_start = super().chunk_start(start, end)
+        index = bisect.bisect_left(self.breaks, end) - 1
+        return max(chunk_start, self.breaks[index]) if index >= 0 else chunk_start
+
+
+def _column_limit(text: str, start: int, end: int, width: int) -> int:
+    """Return where a row starting at start reaches width columns.
+
+    A row always gets at least one character, even one wider than the row.
+    """
+    limit = fit_columns(text, start, end, width)
+    if limit == start:
+        limit = fit_columns(text, start, end, 2)
+    return limit
+
+
+def wrap_spans(text: str, width: int, start: int = 0, end: Optional[int] = None,
+               out: Optional[array] = None) -> array:
+    """Wrap text[start:end] to width columns as offsets.
+
+    Args:
+        text: Text to wrap
+        width: Maximum row width in columns
+        start: Offset of the first character to wrap
+        end: Offset after the last character to wrap (default: end of text)
+        out: Array to append to (default: a new ``array('Q')``)
+
+    Returns:
+        ``out``, with a start and an end offset appended for each row; text
+        that is empty or all whitespace adds no rows
+
+    Raises:
+        ValueError: If width is not positive
+    """
+    if width <= 0:
+        raise ValueError(f"invalid width {width!r} (must be > 0)")
+    if out is None:
+        out = array('Q')
+    if end is None:
+        end = len(text)
+    if start >= end:
+        return out
+
+    # Rows of ASCII text are as wide as they are long; other text is
+    # measured in display columns
+    plain = text.isascii() or text[start:end].isascii()
+    if end - start <= width if plain else fit_columns(text, start, end, width) == end:
+        # The whole text fits on one row; only trailing whitespace is dropped
+        row_end = end
+        while row_end > start and text[row_end - 1] in _WHITESPACE:
+            row_end -= 1
+        if row_end == start:
+            return out
+        if not text[row_end - 1].isspace():
+            out.append(start)
+            out.append(row_end)
+            return out
+
+    if _hyphen_re.search(text, start, end):
+        chunks = _HyphenChunks(text, start, end)
+    else:
+        chunks = _RunChunks(text, end)
+
+    pos = start
+    emitted = False
+    while pos < end:
+        if emitted:
+            # Drop whitespace at the start of every row but the first
+            char = text[pos]
+            if char in _WHITESPACE:
+                pos = _space_run_re.match(text, pos, end).end()
+            elif char.isspace():
+                chunk_end = chunks.chunk_end(pos)
+                if _is_blank(text, pos, chunk_end):
+                    pos = chunk_end
+            if pos >= end:
+                break
+
+        row_start = pos
+        limit = row_start + width if plain else _column_limit(text, row_start, end, width)
+        row_end = end if limit >= end else chunks.last_boundary(row_start, limit)
+        if row_end < end:
+            if text[row_end] in _WHITESPACE:
+                next_end = _space_run_re.match(text, row_end, end).end()
+            else:
+                next_end = chunks.chunk_end(row_end)
+            if plain:
+                long_word = next_end - row_end > width
+            else:
+                long_word = fit_columns(text, row_end, next_end, width) < next_end
+        else:
+            long_word = False
+
+        if long_word:
+            # Split a word that cannot fit on any row, after a hyphen if possible
+            cut = limit
+            hyphen = text.rfind('-', row_end, cut)
+            if hyphen > row_end and text[row_end:hyphen].strip('-'):
+                cut = hyphen + 1
+            pos = cut
+            if cut > row_end and _is_blank(text, row_end, cut):
+                cut = row_end
+            row_end = cut
+        else:
+            pos = row_end
+            if row_end > row_start:
+                # Drop the last chunk if it is whitespace
+                char = text[row_end - 1]
+                if char in _WHITESPACE:
+                    match = _through_last_word_re.match(text, row_start, row_end - 1)
+                    row_end = match.end() if match else row_start
+                elif char.isspace():
+                    last = chunks.chunk_start(row_start, row_end)
+                    if _is_blank(text, last, row_end):
+                        row_end = last
+
+        if row_end > row_start:
+            out.append(row_start)
+            out.append(row_end)
+            emitted = True
+    return out
+
+
+def wrap(text: str, width: int) -> List[str]:
+    """Wrap text to width columns.
+
+    Returns the same rows as ``textwrap.wrap(text, width)`` for text without
+    tabs (textwrap expands tabs first; expand them with ``str.expandtabs()``
+    to match it exactly).
+
+    Args:
+        text: Text to wrap
+        width: Maximum row width in columns
+
+    Returns:
+        List of rows, with whitespace characters replaced by spaces
+    """
+    spans = wrap_spans(text, width)
+    return [text[spans[i]:spans[i + 1]].translate(_TO_SPACE) for i in range(0, len(spans), 2)]
+
+
+def line_spans(text: str, start: int = 0, end: Optional[int] = None) -> Iterator[Tuple[int, int]]:
+    """Yield the (start, end) offsets of the lines of text[start:end].
+
+    Lines are split as :meth:`str.splitlines` splits them, and the offsets
+    exclude the line break.
+    """
+    if end is None:
+        end = len(text)
+    pos = start
+    for match in _line_break_re.finditer(text, start, end):
+        yield pos, match.start()
+        pos = match.end()
+    if pos < end:
+        yield pos, end
@@ -0,0 +1,59 @@
+"""Tests for ANSI style parsing."""
+
+import pytest
+from term_windows import parse_ansi
+
+
+class TestParseAnsi:
+    """Tests for the parse_ansi() function."""
+
+    def test_plain_text_and_runs(self):
+        """Test that SGR sequences become style runs over the plain text."""
+        plain, styles = parse_ansi("\x1b[31mred\x1b[0m plain \x1b[1;32mbold\x1b[22m green\x1b[m")
+        assert plain == "red plain bold green"
+        assert list(styles.runs(0, len(plain))) == [
+            (0, 3, '\x1b[31m'), (10, 14, '\x1b[1;32m'), (14, 20, '\x1b[32m'),
+        ]
+
+    def test_runs_are_clipped(self):
+        """Test that runs are cut to the requested range."""
+        plain, styles = parse_ansi("ab\x1b[4mcdef\x1b[0mgh")
+        assert list(styles.runs(3, 7)) == [(3, 6, '\x1b[4m')]
+        assert list(styles.runs(6, 8)) == []
+
+    @pytest.mark.parametrize('params, attr', [
+        ('38;5;208', '\x1b[38;5;208m'),
+        ('48;2;1;2;3', '\x1b[48;2;1;2;3m'),
+        ('7;94', '\x1b[7;94m'),
+        ('1;2;22', ''),
+        ('31;39', ''),
+        ('4:3', '\x1b[4m'),
+        ('4;4:0', ''),
+        ('1;4:1', '\x1b[1;4m'),
+        ('38:5:208', '\x1b[38;5;208m'),
+        ('38:2::1:2:3', '\x1b[38;2;1;2;3m'),
+        ('48:2:1:2:3', '\x1b[48;2;1;2;3m'),
+        ('38:2:0:10:20:30;1', '\x1b[1;38;2;10;20;30m'),
+    ])
+    def test_sgr_parameters(self, params, attr):
+        """Test that colors and attributes combine into one sequence."""
+        plain, styles = parse_ansi(f"\x1b[{params}mx")
+        assert plain == "x"
+        assert list(styles.runs(0, 1)) == ([(0, 1, attr)] if attr else [])
+
+    def test_other_sequences_are_dropped(self):
+        """Test that non-SGR escapes do not reach the plain text."""
+        plain, styles = parse_ansi("a\x1b[2Kb\x1b]0;title\x07c\x1b(Bd\x1be")
+        assert plain == "abcde"
+        assert len(styles) == 0
+
+    def test_tabs_expand_across_sequences(self):
+        """Test that tab stops count the plain text only."""
+        plain, _ = parse_ansi("ab\x1b[1m\tc\x1b[0m\n\td")
+        assert plain == "ab      c\n        d"
+
+    def test_redundant_changes_are_merged(self):
+        """Test that styles without text in between leave no runs."""
+        plain, styles = parse_ansi("\x1b[31m\x1b[0mx\x1b[1m\x1b[1my\x1b[0m")
+        assert list(styles.starts) == [1, 2]
+        assert styles.attrs == ['\x1b[1m', '']
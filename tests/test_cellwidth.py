@@ -0,0 +1,96 @@
+"""Tests for display width measurement."""
+
+from term_windows import cells, fit_columns, printable, slice_columns, text_width
+
+
+class TestTextWidth:
+    """Tests for text_width()."""
+
+    def test_ascii_width_is_length(self):
+        """Test that ASCII text takes one column per character."""
+        assert text_width("") == 0
+        assert text_width("plain text") == 10
+
+    def test_wide_characters_take_two_columns(self):
+        """Test CJK ideographs, fullwidth forms and emoji."""
+        assert text_width("日本語") == 6
+        assert text_width("ＡＢ") == 4
+        assert text_width("a😀b") == 4
+
+    def test_zero_width_characters(self):
+        """Test that combining marks and format characters take no columns."""
+        assert text_width("e\u0301") == 1
+        assert text_width("a\u200bb") == 2
+
+    def test_joined_emoji_take_one_glyph(self):
+        """Test that a zero-width-joiner sequence is as wide as its first emoji."""
+        assert text_width("\U0001F468\u200d\U0001F469\u200d\U0001F467") == 2
+
+    def test_skin_tone_modifier_joins_its_emoji(self):
+        """Test that a skin tone modifier adds no columns to the emoji before it."""
+        assert text_width("\U0001F44D\U0001F3FD") == 2
+        assert text_width("a\U0001F44D\U0001F3FDb") == 4
+
+    def test_regional_indicators_pair_into_flags(self):
+        """Test that two regional indicators make one flag two columns wide."""
+        assert text_width("\U0001F1EF\U0001F1F5") == 2
+        assert text_width("\U0001F1EF\U0001F1F5\U0001F1EB\U0001F1F7") == 4
+        assert text_width("\U0001F1EF\U0001F1F5\U0001F1EB") == 3
+
+
+class TestClipping:
+    """Tests for fit_columns() and slice_columns()."""
+
+    def test_fit_columns_stops_before_a_wide_character(self):
+        """Test that a wide character straddling the limit is left out."""
+        assert fit_columns("日本語", 0, 3, 3) == 1
+        assert fit_columns("日本語", 1, 3, 4) == 3
+        assert fit_columns("ascii", 1, 5, 2) == 3
+
+    def test_fit_columns_keeps_trailing_marks(self):
+        """Test that marks after the last character kept are kept with it."""
+        assert fit_columns("e\u0301e\u0301", 0, 4, 1) == 2
+
+    def test_fit_columns_keeps_emoji_sequences_whole(self):
+        """Test that modified emoji and flags are kept or left out whole."""
+        assert fit_columns("\U0001F44D\U0001F3FDx", 0, 3, 2) == 2
+        assert fit_columns("a\U0001F1EF\U0001F1F5", 0, 3, 2) == 1
+        assert fit_columns("a\U0001F1EF\U0001F1F5", 0, 3, 3) == 3
+
+    def test_slice_columns(self):
+        """Test that wide characters cut by an edge become spaces."""
+        assert slice_columns("日本語", 0, 4) == "日本"
+        assert slice_columns("日本語", 1, 5) == " 本 "
+        assert slice_columns("abcdef", 2, 4) == "cd"
+        assert slice_columns("abc", 5, 8) == ""
+
+
+class TestCells:
+    """Tests for cells()."""
+
+    def test_wide_clusters_cover_two_cells(self):
+        """Test that wide clusters are followed by an empty cell."""
+        assert cells("a日e\u0301") == ['a', '日', '', 'e\u0301']
+
+    def test_leading_marks_are_dropped(self):
+        """Test that marks with nothing to combine with take no cell."""
+        assert cells("\u0301x") == ['x']
+
+    def test_emoji_sequences_fill_one_wide_cell(self):
+        """Test that a modified emoji and a flag each fill one wide cell."""
+        assert cells("\U0001F44D\U0001F3FD") == ['\U0001F44D\U0001F3FD', '']
+        assert cells("\U0001F1EF\U0001F1F5") == ['\U0001F1EF\U0001F1F5', '']
+
+
+class TestPrintable:
+    """Tests for printable()."""
+
+    def test_controls_are_replaced(self):
+        """Test that C0 and C1 controls become one replacement character each."""
+        assert printable("a\x1b[2Jb\x07\x9bc") == "a\ufffd[2Jb\ufffd\ufffdc"
+        assert text_width(printable("\x1b[2J")) == text_width("\x1b[2J")
+
+    def test_text_without_controls_is_unchanged(self):
+        """Test that tabs and printable text are kept."""
+        text = "tab\there 日本"
+        assert printable(text) == text
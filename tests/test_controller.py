@@ -0,0 +1,521 @@
+"""Tests for WindowController class."""
+
+import asyncio
+import os
+import threading
+import time
+from contextlib import nullcontext
+
+import pytest
+from unittest.mock import Mock, patch
+from blessed import Terminal
+from blessed.keyboard import Keystroke
+from term_windows import FrameWriter, Screen, TextWindow, Window, WindowController
+
+
+def create_mock_terminal(width=80, height=24):
+    """Create a mock Terminal with specified dimensions."""
+    term = Mock(spec=Terminal)
+    term.width = width
+    term.height = height
+    term.move = Mock(return_value='')
+    return term
+
+
+def create_controller(width=80, height=24):
+    """Create a controller whose screen output is discarded."""
+    controller = WindowController(
+        term=create_mock_terminal(width, height), register_resize_handler=False
+    )
+    controller.screen.writer = Mock(spec=FrameWriter)
+    return controller
+
+
+class TableWindow(Window):
+    """Full-screen window that fills its content area and counts draws."""
+
+    def __init__(self, *args, **kwargs):
+        self.draw_count = 0
+        super().__init__(*args, **kwargs)
+
+    def draw(self):
+        self.draw_count += 1
+        super().draw()
+        for row in range(self.content.height):
+            self.screen.put(self.content.y + row, self.content.x, f'{row:>4}' * 19)
+        self.screen.flush()
+
+
+class TestSaveUnder:
+    """Tests for save-under restoration of popped windows."""
+
+    def test_pop_restores_parent_without_redraw(self):
+        """Test that closing a modal restores the cells it covered."""
+        controller = create_controller()
+        parent = TableWindow(term=controller.term)
+        controller.push_window(parent)
+        controller._redraw_top(force=True)
+        before = [controller.screen.row_text(y) for y in range(24)]
+
+        controller.push_window(TextWindow(text="Help text", term=controller.term))
+        controller._redraw_top()
+        assert [controller.screen.row_text(y) for y in range(24)] != before
+
+        controller.pop_window()
+        controller._redraw_top()
+        assert parent.redraw is False
+        assert parent.draw_count == 1
+        assert [controller.screen.row_text(y) for y in range(24)] == before
+
+    def test_pop_over_wide_text_restores_whole_characters(self):
+        """Test that closing a modal over CJK text restores the glyphs its edges cut."""
+        controller = create_controller()
+        parent = TextWindow(text="\n".join(["日本語のテキスト" * 5] * 30), term=controller.term)
+        controller.push_window(parent)
+        controller._redraw_top(force=True)
+        before = [controller.screen.row_text(y) for y in range(24)]
+
+        controller.push_window(TextWindow(text="Help text", term=controller.term))
+        controller._redraw_top()
+
+        controller.pop_window()
+        controller._redraw_top()
+        assert parent.redraw is False
+        assert [controller.screen.row_text(y) for y in range(24)] == before
+
+    def test_moved_window_falls_back_to_redraw(self):
+        """Test that a stale snapshot triggers a parent redraw instead."""
+        controller = create_controller()
+        parent = TableWindow(term=controller.term)
+        controller.push_window(parent)
+        controller._redraw_top(force=True)
+
+        child = Window(width=20, height=5, term=controller.term)
+        controller.push_window(child)
+        child.position.base.width = 30
+        controller.pop_window()
+        assert parent.redraw is True
+
+    def test_resize_discards_snapshots(self):
+        """Test that snapshots from a previous screen are not restored."""
+        controller = create_controller()
+        parent = TableWindow(term=controller.term)
+        controller.push_window(parent)
+        controller.push_window(Window(width=20, height=5, term=controller.term))
+        with patch.object(Screen, 'flush'):
+            controller._process_resize()
+        controller.pop_window()
+        assert parent.redraw is True
+
+    def test_root_window_has_no_snapshot(self):
+        """Test that the bottom window does not save the cells under it."""
+        controller = create_controller()
+        window = Window(term=controller.term)
+        controller.push_window(window)
+        assert window not in controller._save_unders
+        assert controller.pop_window() is window
+
+
+def create_key(name):
+    """Create a Keystroke with the given name."""
+    key = Mock(spec=Keystroke)
+    key.name = name
+    return key
+
+
+class TestKeyCoalescing:
+    """Tests for draining buffered keystrokes before redrawing."""
+
+    def test_drains_buffered_keys(self):
+        """Test that all immediately available keys are read at once."""
+        controller = create_controller()
+        keys = [create_key('KEY_DOWN') for _ in range(3)]
+        controller.term.inkey = Mock(side_effect=keys + [''])
+        assert controller._read_keys() == keys
+        timeouts = [call.kwargs['timeout'] for call in controller.term.inkey.call_args_list]
+        assert timeouts == [controller.inkey_timeout, 0, 0, 0]
+
+    def test_no_key_returns_empty(self):
+        """Test that an idle wait yields no keys."""
+        controller = create_controller()
+        controller.term.inkey = Mock(return_value='')
+        assert controller._read_keys() == []
+
+    def test_keys_per_frame_is_capped(self):
+        """Test that an input flood is split across frames."""
+        controller = create_controller()
+        controller.max_keys_per_frame = 4
+        controller.term.inkey = Mock(side_effect=[create_key('KEY_DOWN') for _ in range(10)])
+        assert len(controller._read_keys()) == 4
+        assert controller.term.inkey.call_count == 4
+
+    def test_held_key_renders_once(self):
+        """Test that a burst of scroll keys produces a single redraw."""
+        controller = create_controller()
+        window = TextWindow(text="\n".join(f"Line {i}" for i in range(100)), term=controller.term)
+        controller.push_window(window)
+        controller._redraw_top(force=True)
+        controller._dispatch_keys([create_key('KEY_DOWN') for _ in range(5)])
+        with patch.object(TextWindow, 'draw') as mock_draw:
+            controller._redraw_top()
+        assert window.scroll == 5
+        assert mock_draw.call_count == 1
+
+    def test_keys_follow_window_stack(self):
+        """Test that keys after a close go to the newly exposed window."""
+        controller = create_controller()
+        parent = Window(term=controller.term)
+        parent.handle_input = Mock()
+        controller.push_window(parent)
+        controller.push_window(Window(term=controller.term))
+        controller._dispatch_keys([create_key('KEY_ESCAPE'), create_key('KEY_ENTER')])
+        assert controller.current_window() is parent
+        parent.handle_input.assert_called_once()
+
+
+class TestSelectorLoop:
+    """Tests for the selector-based event loop."""
+
+    def setup_method(self):
+        self.keyboard_r, self.keyboard_w = os.pipe()
+        self.controller = create_controller()
+        self.controller.term._keyboard_fd = self.keyboard_r
+        self.controller._open_selector()
+
+    def teardown_method(self):
+        self.controller._close_selector()
+        os.close(self.keyboard_r)
+        os.close(self.keyboard_w)
+
+    def test_selector_opened_for_keyboard_fd(self):
+        """Test that a terminal with a keyboard fd gets a selector."""
+        assert self.controller._selector is not None
+        assert self.controller._wakeup_fds is not None
+
+    def test_no_selector_without_keyboard_fd(self):
+        """Test that terminals without a keyboard fd keep polling."""
+        controller = create_controller()
+        controller._open_selector()
+        assert controller._selector is None
+
+    def test_idle_wait_blocks_indefinitely(self):
+        """Test that without tick overrides the loop has no timeout."""
+        self.controller.push_window(Window(term=self.controller.term))
+        assert self.controller._next_timeout() is None
+
+    def test_tick_override_sets_deadline(self):
+        """Test that a window overriding tick() bounds the wait."""
+        class Clock(Window):
+            def tick(self):
+                pass
+
+        self.controller.push_window(Clock(term=self.controller.term))
+        self.controller._next_tick = time.monotonic() + 0.5
+        assert 0 < self.controller._next_timeout() <= 0.5
+
+    def test_keyboard_input_wakes_loop(self):
+        """Test that readable keyboard input ends the wait."""
+        os.write(self.keyboard_w, b'q')
+        assert self.controller._wait(1.0) is True
+
+    def test_wakeup_pipe_interrupts_wait(self):
+        """Test that a wakeup returns promptly without reporting keys."""
+        self.controller._wakeup()
+        start = time.monotonic()
+        assert self.controller._wait(5.0) is False
+        assert time.monotonic() - start < 1.0
+        # The pipe was drained, so the next wait times out
+        assert self.controller._wait(0) is False
+
+    def test_sigwinch_wakes_loop(self):
+        """Test that the resize handler writes to the wakeup pipe."""
+        with patch('term_windows.term_windows.Terminal'):
+            self.controller._handle_sigwinch(None, None)
+        assert self.controller._resize_pending is True
+        assert self.controller._next_timeout() == 0
+        assert self.controller._wait(0) is False
+
+
+@pytest.fixture
+def keyboard():
+    """Yield the (read, write) ends of a non-blocking pipe standing in for the keyboard."""
+    read_fd, write_fd = os.pipe()
+    os.set_blocking(read_fd, False)
+    yield read_fd, write_fd
+    os.close(read_fd)
+    os.close(write_fd)
+
+
+def create_async_controller(keyboard_fd):
+    """Create a controller reading keys from a pipe on the running loop."""
+    controller = create_controller()
+    term = controller.term
+    term.fullscreen = term.cbreak = term.hidden_cursor = Mock(side_effect=nullcontext)
+    term._keyboard_fd = keyboard_fd
+
+    def inkey(timeout=None):
+        try:
+            data = os.read(keyboard_fd, 1)
+        except BlockingIOError:
+            return ''
+        return create_key('KEY_ESCAPE' if data == b'\x1b' else 'KEY_ENTER')
+
+    term.inkey = Mock(side_effect=inkey)
+    return controller
+
+
+class TestRunAsync:
+    """Tests for the asyncio-native event loop."""
+
+    def test_requires_windows(self, keyboard):
+        """Test that run_async() refuses to start with an empty stack."""
+        controller = create_async_controller(keyboard[0])
+        with pytest.raises(RuntimeError):
+            asyncio.run(controller.run_async())
+
+    def test_key_closes_window(self, keyboard):
+        """Test that keys from the reader are dispatched and end the loop."""
+        controller = create_async_controller(keyboard[0])
+        controller.push_window(Window(term=controller.term))
+
+        async def main():
+            asyncio.get_running_loop().call_later(0.05, os.write, keyboard[1], b'\x1b')
+            await asyncio.wait_for(controller.run_async(), 2)
+
+        asyncio.run(main())
+        assert controller.window_stack == []
+
+    def test_async_tick_runs_while_ui_waits(self, keyboard):
+        """Test that an awaiting tick does not block input handling."""
+        controller = create_async_controller(keyboard[0])
+        controller.inkey_timeout = 0.01
+        events = []
+
+        class Feed(TableWindow):
+            async def tick(self):
+                events.append('start')
+                await asyncio.sleep(0.05)
+                events.append('data')
+                self.redraw = True
+
+        window = Feed(term=controller.term)
+        controller.push_window(window)
+
+        async def main():
+            loop = asyncio.get_running_loop()
+            loop.call_later(0.2, os.write, keyboard[1], b'\x1b')
+            await asyncio.wait_for(controller.run_async(), 2)
+
+        asyncio.run(main())
+        assert 'data' in events
+        assert window.draw_count >= 2
+        assert controller._tasks == {}
+
+    def test_async_tick_errors_propagate(self, keyboard):
+        """Test that an exception in a tick task stops the loop."""
+        controller = create_async_controller(keyboard[0])
+        controller.inkey_timeout = 0.01
+
+        class Broken(Window):
+            async def tick(self):
+                raise ValueError('boom')
+
+        controller.push_window(Broken(term=controller.term))
+        with pytest.raises(ValueError):
+            asyncio.run(asyncio.wait_for(controller.run_async(), 2))
+
+
+class TestTimers:
+    """Tests for the heap-based timer scheduler."""
+
+    def test_call_later_fires_after_delay(self):
+        """Test that a timer runs once its deadline has passed."""
+        controller = create_controller()
+        fired = []
+        controller.call_later(0.01, fired.append, 'a')
+        controller._run_timers()
+        assert fired == []
+        time.sleep(0.02)
+        controller._run_timers()
+        controller._run_timers()
+        assert fired == ['a']
+
+    def test_timers_fire_in_deadline_order(self):
+        """Test that timers are run earliest deadline first."""
+        controller = create_controller()
+        fired = []
+        now = time.monotonic()
+        controller.call_at(now - 1, fired.append, 2)
+        controller.call_at(now - 2, fired.append, 1)
+        controller.call_at(now + 60, fired.append, 3)
+        controller._run_timers()
+        assert fired == [1, 2]
+
+    def test_call_every_repeats(self):
+        """Test that repeating timers are rescheduled."""
+        controller = create_controller()
+        fired = []
+        timer = controller.call_every(0.01, fired.append, 'tick')
+        first_deadline = timer.when
+        time.sleep(0.015)
+        controller._run_timers()
+        assert fired == ['tick']
+        assert timer.when > first_deadline
+        assert controller._next_deadline() == timer.when
+
+    def test_cancel(self):
+        """Test that cancelled timers never fire."""
+        controller = create_controller()
+        fired = []
+        timer = controller.call_later(0, fired.append, 'x')
+        timer.cancel()
+        controller._run_timers()
+        assert fired == []
+        assert controller._next_deadline() is None
+
+    def test_deadline_drives_wait_timeout(self):
+        """Test that the next timer bounds how long the loop blocks."""
+        controller = create_controller()
+        controller.push_window(Window(term=controller.term))
+        assert controller._next_timeout() is None
+        controller.call_later(5, lambda: None)
+        assert 4 < controller._next_timeout() <= 5
+        controller.call_later(0.5, lambda: None)
+        assert controller._next_timeout() <= 0.5
+
+    def test_timer_redraw_in_async_loop(self, keyboard):
+        """Test that timer callbacks run and repaint under run_async()."""
+        controller = create_async_controller(keyboard[0])
+        window = TableWindow(term=controller.term)
+        controller.push_window(window)
+
+        def update():
+            window.redraw = True
+
+        controller.call_later(0.02, update)
+
+        async def main():
+            asyncio.get_running_loop().call_later(0.1, os.write, keyboard[1], b'\x1b')
+            await asyncio.wait_for(controller.run_async(), 2)
+
+        asyncio.run(main())
+        assert window.draw_count == 2
+
+
+class TestPost:
+    """Tests for handing work to the UI loop from other threads."""
+
+    def test_posted_callbacks_run_in_order(self):
+        """Test that posted callbacks run on the next loop iteration."""
+        controller = create_controller()
+        ran = []
+        controller.post(ran.append, 1)
+        controller.post(ran.append, 2)
+        assert ran == []
+        controller._run_due()
+        assert ran == [1, 2]
+        assert not controller._posted
+
+    def test_callback_posting_again_runs_next_iteration(self):
+        """Test that a callback re-posting itself does not starve the loop."""
+        controller = create_controller()
+        ran = []
+
+        def again():
+            ran.append('x')
+            controller.post(again)
+
+        controller.post(again)
+        controller._run_posted()
+        assert ran == ['x']
+
+    def test_pending_post_cancels_wait(self):
+        """Test that queued work makes the loop skip blocking."""
+        controller = create_controller()
+        controller.push_window(Window(term=controller.term))
+        assert controller._next_timeout() is None
+        controller.post(lambda: None)
+        assert controller._next_timeout() == 0
+
+    def test_request_redraw_defaults_to_top_window(self):
+        """Test that request_redraw() invalidates the top window on the loop."""
+        controller = create_controller()
+        window = TableWindow(term=controller.term)
+        controller.push_window(window)
+        controller._redraw_top(force=True)
+        controller.request_redraw()
+        assert window.redraw is False
+        controller._run_due()
+        controller._redraw_top()
+        assert window.draw_count == 2
+
+    def test_post_from_thread_wakes_selector(self):
+        """Test that a worker thread interrupts a blocking wait."""
+        keyboard_r, keyboard_w = os.pipe()
+        controller = create_controller()
+        controller.term._keyboard_fd = keyboard_r
+        controller._open_selector()
+        try:
+            ran = []
+            worker = threading.Timer(0.05, controller.post, (ran.append, 'done'))
+            worker.start()
+            start = time.monotonic()
+            controller._wait(5.0)
+            assert time.monotonic() - start < 1.0
+            worker.join()
+            controller._run_posted()
+            assert ran == ['done']
+        finally:
+            controller._close_selector()
+            os.close(keyboard_r)
+            os.close(keyboard_w)
+
+    def test_submit_runs_on_worker_thread(self):
+        """Test that submit() runs work off the loop and the pool is shut down afterwards."""
+        controller = create_controller()
+        job = controller.submit(threading.current_thread)
+        assert job.result(5) is not threading.current_thread()
+        executor = controller._executor
+        controller._shutdown_workers()
+        assert controller._executor is None
+        with pytest.raises(RuntimeError):
+            executor.submit(print)
+
+    def test_post_from_thread_under_asyncio(self, keyboard):
+        """Test that posted work wakes run_async() and repaints."""
+        controller = create_async_controller(keyboard[0])
+        window = TableWindow(term=controller.term)
+        controller.push_window(window)
+
+        def worker():
+            time.sleep(0.05)
+            controller.request_redraw(window)
+            time.sleep(0.05)
+            controller.post(controller.pop_window)
+
+        async def main():
+            threading.Thread(target=worker).start()
+            await asyncio.wait_for(controller.run_async(), 2)
+
+        asyncio.run(main())
+        assert window.draw_count == 2
+        assert controller.window_stack == []
+
+    def test_post_coroutine_with_unhashable_args(self, keyboard):
+        """Test that posted coroutines with list arguments each run as their own task."""
+        controller = create_async_controller(keyboard[0])
+        controller.push_window(TableWindow(term=controller.term))
+        received = []
+
+        async def consume(items):
+            await asyncio.sleep(0.01)
+            received.append(list(items))
+
+        async def main():
+            controller.post(consume, [1, 2])
+            controller.post(consume, [1, 2])
+            asyncio.get_running_loop().call_later(0.1, os.write, keyboard[1], b'\x1b')
+            await asyncio.wait_for(controller.run_async(), 2)
+
+        asyncio.run(main())
+        assert received == [[1, 2], [1, 2]]
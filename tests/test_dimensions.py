@@ -174,3 +174,56 @@ class TestOffsetDimensions:
         assert offset.width == 50
         assert offset.height == 20
 
+
+
+class TestLayoutCache:
+    """Tests for caching resolved rectangles."""
+
+    def test_resolved_values_are_cached(self):
+        """Test that a resolved field is stored on the instance."""
+        constrained = ConstrainedDimensions(
+            Dimensions(x=None, y=None, width=50, height=20), Dimensions(0, 0, 100, 40)
+        )
+        assert constrained.x == 25
+        assert constrained.__dict__['x'] == 25
+        assert constrained.__dict__['width'] == 50
+
+    def test_assigning_a_field_invalidates(self):
+        """Test that assigning base or constraint fields re-resolves the rectangle."""
+        base = Dimensions(x=None, y=None, width=50, height=20)
+        constraints = Dimensions(0, 0, 100, 40)
+        constrained = ConstrainedDimensions(base, constraints)
+        assert (constrained.x, constrained.width) == (25, 50)
+        base.width = 60
+        assert (constrained.x, constrained.width) == (20, 60)
+        constraints.width = 80
+        assert constrained.x == 10
+        constraints.height = 30
+        assert constrained.y == 5
+
+    def test_replacing_a_source_invalidates(self):
+        """Test that assigning a new base rectangle re-resolves the rectangle."""
+        constrained = ConstrainedDimensions(Dimensions(0, 0, 10, 10), Dimensions(0, 0, 80, 24))
+        assert constrained.width == 10
+        old = constrained.base
+        constrained.base = Dimensions(0, 0, 30, 10)
+        assert constrained.width == 30
+        old.width = 5
+        assert constrained.width == 30
+
+    def test_invalidation_reaches_offset_dimensions(self):
+        """Test that a window's content area follows changes to its constraints."""
+        constraints = Dimensions(0, 0, 80, 24)
+        position = ConstrainedDimensions(Dimensions(None, None, 40, 10), constraints)
+        content = OffsetDimensions(position, Dimensions(1, 1, -2, -2))
+        assert (content.x, content.y, content.width, content.height) == (21, 8, 38, 8)
+        constraints.width = 60
+        assert content.x == 11
+        position.base.height = 12
+        assert (content.y, content.height) == (7, 10)
+
+    def test_equality_ignores_observers(self):
+        """Test that watched rectangles still compare by their fields."""
+        base = Dimensions(1, 2, 3, 4)
+        ConstrainedDimensions(base, Dimensions(0, 0, 80, 24)).x
+        assert base == Dimensions(1, 2, 3, 4)
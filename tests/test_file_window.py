@@ -0,0 +1,181 @@
+"""Tests for FileWindow and FileIndex classes."""
+
+import pytest
+from unittest.mock import Mock
+from blessed import Terminal
+from blessed.keyboard import Keystroke
+from term_windows import FileIndex, FileWindow, FrameWriter, WindowController
+
+
+def create_mock_terminal(width=80, height=24):
+    """Create a mock Terminal with specified dimensions."""
+    term = Mock(spec=Terminal)
+    term.width = width
+    term.height = height
+    term.move = Mock(return_value='')
+    return term
+
+
+def write_lines(path, count):
+    """Write a file of numbered lines and return its path."""
+    path.write_text("".join(f"line {i}\n" for i in range(count)))
+    return path
+
+
+class TestFileIndex:
+    """Tests for the FileIndex class."""
+
+    @pytest.mark.parametrize('data, lines', [
+        (b"", [""]),
+        (b"one", ["one"]),
+        (b"one\n", ["one"]),
+        (b"one\r\ntwo\n\nfour", ["one", "two", "", "four"]),
+        (b"tab\there\n\xff bad", ["tab     here", "� bad"]),
+    ])
+    def test_lines(self, tmp_path, data, lines):
+        """Test line splitting and decoding."""
+        path = tmp_path / "data.txt"
+        path.write_bytes(data)
+        index = FileIndex(path)
+        try:
+            assert len(index) == len(lines)
+            assert [index[i] for i in range(len(lines))] == lines
+            with pytest.raises(IndexError):
+                index[len(lines)]
+        finally:
+            index.close()
+
+    def test_lookup_indexes_only_what_is_needed(self, tmp_path):
+        """Test that reading the first page scans only the first chunk."""
+        index = FileIndex(write_lines(tmp_path / "log.txt", 5000))
+        index.CHUNK_BYTES = 1024
+        try:
+            assert index[10] == "line 10"
+            assert not index.complete
+            assert index.known_rows < 5000
+            assert index.estimated_rows() > index.known_rows
+        finally:
+            index.close()
+
+    def test_chunk_boundaries(self, tmp_path):
+        """Test that lines spanning chunks are indexed correctly."""
+        index = FileIndex(write_lines(tmp_path / "log.txt", 300))
+        index.CHUNK_BYTES = 7
+        try:
+            assert len(index) == 300
+            assert index[299] == "line 299"
+        finally:
+            index.close()
+
+
+class TestFileWindow:
+    """Tests for the FileWindow class."""
+
+    def key(self, name):
+        key = Mock(spec=Keystroke)
+        key.name = name
+        return key
+
+    def test_first_page_without_full_scan(self, tmp_path):
+        """Test that a window shows before the file is indexed."""
+        path = write_lines(tmp_path / "app.log", 200000)
+        window = FileWindow(path, term=create_mock_terminal())
+        try:
+            assert window.title == "app.log"
+            assert not window._lines.complete
+            window.draw()
+            assert window.screen.row_text(window.content.y).strip('| ').startswith("line 0")
+            assert window.scroll_pos == 0
+        finally:
+            window.close()
+
+    def test_control_characters_are_not_drawn(self, tmp_path):
+        """Test that escape sequences and bells in the file are shown, not sent."""
+        path = tmp_path / "app.log"
+        path.write_bytes(b"clear\x1b[2J bell\x07\n")
+        window = FileWindow(path, term=create_mock_terminal())
+        try:
+            window.draw()
+            row = window.screen.row_text(window.content.y)
+            assert "clear\ufffd[2J bell\ufffd" in row
+            assert "\x1b" not in row and "\x07" not in row
+        finally:
+            window.close()
+
+    def test_search_is_not_supported(self, tmp_path):
+        """Test that searching a file raises a clear error."""
+        path = write_lines(tmp_path / "app.log", 10)
+        window = FileWindow(path, term=create_mock_terminal())
+        try:
+            with pytest.raises(RuntimeError, match="FileWindow does not support search"):
+                window.search("line 3")
+        finally:
+            window.close()
+
+    def test_scrolls_while_indexing(self, tmp_path):
+        """Test that scrolling works on the part of the file indexed so far."""
+        path = write_lines(tmp_path / "app.log", 200000)
+        window = FileWindow(path, term=create_mock_terminal())
+        try:
+            window.draw()
+            window.handle_input(self.key('KEY_PGDOWN'))
+            window.draw()
+            assert window.scroll == window.content.height
+            assert 0 < window.scroll_pos < 0.01
+        finally:
+            window.close()
+
+    def test_controller_indexes_in_background(self, tmp_path):
+        """Test that a managed window finishes indexing on the worker pool."""
+        path = write_lines(tmp_path / "app.log", 100000)
+        controller = WindowController(term=create_mock_terminal(), register_resize_handler=False)
+        controller.screen.writer = Mock(spec=FrameWriter)
+        window = FileWindow(path, term=controller.term)
+        controller.push_window(window)
+        controller._redraw_top(force=True)
+        try:
+            job, stop = window._indexing
+            job.result(5)
+            assert window._lines.complete
+            controller._run_due()
+            assert window._indexing is None
+            controller._redraw_top()
+            assert window._lines.estimated_rows() == 100000
+        finally:
+            window.close()
+            controller._shutdown_workers()
+
+    def test_close_stops_indexing(self, tmp_path):
+        """Test that closing a window cancels its indexing job before unmapping the file."""
+        path = write_lines(tmp_path / "app.log", 200000)
+        controller = WindowController(term=create_mock_terminal(), register_resize_handler=False)
+        controller.screen.writer = Mock(spec=FrameWriter)
+        window = FileWindow(path, term=controller.term)
+        window.INDEX_SLICE = 4096
+        controller.push_window(window)
+        controller._redraw_top(force=True)
+        job, stop = window._indexing
+        window.close()
+        assert stop.is_set() and job.done()
+        assert window._indexing is None
+        assert window._file_index._map is None
+        controller._shutdown_workers()
+
+    def test_close_releases_file(self, tmp_path):
+        """Test that Esc closes the window and unmaps the file."""
+        window = FileWindow(write_lines(tmp_path / "app.log", 10), term=create_mock_terminal())
+        window.handle_input(self.key('KEY_ESCAPE'))
+        assert window.closed
+        assert window._file_index._map is None
+
+    def test_scrolls_sideways(self, tmp_path):
+        """Test that long file lines can be scrolled into view."""
+        path = tmp_path / "wide.log"
+        path.write_text("x" * 200 + "\n")
+        window = FileWindow(path, term=create_mock_terminal())
+        try:
+            window.handle_input(self.key('KEY_RIGHT'))
+            window.draw()
+            assert window.hscroll == FileWindow.HSCROLL_STEP
+        finally:
+            window.close()
@@ -0,0 +1,169 @@
+"""Tests for LogWindow class."""
+
+import io
+
+import pytest
+from unittest.mock import Mock
+from blessed import Terminal
+from blessed.keyboard import Keystroke
+from term_windows import FrameWriter, LogWindow, Screen
+
+
+def create_mock_terminal(width=80, height=24):
+    """Create a mock Terminal with specified dimensions."""
+    term = Mock(spec=Terminal)
+    term.width = width
+    term.height = height
+    term.move = Mock(return_value='')
+    return term
+
+
+LINES = "".join(f"line {i}\n" for i in range(40))
+
+
+class TestLogWindow:
+    """Tests for the LogWindow class."""
+
+    @pytest.fixture
+    def create_window(self, monkeypatch):
+        monkeypatch.setenv('COLUMNS', '60')
+        monkeypatch.setenv('LINES', '20')
+
+        def create(text='', **kwargs):
+            term = Terminal(kind='xterm-256color', stream=io.StringIO(), force_styling=True)
+            window = LogWindow(text, term=term, **kwargs)
+            self.output = io.StringIO()
+            window.controller = Mock(screen=Screen(term, writer=FrameWriter(self.output)))
+            window.draw()
+            self.output.seek(0)
+            self.output.truncate()
+            return window
+        return create
+
+    def key(self, name):
+        key = Mock(spec=Keystroke)
+        key.name = name
+        return key
+
+    def row(self, window, i):
+        row = window.screen.row_text(window.content.y + i)
+        return row[window.content.x + 1:window.content.x + window.content.width - 1].rstrip()
+
+    def test_fills_available_space(self):
+        """Test that the window does not shrink to its text."""
+        window = LogWindow("short", term=create_mock_terminal())
+        assert window.position.width == 72
+        assert window.position.height == 21
+        assert window.text == "short"
+
+    def test_control_characters_are_not_written(self, create_window):
+        """Test that escape sequences appended to the log do not reach the terminal."""
+        window = create_window()
+        window.append("clear\x1b[2J bell\x07\n")
+        window.draw()
+        assert self.row(window, 0) == "clear\ufffd[2J bell\ufffd"
+        output = self.output.getvalue()
+        assert "\x1b[2J" not in output and "\x07" not in output
+
+    def test_search_is_not_supported(self, create_window):
+        """Test that searching a log raises a clear error."""
+        window = create_window(LINES)
+        with pytest.raises(RuntimeError, match="LogWindow does not support search"):
+            window.search("line 3")
+
+    def test_starts_at_bottom(self, create_window):
+        """Test that an existing log is shown from its end."""
+        window = create_window(LINES)
+        assert window.scroll == 40 - window.content.height
+        assert self.row(window, window.content.height - 1) == "line 39"
+
+    def test_follows_appended_text(self, create_window):
+        """Test that the view stays at the bottom as lines arrive."""
+        window = create_window()
+        height = window.content.height
+        for i in range(height + 5):
+            window.append(f"line {i}\n")
+            window.draw()
+        assert window.scroll == 5
+        assert self.row(window, 0) == "line 5"
+        assert self.row(window, height - 1) == f"line {height + 4}"
+
+    def test_border_shows_overflow(self, create_window):
+        """Test that the corners and status bar are redrawn once the log outgrows the window."""
+        window = create_window()
+        for i in range(window.content.height + 5):
+            window.append(f"line {i}\n")
+            window.draw()
+        screen = window.screen
+        left, right = window.position.x, window.position.x + window.position.width
+        top = screen.row_text(window.position.y)[left:right]
+        bottom = screen.row_text(window.position.y + window.position.height - 1)[left:right]
+        assert window.status_bar == '[Arrows/PgUp/PgDn=Scroll, Esc=Close]'
+        assert top.endswith('^')
+        assert bottom.endswith(' [Arrows/PgUp/PgDn=Scroll, Esc=Close] v')
+
+    def test_append_uses_scroll_region(self, create_window):
+        """Test that following a log moves rows on screen instead of redrawing them."""
+        window = create_window(LINES)
+        window.append("new line\n")
+        assert window._pending_scroll == 1
+        window.draw()
+        output = self.output.getvalue()
+        assert 'new line' in output
+        assert 'line 30' not in output
+        assert self.row(window, window.content.height - 1) == "new line"
+
+    def test_scrolling_up_stops_following(self, create_window):
+        """Test that the view stays put while scrolled up, and follows again at the bottom."""
+        window = create_window(LINES)
+        bottom = window.scroll
+        window.handle_input(self.key('KEY_UP'))
+        assert not window.follow
+        window.append("more\n")
+        window.draw()
+        assert window.scroll == bottom - 1
+        window.handle_input(self.key('KEY_PGDOWN'))
+        assert window.follow
+        assert window.scroll == bottom + 1
+
+    def test_open_line_is_redrawn(self, create_window):
+        """Test that continuing the last line repaints its row."""
+        window = create_window("first\nsec")
+        window.append("ond")
+        window.draw()
+        assert self.row(window, 1) == "second"
+        assert 'first' not in self.output.getvalue()
+
+    def test_bounded_scrollback_follows(self, create_window):
+        """Test that eviction keeps the view at the bottom while following."""
+        window = create_window(LINES, max_lines=30)
+        for i in range(40, 50):
+            window.append(f"line {i}\n")
+        window.draw()
+        assert window._lines.source_lines == 30
+        assert window.scroll == 30 - window.content.height
+        assert self.row(window, window.content.height - 1) == "line 49"
+
+    def test_eviction_keeps_scrolled_view(self, create_window):
+        """Test that a view scrolled up keeps showing the same lines as older ones are evicted."""
+        window = create_window(LINES, max_lines=40)
+        for _ in range(10):
+            window.handle_input(self.key('KEY_UP'))
+        window.draw()
+        top = self.row(window, 0)
+        window.append("line 40\nline 41\n")
+        # Only the scrollbar marker moves
+        assert window._damage and all(rect.width == 1 for rect in window._damage)
+        assert window._lines[window.scroll] == top
+
+    def test_eviction_of_visible_rows_redraws(self, create_window):
+        """Test that evicting rows on screen moves the view to the top."""
+        window = create_window(LINES, max_lines=40)
+        window.handle_input(self.key('KEY_PGUP'))
+        window.handle_input(self.key('KEY_PGUP'))
+        window.draw()
+        window.append("".join(f"line {i}\n" for i in range(40, 45)))
+        assert window.scroll == 0
+        assert window.redraw
+        window.draw()
+        assert self.row(window, 0) == "line 5"
@@ -0,0 +1,321 @@
+"""Tests for Screen class."""
+
+import io
+import os
+
+import pytest
+from unittest.mock import Mock, patch
+from blessed import Terminal
+from term_windows import (
+    CapabilityCache, CursorOptimizer, FrameWriter, Screen, Window, WindowController,
+)
+
+
+def create_mock_terminal(width=20, height=5):
+    """Create a mock Terminal that renders moves as readable markers."""
+    term = Mock(spec=Terminal)
+    term.width = width
+    term.height = height
+    term.move = Mock(side_effect=lambda y, x: f'<{y},{x}>')
+    term.normal = '<N>'
+    return term
+
+
+class TestScreen:
+    """Tests for the Screen class."""
+
+    def test_initial_contents_are_blank(self):
+        """Test that a new screen is filled with blank cells."""
+        screen = Screen(create_mock_terminal())
+        assert screen.width == 20
+        assert screen.height == 5
+        assert screen.row_text(0) == ' ' * 20
+        assert screen.cell(2, 3) == (' ', '')
+
+    def test_put_clips_to_bounds(self):
+        """Test that text outside the screen is discarded."""
+        screen = Screen(create_mock_terminal())
+        screen.put(0, 17, 'abcdef')
+        screen.put(1, -2, 'xyz')
+        screen.put(9, 0, 'ignored')
+        assert screen.row_text(0).endswith('abc')
+        assert screen.row_text(1).startswith('z ')
+
+    def test_wide_characters_take_two_cells(self):
+        """Test that a wide character is followed by a covered cell."""
+        screen = Screen(create_mock_terminal())
+        screen.put(0, 0, '日本e\u0301')
+        assert screen.cell(0, 0) == ('日', '')
+        assert screen.cell(0, 1) == ('', '')
+        assert screen.cell(0, 4) == ('e\u0301', '')
+        assert screen.row_text(0).startswith('日本e\u0301 ')
+
+    def test_wide_character_cut_by_edge_is_blank(self):
+        """Test that half a wide character is never left on screen."""
+        screen = Screen(create_mock_terminal())
+        screen.put(0, 19, '日')
+        screen.put(1, -1, '日本')
+        assert screen.cell(0, 19) == (' ', '')
+        assert screen.row_text(1).startswith(' 本 ')
+
+    def test_overwriting_half_a_wide_character(self):
+        """Test that the other half of an overwritten wide character is blanked."""
+        screen = Screen(create_mock_terminal())
+        screen.put(0, 0, '日本')
+        screen.put(0, 1, 'x')
+        screen.put(0, 2, 'y')
+        assert screen.row_text(0).startswith(' xy ')
+
+    def test_render_sends_wide_characters_whole(self):
+        """Test that a changed wide character is sent once, from its first cell."""
+        screen = Screen(create_mock_terminal())
+        screen.put(0, 0, '日本')
+        screen.render()
+        screen.put(0, 2, '語')
+        assert screen.render() == '<0,2>語'
+
+    def test_wide_glyph_under_cursor_column_is_not_reemitted(self):
+        """Test that a move onto a row does not re-draw from a covered cell."""
+        screen = Screen(create_xterm())
+        screen.put(1, 0, 'bbbb日cdefg')
+        screen.render()
+        screen.put(0, 0, 'QQQQQ')
+        screen.put(1, 7, 'Z')
+        output = screen.render()
+        assert not output.endswith('cZ')
+        assert output.endswith('Z')
+        assert screen.row_text(1).startswith('bbbb日cZefg')
+
+    def test_restore_keeps_wide_characters_whole(self):
+        """Test that a region whose edges cut wide characters restores them whole."""
+        screen = Screen(create_xterm())
+        screen.put(0, 0, 'ab日本cd')
+        screen.render()
+        region = screen.save(0, 3, 2, 1)
+        screen.put(0, 3, 'XY')
+        screen.render()
+        screen.restore(region)
+        assert screen.row_text(0).startswith('ab日本cd')
+        assert screen.cell(0, 4) == ('本', '')
+        assert '日本' in screen.render()
+
+    def test_first_render_paints_every_row(self):
+        """Test that unknown terminal contents are fully repainted."""
+        screen = Screen(create_mock_terminal())
+        output = screen.render()
+        for y in range(5):
+            assert f'<{y},0>' + ' ' * 20 in output
+
+    def test_render_emits_only_changed_cells(self):
+        """Test that unchanged cells are not re-sent."""
+        screen = Screen(create_mock_terminal())
+        screen.render()
+        screen.put(2, 5, 'hi')
+        assert screen.render() == '<2,5>hi'
+        assert screen.render() == ''
+
+    def test_rewriting_identical_text_emits_nothing(self):
+        """Test that redrawing the same content produces no output."""
+        screen = Screen(create_mock_terminal())
+        screen.put(1, 0, 'same')
+        screen.render()
+        screen.put(1, 0, 'same')
+        assert screen.render() == ''
+
+    def test_attribute_changes_are_emitted(self):
+        """Test that attributes switch and reset around styled cells."""
+        screen = Screen(create_mock_terminal())
+        screen.render()
+        screen.put(0, 0, 'ab', '<B>')
+        screen.put(0, 2, 'c')
+        assert screen.render() == '<0,0><B>ab<N>c'
+
+    def test_invalidate_forces_full_repaint(self):
+        """Test that invalidate() forgets what is on the terminal."""
+        screen = Screen(create_mock_terminal())
+        screen.render()
+        screen.invalidate()
+        assert screen.render().count(' ' * 20) == 5
+
+    def test_frame_defers_flush(self):
+        """Test that flushes inside a frame are combined into one."""
+        writer = Mock(spec=FrameWriter)
+        writer.encoding = 'utf-8'
+        screen = Screen(create_mock_terminal(), writer=writer)
+        with screen.frame():
+            screen.put(0, 0, 'a')
+            screen.flush()
+            screen.put(1, 0, 'b')
+            screen.flush()
+            assert writer.flush.call_count == 0
+        assert writer.write.call_count == 1
+        assert writer.flush.call_count == 1
+
+    def test_for_terminal_is_shared(self):
+        """Test that windows on the same Terminal share one screen."""
+        term = create_mock_terminal()
+        assert Screen.for_terminal(term) is Screen.for_terminal(term)
+        assert Window(term=term).screen is Screen.for_terminal(term)
+
+    def test_controller_owns_screen(self):
+        """Test that managed windows draw into the controller's screen."""
+        term = create_mock_terminal(80, 24)
+        controller = WindowController(term=term, register_resize_handler=False)
+        window = Window(term=term)
+        controller.push_window(window)
+        assert window.screen is controller.screen
+
+
+class TestCapabilityCache:
+    """Tests for the CapabilityCache class."""
+
+    def test_move_is_memoized(self):
+        """Test that term.move() is only called once per position."""
+        term = create_mock_terminal()
+        caps = CapabilityCache(term)
+        assert caps.move(1, 2) == '<1,2>'
+        assert caps.move(1, 2) == '<1,2>'
+        assert caps.move(3, 4) == '<3,4>'
+        assert term.move.call_count == 2
+
+    def test_parameterized_capability(self):
+        """Test that capabilities are cached per name and arguments."""
+        term = create_mock_terminal()
+        term.move_x = Mock(side_effect=lambda x: f'<x{x}>')
+        caps = CapabilityCache(term)
+        assert caps.cap('normal') == '<N>'
+        assert caps.cap('move_x', 5) == '<x5>'
+        assert caps.cap('move_x', 5) == '<x5>'
+        assert term.move_x.call_count == 1
+
+    def test_clear(self):
+        """Test that clear() drops cached sequences."""
+        term = create_mock_terminal()
+        caps = CapabilityCache(term)
+        caps.move(0, 0)
+        caps.clear()
+        caps.move(0, 0)
+        assert term.move.call_count == 2
+
+    def test_resize_uses_new_terminal(self):
+        """Test that the controller's cache follows a resized Terminal."""
+        term = create_mock_terminal(80, 24)
+        controller = WindowController(term=term, register_resize_handler=False)
+        controller.push_window(Window(term=term))
+        controller.term = create_mock_terminal(100, 30)
+        with patch.object(Screen, 'flush'):
+            controller._process_resize()
+        assert controller.screen.caps.term is controller.term
+        assert controller.screen.width == 100
+
+
+def create_xterm():
+    """Create a styling xterm Terminal that writes nowhere."""
+    return Terminal(kind='xterm-256color', stream=io.StringIO(), force_styling=True)
+
+
+class TestCursorOptimizer:
+    """Tests for the CursorOptimizer class."""
+
+    def setup_method(self):
+        self.optimizer = CursorOptimizer(CapabilityCache(create_xterm()))
+
+    def test_unknown_position_uses_cup(self):
+        """Test that absolute positioning is used when the cursor is lost."""
+        assert self.optimizer.move(None, None, 3, 4) == '\x1b[4;5H'
+
+    def test_no_move_needed(self):
+        """Test that reaching the current position costs nothing."""
+        assert self.optimizer.move(3, 4, 3, 4) == ''
+
+    def test_short_gap_reemits_glyphs(self):
+        """Test that a gap shorter than CUF is re-drawn instead."""
+        chars = list('abcdefghij')
+        attrs = [''] * 10
+        assert self.optimizer.move(0, 2, 0, 5, chars, attrs) == 'cde'
+
+    def test_styled_gap_is_not_reemitted(self):
+        """Test that glyphs in another attribute are not re-drawn."""
+        chars = list('abcdefghij' * 3)
+        attrs = ['\x1b[1m'] * 30
+        assert self.optimizer.move(0, 20, 0, 23, chars, attrs) == '\x1b[3C'
+
+    def test_relative_forward_move(self):
+        """Test that CUF beats CUP and HPA on the same row."""
+        assert self.optimizer.move(10, 20, 10, 25) == '\x1b[5C'
+
+    def test_horizontal_absolute_move(self):
+        """Test that HPA is used when it is the shortest option."""
+        assert self.optimizer.move(10, 90, 10, 4) == '\x1b[5G'
+
+    def test_carriage_return_line_feed(self):
+        """Test that CR+LF reaches the start of the next row."""
+        assert self.optimizer.move(5, 50, 6, 0) == '\r\n'
+
+    def test_far_move_uses_cup(self):
+        """Test that long diagonal moves fall back to CUP."""
+        assert self.optimizer.move(0, 0, 20, 40) == '\x1b[21;41H'
+
+    def test_screen_render_uses_optimizer(self, monkeypatch):
+        """Test that nearby changes on one row are joined cheaply."""
+        monkeypatch.setenv('COLUMNS', '40')
+        monkeypatch.setenv('LINES', '5')
+        screen = Screen(create_xterm(), writer=FrameWriter(io.StringIO()))
+        screen.put(1, 0, 'hello world')
+        screen.render()
+        screen.put(1, 0, 'J')
+        screen.put(1, 4, 'O')
+        screen.put(2, 0, 'x')
+        assert screen.render() == '\x1b[2;1HJellO\r\nx'
+
+
+class TestFrameWriter:
+    """Tests for the FrameWriter class."""
+
+    def test_single_write_per_frame(self):
+        """Test that a frame is sent to the fd with one os.write call."""
+        read_fd, write_fd = os.pipe()
+        try:
+            with os.fdopen(write_fd, 'w', encoding='utf-8', closefd=False) as stream:
+                writer = FrameWriter(stream)
+                writer.write('\x1b[1;1Hhello ')
+                writer.write('w\u00f6rld')
+                with patch('os.write', wraps=os.write) as mock_write:
+                    writer.flush()
+                assert mock_write.call_count == 1
+            assert os.read(read_fd, 100) == '\x1b[1;1Hhello w\u00f6rld'.encode('utf-8')
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+    def test_partial_writes_are_retried(self):
+        """Test that short writes are continued until the frame is sent."""
+        stream = Mock()
+        stream.fileno.return_value = 99
+        writer = FrameWriter(stream, encoding='ascii')
+        writer.write('abcdefgh')
+        sent = []
+
+        def short_write(fd, data):
+            sent.append(bytes(data[:3]))
+            return len(sent[-1])
+
+        with patch('os.write', side_effect=short_write):
+            writer.flush()
+        assert b''.join(sent) == b'abcdefgh'
+        assert len(writer) == 0
+
+    def test_stream_without_fileno(self):
+        """Test fallback to stream.write() for streams without a descriptor."""
+        stream = io.StringIO()
+        writer = FrameWriter(stream)
+        writer.write('abc')
+        writer.flush()
+        assert stream.getvalue() == 'abc'
+
+    def test_empty_flush_does_not_write(self):
+        """Test that flushing an empty frame makes no system call."""
+        writer = FrameWriter(Mock())
+        with patch('os.write') as mock_write:
+            writer.flush()
+        mock_write.assert_not_called()
@@ -0,0 +1,67 @@
+"""Tests for TextSearch class."""
+
+import pytest
+from term_windows import TextSearch
+
+
+class TestTextSearch:
+    """Tests for the TextSearch class."""
+
+    def test_finds_non_overlapping_hits(self):
+        """Test that hits are the starts of non-overlapping matches."""
+        search = TextSearch("aaaa abab aa", "aa")
+        assert not search.search_more()
+        assert list(search.hits) == [0, 2, 10]
+        assert search.complete
+
+    @pytest.mark.parametrize('chunk', [1, 2, 3, 5, 7])
+    def test_chunks_match_whole_search(self, chunk):
+        """Test that hits spanning chunk boundaries are found once."""
+        text = "the cat sat on the mat; the end of the theme" * 3
+        search = TextSearch(text, "the")
+        while search.search_more(chunk):
+            pass
+        expected = []
+        hit = text.find("the")
+        while hit != -1:
+            expected.append(hit)
+            hit = text.find("the", hit + 3)
+        assert list(search.hits) == expected
+
+    def test_searches_incrementally(self):
+        """Test that one call only scans one chunk."""
+        search = TextSearch("x" * 100 + "needle", "needle")
+        assert search.search_more(50)
+        assert len(search) == 0
+        assert search.searched == 50
+        while search.search_more(50):
+            pass
+        assert list(search.hits) == [100]
+
+    def test_empty_query(self):
+        """Test that an empty query finds nothing."""
+        search = TextSearch("text", "")
+        assert search.complete
+        assert not search.search_more()
+        assert len(search) == 0
+
+    def test_next_and_previous_hit(self):
+        """Test stepping through the sorted hits."""
+        search = TextSearch("ab ab ab", "ab")
+        search.search_more()
+        assert search.next_hit(0) == 0
+        assert search.next_hit(1) == 1
+        assert search.next_hit(7) is None
+        assert search.previous_hit(3) == 0
+        assert search.previous_hit(4) == 1
+        assert search.previous_hit(0) is None
+
+    def test_hits_between(self):
+        """Test finding the hits that overlap a range, including partial overlaps."""
+        search = TextSearch("abcabcabc", "bca")
+        search.search_more()
+        assert list(search.hits) == [1, 4]
+        assert list(search.hits_between(0, 2)) == [0]
+        assert list(search.hits_between(3, 4)) == [0]
+        assert list(search.hits_between(4, 9)) == [1]
+        assert list(search.hits_between(7, 9)) == []
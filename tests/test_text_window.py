@@ -1,10 +1,13 @@
 """Tests for TextWindow class."""
 
+import io
+import re
+
 import pytest
 from unittest.mock import Mock, patch
 from blessed import Terminal
 from blessed.keyboard import Keystroke
-from term_windows import TextWindow
+from term_windows import Dimensions, FrameWriter, Screen, TextSearch, TextWindow, WindowController
 
 
 def create_mock_terminal(width=80, height=24):
@@ -16,6 +19,13 @@ def create_mock_terminal(width=80, height=24):
     return term
 
 
+def create_xterm(monkeypatch, width, height):
+    """Create a styling xterm Terminal of the given size that writes nowhere."""
+    monkeypatch.setenv('COLUMNS', str(width))
+    monkeypatch.setenv('LINES', str(height))
+    return Terminal(kind='xterm-256color', stream=io.StringIO(), force_styling=True)
+
+
 class TestTextWindow:
     """Tests for the TextWindow class."""
     
@@ -243,3 +253,419 @@ class TestTextWindow:
         assert window.position.width >= 10  # Minimum width
         assert window.position.height >= 6   # Minimum height
 
+
+
+class TestTextWindowHardwareScroll:
+    """Tests for scroll-region based scrolling."""
+
+    def create_window(self, monkeypatch, scroll=0):
+        term = create_xterm(monkeypatch, 60, 20)
+        window = TextWindow(text="\n".join(f"Line {i}" for i in range(100)), term=term)
+        window.scroll = scroll
+        self.output = io.StringIO()
+        screen = Screen(term, writer=FrameWriter(self.output))
+        window.controller = Mock(screen=screen)
+        window.draw()
+        self.output.seek(0)
+        self.output.truncate()
+        return window, screen
+
+    def key(self, name):
+        key = Mock(spec=Keystroke)
+        key.name = name
+        return key
+
+    def test_line_scroll_uses_scroll_region(self, monkeypatch):
+        """Test that one-line scrolls move existing lines on the terminal."""
+        window, screen = self.create_window(monkeypatch)
+        window.handle_input(self.key('KEY_DOWN'))
+        window.draw()
+        assert window.damage != [window.rect]
+        output = self.output.getvalue()
+        top = window.content.y
+        bottom = top + window.content.height - 1
+        assert f'\x1b[{top + 1};{bottom + 1}r' in output
+        assert '\x1b[1;20r' in output
+        assert 'Line 1 ' not in output
+
+        expected, expected_screen = self.create_window(monkeypatch, scroll=1)
+        for y in range(20):
+            assert screen.row_text(y) == expected_screen.row_text(y)
+
+    def test_scroll_up_uses_reverse_index(self, monkeypatch):
+        """Test that scrolling up inserts the exposed line at the top."""
+        window, screen = self.create_window(monkeypatch, scroll=5)
+        window.handle_input(self.key('KEY_UP'))
+        window.draw()
+        output = self.output.getvalue()
+        assert '\x1bM' in output
+        assert 'Line 4' in output
+
+        expected, expected_screen = self.create_window(monkeypatch, scroll=4)
+        for y in range(20):
+            assert screen.row_text(y) == expected_screen.row_text(y)
+
+    def test_page_scroll_redraws_fully(self, monkeypatch):
+        """Test that scrolling a whole page falls back to a full redraw."""
+        window, screen = self.create_window(monkeypatch)
+        window.handle_input(self.key('KEY_PGDOWN'))
+        assert window.redraw is True
+        assert window._pending_scroll == 0
+
+    def test_redraw_is_one_write(self, monkeypatch):
+        """Test that the border pass is not flushed apart from the text."""
+        term = create_xterm(monkeypatch, 60, 20)
+        window = TextWindow(text="\n".join(f"Line {i}" for i in range(100)), term=term)
+        writer = Mock(wraps=FrameWriter(io.StringIO()), encoding='utf-8')
+        window.controller = Mock(screen=Screen(term, writer=writer))
+        window.draw()
+        assert writer.write.call_count == 1
+        window.redraw = True
+        window.draw()
+        assert writer.write.call_count == 1
+
+    def test_pending_full_redraw_wins(self, monkeypatch):
+        """Test that a full redraw request is not reduced to a scroll."""
+        window, screen = self.create_window(monkeypatch)
+        window.redraw = True
+        window.handle_input(self.key('KEY_DOWN'))
+        window.draw()
+        assert window.damage == [window.rect]
+        assert not re.search(r'\x1b\[\d+;\d+r', self.output.getvalue())
+
+
+class TestTextWindowLazyWrapping:
+    """Tests for viewport-driven wrapping."""
+
+    TEXT = "\n".join(f"Line {i} " + "lorem ipsum " * (i % 12) for i in range(20000))
+
+    def test_construction_wraps_only_first_page(self):
+        """Test that a huge text is not wrapped up front."""
+        window = TextWindow(text=self.TEXT, term=create_mock_terminal(80, 24))
+        assert not window._lines.complete
+        assert window._lines.indexed < 100
+
+    def test_draw_wraps_viewport(self):
+        """Test that scrolling deep into the text indexes up to the viewport."""
+        window = TextWindow(text=self.TEXT, term=create_mock_terminal(80, 24))
+        window.scroll = 500
+        window.draw()
+        assert window._lines.known_rows >= 500 + window.content.height
+        assert not window._lines.complete
+
+    def create_managed_window(self):
+        controller = WindowController(
+            term=create_mock_terminal(80, 24), register_resize_handler=False
+        )
+        controller.screen.writer = Mock(spec=FrameWriter)
+        window = TextWindow(text=self.TEXT, term=controller.term)
+        controller.push_window(window)
+        return controller, window
+
+    def test_controller_finishes_index_on_worker(self):
+        """Test that a worker thread completes the index and reports progress to the loop."""
+        controller, window = self.create_managed_window()
+        controller._redraw_top(force=True)
+        assert window.status_bar.startswith('[Loading ')
+        job, _ = window._indexing
+        job.result(5)
+        assert window._lines.complete
+        progress = [entry for entry in controller._posted if entry[0] == window._indexing_progress]
+        assert len(progress) == -(-20000 // TextWindow.INDEX_SLICE)
+        controller._run_due()
+        controller._redraw_top()
+        assert window._indexing is None
+        assert window.status_bar == '[Arrows/PgUp/PgDn=Scroll, Esc=Close]'
+        assert window.scroll_pos == 0
+
+    def test_resize_cancels_stale_job(self):
+        """Test that re-wrapping for a new width stops indexing the old wrap."""
+        controller, window = self.create_managed_window()
+        controller._executor = Mock()
+        controller._redraw_top(force=True)
+        old_lines = window._lines
+        job, stop = window._indexing
+        window.term = create_mock_terminal(60, 24)
+        job.cancel.assert_called_once_with()
+        assert stop.is_set()
+        assert window._indexing is None
+        window._index_in_background(old_lines, controller, stop)
+        assert old_lines.indexed < 100
+        controller._redraw_top()
+        assert window._indexing is not None
+        assert controller._executor.submit.call_args[0][1] is window._lines
+
+
+class TestTextWindowWrapCache:
+    """Tests for reusing wraps across resizes."""
+
+    def resize(self, window, width, height):
+        window.term = create_mock_terminal(width, height)
+
+    def test_height_change_reuses_wrap(self):
+        """Test that a resize keeping the width does not re-wrap."""
+        window = TextWindow(text="word " * 500, term=create_mock_terminal(80, 24))
+        lines = window._lines
+        self.resize(window, 80, 40)
+        assert window._lines is lines
+
+    def test_returning_to_width_reuses_wrap(self):
+        """Test that dragging the terminal edge back hits the cache."""
+        window = TextWindow(text="word " * 500, term=create_mock_terminal(80, 24))
+        lines = window._lines
+        self.resize(window, 60, 24)
+        assert window._lines is not lines
+        assert window._lines.width < lines.width
+        with patch('term_windows.textindex.wrap_spans') as mock_wrap:
+            self.resize(window, 80, 24)
+        assert window._lines is lines
+        mock_wrap.assert_not_called()
+
+    def test_cache_is_bounded(self):
+        """Test that only the most recent widths are kept."""
+        window = TextWindow(text="word " * 500, term=create_mock_terminal(80, 24))
+        for width in range(40, 80, 5):
+            self.resize(window, width, 24)
+        assert len(window._wrap_cache) == TextWindow.WRAP_CACHE_SIZE
+
+    def test_new_text_is_rewrapped(self):
+        """Test that replacing the text does not reuse a stale wrap."""
+        window = TextWindow(text="old text", term=create_mock_terminal(80, 24))
+        window.text = "new text"
+        window.handle_resize()
+        assert list(window._lines) == ["new text"]
+
+
+class TestTextWindowSearch:
+    """Tests for searching the text."""
+
+    TEXT = "\n".join(
+        f"Line {i} " + ("needle " if i % 50 == 7 else "") + "hay " * 30 for i in range(400)
+    )
+
+    @pytest.fixture
+    def window(self, monkeypatch):
+        term = create_xterm(monkeypatch, 60, 20)
+        window = TextWindow(text=self.TEXT, term=term)
+        window.controller = Mock(screen=Screen(term, writer=FrameWriter(io.StringIO())))
+        window.draw()
+        return window
+
+    def type(self, window, text):
+        for char in text:
+            window.handle_input(Keystroke(char))
+        window.handle_input(Keystroke('\n', code=343, name='KEY_ENTER'))
+
+    def row_of_hit(self, window):
+        return window._lines.row_of(window._search.hits[window._search_hit])
+
+    def test_prompt(self, window):
+        """Test that / opens a prompt in the status bar and Esc cancels it."""
+        window.handle_input(Keystroke('/'))
+        window.handle_input(Keystroke('n'))
+        window.handle_input(Keystroke('e'))
+        window.handle_input(Keystroke('x'))
+        window.handle_input(Keystroke('\x7f', code=263, name='KEY_BACKSPACE'))
+        window.draw()
+        assert window.status_bar == '[/ne]'
+        window.handle_input(Keystroke('\x1b', code=361, name='KEY_ESCAPE'))
+        assert not window.closed
+        assert window._search is None
+
+    def test_search_scrolls_to_hit(self, window):
+        """Test that a search moves the first hit into view and highlights it."""
+        self.type(window, '/needle')
+        assert window._search.complete
+        assert len(window._search) == 8
+        assert window._search_hit == 0
+        row = self.row_of_hit(window)
+        assert window._lines[row].startswith('Line 7 needle')
+        assert window.scroll <= row < window.scroll + window.content.height
+        window.draw()
+        assert window.status_bar.startswith('[/needle: 1/8, n/N=Next/Prev')
+        y = window.content.y + row - window.scroll
+        x = window.content.x + 1 + len('Line 7 ')
+        reverse = window.term.reverse
+        assert window.screen.cell(y, x) == ('n', reverse)
+        assert window.screen.cell(y, x - 1) == (' ', '')
+
+    def test_next_and_previous(self, window):
+        """Test that n and N step through the hits and wrap around."""
+        self.type(window, '/needle')
+        window.handle_input(Keystroke('n'))
+        assert window._search_hit == 1
+        assert window._lines[self.row_of_hit(window)].startswith('Line 57 needle')
+        window.handle_input(Keystroke('N'))
+        window.handle_input(Keystroke('N'))
+        assert window._search_hit == 7
+        window.handle_input(Keystroke('n'))
+        assert window._search_hit == 0
+
+    def test_hits_survive_resize(self, window):
+        """Test that hits are mapped to rows of the new wrap after a resize."""
+        self.type(window, '/needle')
+        window.handle_input(Keystroke('n'))
+        window.term = create_mock_terminal(40, 20)
+        assert window._lines[self.row_of_hit(window)].startswith('Line 57 needle')
+
+    def test_not_found(self, window):
+        """Test the status of a search without hits."""
+        self.type(window, '/pin')
+        window.draw()
+        assert window.status_bar.startswith('[/pin: not found, ')
+        assert window.scroll == 0
+
+    def test_search_streams_on_worker(self, window):
+        """Test that a long text is searched in the background and the first hit shown once found."""
+        window.controller.submit = Mock()
+        window.scroll = window._lines.first_row(300)
+        with patch.object(TextSearch, 'CHUNK_CHARS', 1000):
+            self.type(window, '/needle')
+            search = window._search
+            assert not search.complete
+            assert window._search_hit is None
+            fn, _, controller, stop = window.controller.submit.call_args[0]
+            fn(search, controller, stop)
+        assert search.complete
+        for callback, *args in (call.args for call in window.controller.post.call_args_list):
+            callback(*args)
+        assert window._search_hit == 6
+        assert window._lines[self.row_of_hit(window)].startswith('Line 307 needle')
+
+
+class TestTextWindowNoWrap:
+    """Tests for showing lines whole and scrolling sideways."""
+
+    TEXT = "\n".join(f"{i:<4}|" + "".join(f"col{c:02} " for c in range(30)) for i in range(100))
+
+    def key(self, name):
+        key = Mock(spec=Keystroke)
+        key.name = name
+        return key
+
+    def row(self, window, i):
+        row = window.screen.row_text(window.content.y + i)
+        return row[window.content.x + 1:window.content.x + window.content.width - 1]
+
+    def test_lines_are_not_wrapped(self):
+        """Test that each source line is one row."""
+        window = TextWindow(self.TEXT, wrap=False, term=create_mock_terminal(80, 24))
+        assert len(window._lines) == 100
+        assert window._lines[3] == self.TEXT.splitlines()[3]
+        window.draw()
+        assert self.row(window, 0) == self.TEXT.splitlines()[0][:window.content.width - 2]
+
+    def test_resize_keeps_index(self):
+        """Test that a resize does not re-index unwrapped text."""
+        window = TextWindow(self.TEXT, wrap=False, term=create_mock_terminal(80, 24))
+        lines = window._lines
+        window.term = create_mock_terminal(50, 30)
+        assert window._lines is lines
+
+    def test_horizontal_scroll(self):
+        """Test that the arrows move the visible columns and redraw only the text area."""
+        window = TextWindow(self.TEXT, wrap=False, term=create_mock_terminal(80, 24))
+        window.draw()
+        window.handle_input(self.key('KEY_RIGHT'))
+        assert window.hscroll == TextWindow.HSCROLL_STEP
+        assert window._damage == [Dimensions(
+            window.content.x, window.content.y, window.content.width, window.content.height
+        )]
+        window.draw()
+        width = window.content.width - 2
+        assert self.row(window, 0) == self.TEXT.splitlines()[0][8:8 + width]
+        window.handle_input(self.key('KEY_LEFT'))
+        window.handle_input(self.key('KEY_LEFT'))
+        assert window.hscroll == 0
+
+    def test_horizontal_scroll_stops_at_longest_row(self):
+        """Test that scrolling right stops once the end of the longest visible row is shown."""
+        window = TextWindow(self.TEXT, wrap=False, term=create_mock_terminal(80, 24))
+        for _ in range(100):
+            window.handle_input(self.key('KEY_RIGHT'))
+        assert window.hscroll == len(self.TEXT.splitlines()[0]) - (window.content.width - 2)
+
+    def test_wrapped_text_ignores_horizontal_keys(self):
+        """Test that wrapped text does not scroll sideways."""
+        window = TextWindow(self.TEXT, term=create_mock_terminal(80, 24))
+        window.handle_input(self.key('KEY_RIGHT'))
+        assert window.hscroll == 0
+
+    def test_search_scrolls_sideways(self):
+        """Test that a hit beyond the right edge is scrolled into view."""
+        window = TextWindow(self.TEXT, wrap=False, term=create_mock_terminal(80, 24))
+        window.search("col29")
+        column = self.TEXT.index("col29")
+        assert window.hscroll <= column < window.hscroll + window.content.width - 2
+
+
+class TestTextWindowAnsi:
+    """Tests for showing ANSI-styled text."""
+
+    def test_styles_are_drawn_as_cell_attributes(self, monkeypatch):
+        """Test that styled text is wrapped as plain text and drawn with its styles."""
+        term = create_xterm(monkeypatch, 40, 10)
+        text = "\x1b[31merror\x1b[0m: " + "word " * 10 + "\x1b[1;4mend\x1b[0m"
+        window = TextWindow(text, term=term)
+        output = io.StringIO()
+        window.controller = Mock(screen=Screen(term, writer=FrameWriter(output)))
+        assert window.text == "error: " + "word " * 10 + "end"
+        window.draw()
+        y, x = window.content.y, window.content.x + 1
+        assert window.screen.cell(y, x) == ('e', '\x1b[31m')
+        assert window.screen.cell(y, x + 5) == (':', '')
+        last = window._lines.known_rows - 1
+        assert window._lines[last].endswith("end")
+        end_x = x + len(window._lines[last]) - 3
+        assert window.screen.cell(y + last, end_x) == ('e', '\x1b[1;4m')
+        frame = output.getvalue()
+        assert frame.count('\x1b[31m') == 1
+        assert '\x1b[31merror' in frame
+
+    def test_replaced_text_is_parsed_again(self, monkeypatch):
+        """Test that setting text parses its styles and clears the search."""
+        term = create_xterm(monkeypatch, 40, 10)
+        window = TextWindow("\x1b[31mred\x1b[0m text", term=term)
+        window.search("red")
+        assert window._search_hit is not None
+        window.text = "\x1b[32mgreen\x1b[0m text"
+        assert window.text == "green text"
+        assert window._search is None and window._search_hit is None
+        window.controller = Mock(screen=Screen(term, writer=FrameWriter(io.StringIO())))
+        window.handle_resize()
+        window.draw()
+        y, x = window.content.y, window.content.x + 1
+        assert window.screen.cell(y, x) == ('g', '\x1b[32m')
+        assert window.screen.cell(y, x + 5) == (' ', '')
+        window.text = "plain"
+        assert window.styles is None
+
+
+class TestTextWindowWideCharacters:
+    """Tests for measuring text in display columns."""
+
+    @pytest.fixture
+    def term(self, monkeypatch):
+        return create_xterm(monkeypatch, 40, 12)
+
+    def test_wide_text_wraps_inside_the_border(self, term):
+        """Test that CJK rows are wrapped to the content width in columns."""
+        window = TextWindow("日本語のテキスト" * 6, term=term)
+        window.draw()
+        width = window.content.width - 2
+        assert window._lines[0] == "日本語のテキスト" * 2
+        assert width == 32
+        right = window.position.x + window.position.width - 1
+        for row in range(window.content.height):
+            assert window.screen.cell(window.content.y + row, right)[0] in '|=^v'
+        assert window._lines.max_length() == width
+
+    def test_sideways_scroll_blanks_cut_characters(self, term):
+        """Test that a wide character half scrolled out of view shows as a space."""
+        window = TextWindow("一二三四五六七八九十" * 4, term=term, wrap=False)
+        window.hscroll = 3
+        window.draw()
+        y, x = window.content.y, window.content.x + 1
+        assert window.screen.cell(y, x) == (' ', '')
+        assert window.screen.cell(y, x + 1) == ('三', '')
+        assert window.screen.cell(y, x + 2) == ('', '')
@@ -0,0 +1,182 @@
+"""Tests for WrapIndex and LogIndex classes."""
+
+import textwrap
+
+import pytest
+from term_windows import LogIndex, WrapIndex
+
+
+def wrap_all(text, width):
+    """Wrap text the way TextWindow always has, eagerly."""
+    rows = []
+    for line in text.splitlines() or ['']:
+        rows.extend(textwrap.wrap(line, width) or [''])
+    return rows
+
+
+SAMPLE = "\n".join(
+    ("word " * (i % 17)) + f"line {i}" for i in range(300)
+) + "\n\nlast"
+
+
+class TestWrapIndex:
+    """Tests for the WrapIndex class."""
+
+    def test_rows_match_textwrap(self):
+        """Test that the lazy rows equal eagerly wrapped text."""
+        index = WrapIndex(SAMPLE, 20)
+        assert list(index) == wrap_all(SAMPLE, 20)
+        assert len(index) == len(wrap_all(SAMPLE, 20))
+
+    def test_random_access_indexes_only_what_is_needed(self):
+        """Test that looking up a row indexes just enough source lines."""
+        index = WrapIndex(SAMPLE, 20)
+        expected = wrap_all(SAMPLE, 20)
+        assert index[10] == expected[10]
+        assert not index.complete
+        assert index.indexed < 100
+        assert index[len(expected) - 1] == expected[-1]
+
+    def test_locate_and_first_row(self):
+        """Test mapping between wrapped rows and source lines."""
+        index = WrapIndex("a\nb b b b b b\nc", 3)
+        assert index.first_row(1) == 1
+        assert index.first_row(2) == 4
+        assert index.locate(2) == (1, 1)
+        with pytest.raises(IndexError):
+            index.locate(5)
+
+    def test_estimate_is_refined_by_indexing(self):
+        """Test that the row estimate becomes exact once indexing finishes."""
+        index = WrapIndex(SAMPLE, 20)
+        index.ensure_rows(30)
+        assert index.estimated_rows() >= index.known_rows
+        while index.index_more(50):
+            pass
+        assert index.estimated_rows() == len(wrap_all(SAMPLE, 20))
+
+    def test_empty_text_has_one_row(self):
+        """Test that empty text still shows one blank row."""
+        index = WrapIndex("", 10)
+        assert list(index) == ['']
+
+    def test_max_length(self):
+        """Test the bound used to size windows to their content."""
+        index = WrapIndex("ab\nabcd", 10)
+        assert index.max_length() == 10
+        len(index)
+        assert index.max_length() == 4
+        assert WrapIndex("a" * 30, 10).max_length() == 10
+
+    def test_rows_are_offsets(self):
+        """Test that rows are stored as offsets and sliced on lookup."""
+        text = "alpha beta gamma\n\ndelta"
+        index = WrapIndex(text, 11)
+        len(index)
+        assert index._rows.typecode == 'Q'
+        assert list(index._rows) == [0, 10, 11, 16, 17, 17, 18, 23]
+        assert index.row_span(1) == (11, 16)
+        assert index[3] == "delta"
+
+    def test_tabs_are_expanded(self):
+        """Test that tab stops are expanded before wrapping."""
+        assert list(WrapIndex("a\tb", 20)) == ["a       b"]
+
+    def test_row_of(self):
+        """Test mapping text offsets back to wrapped rows."""
+        index = WrapIndex(SAMPLE, 20)
+        text = index.expanded_text
+        for row in (0, 5, 100, len(index) - 1):
+            start, end = index.row_span(row)
+            assert index.row_of(start) == row
+            assert index.row_of(end - 1) == row
+        assert index.row_of(text.index("last")) == len(index) - 1
+        assert index.row_of(text.index("line 298\n") + 9) == index.first_row(299)
+
+
+class TestLogIndex:
+    """Tests for the LogIndex class."""
+
+    def test_appends_match_wrapping_the_whole_text(self):
+        """Test that text appended in pieces wraps like the joined text."""
+        index = LogIndex("", 20)
+        for start in range(0, len(SAMPLE), 37):
+            index.append(SAMPLE[start:start + 37])
+        assert list(index) == wrap_all(SAMPLE, 20)
+
+    def test_append_returns_first_changed_row(self):
+        """Test that only the open last line is wrapped again."""
+        index = LogIndex("", 10)
+        assert index.append("one\ntwo") == 0
+        assert list(index) == ["one", "two"]
+        assert index.append(" three four") == 1
+        assert list(index) == ["one", "two three", "four"]
+        assert index.append("\nfive\n") == 1
+        assert index.append("six") == 4
+        assert list(index) == ["one", "two three", "four", "five", "six"]
+
+    def test_append_wraps_only_new_lines(self):
+        """Test that appending does not touch rows already wrapped."""
+        index = LogIndex("", 10)
+        index.append("a b c d e f g h\n" * 100)
+        rows = index._rows
+        index.append("tail\n")
+        assert index._rows is rows
+        assert index[index.known_rows - 1] == "tail"
+
+    def test_with_width_indexes_lazily(self):
+        """Test that a new width re-wraps the same lines from the top."""
+        index = LogIndex("", 80)
+        index.append(SAMPLE)
+        narrow = index.with_width(20)
+        assert narrow.indexed == 0
+        assert narrow[0] == wrap_all(SAMPLE, 20)[0]
+        assert not narrow.complete
+        narrow.append("more\n")
+        assert list(narrow) == wrap_all(SAMPLE + "more", 20)
+
+    def test_text(self):
+        """Test that the text is joined back together."""
+        index = LogIndex("", 10)
+        index.append("one\ntwo\n")
+        assert index.text == "one\ntwo\n"
+        index.append("three")
+        assert index.text == "one\ntwo\nthree"
+
+    def test_max_lines_evicts_oldest(self):
+        """Test that a line-bounded index keeps only the newest lines."""
+        index = LogIndex("", 10, max_lines=3)
+        index.append("".join(f"line {i}\n" for i in range(10)))
+        assert list(index) == ["line 7", "line 8", "line 9"]
+        assert index.dropped_rows == 0
+        assert index.append("line 10\n") == 2
+        assert list(index) == ["line 8", "line 9", "line 10"]
+        assert index.dropped_rows == 1
+        assert index.locate(2) == (2, 0)
+
+    def test_max_bytes_evicts_oldest(self):
+        """Test that a byte-bounded index counts UTF-8 bytes and line breaks."""
+        index = LogIndex("", 80, max_bytes=12)
+        index.append("aaaa\nébb\ncccc\n")
+        assert list(index) == ["ébb", "cccc"]
+        index.append("a very long line\n")
+        assert list(index) == ["a very long line"]
+
+    def test_eviction_compacts_storage(self):
+        """Test that evicted lines are released in batches."""
+        index = LogIndex("", 10, max_lines=100)
+        for i in range(1000):
+            index.append(f"word word word {i}\n")
+        assert index.source_lines == 100
+        assert len(index._source) <= 200
+        assert len(index._rows) <= 2 * 2 * index.known_rows
+        assert list(index)[-2:] == ["word word", "word 999"]
+
+    def test_eviction_while_indexing(self):
+        """Test that lines evicted before they are wrapped are skipped."""
+        index = LogIndex("".join(f"line {i}\n" for i in range(100)), 10, max_lines=50)
+        index = index.with_width(4)
+        index.append("".join(f"new {i}\n" for i in range(40)))
+        assert not index.complete
+        kept = [f"line {i}" for i in range(90, 100)] + [f"new {i}" for i in range(40)]
+        assert list(index) == [row for line in kept for row in line.split()]
@@ -123,9 +123,8 @@ class TestWindow:
         window.draw()
         assert window.redraw is False
     
-    @patch('builtins.print')
-    def test_draw_with_border(self, mock_print):
-        """Test that draw() draws border when border is True."""
+    def test_draw_with_border(self):
+        """Test that draw() draws border into the screen when border is True."""
         # Create a mock terminal with required attributes
         term = Mock(spec=Terminal)
         term.move = Mock(return_value='')
@@ -139,15 +138,34 @@ class TestWindow:
             term=term
         )
         
-        # Calculate expected content height
-        content_height = window.content.height
+        with patch('builtins.print'):
+            window.draw()
         
-        window.draw()
-        
-        # Should have called print multiple times (top border, bottom border, sides)
-        assert mock_print.call_count >= content_height + 2
+        screen = window.screen
+        top = screen.row_text(window.position.y)
+        bottom = screen.row_text(window.position.y + window.position.height - 1)
+        left, right = window.position.x, window.position.x + window.position.width - 1
+        assert top[left] == '+' and top[right] == '+'
+        assert ' Test ' in top
+        assert '[Esc=Close]' in bottom
+        for row in range(window.content.height):
+            line = screen.row_text(window.content.y + row)
+            assert line[left] == '|' and line[right] == '|'
         assert window.redraw is False
     
+    def test_wide_title_is_centered_by_columns(self):
+        """Test that a CJK title is centered without pushing out the corner."""
+        term = Mock(spec=Terminal)
+        term.move = Mock(return_value='')
+        term.width = 80
+        term.height = 24
+        window = Window(title="日本語", width=20, height=6, term=term)
+        window.draw()
+        screen = window.screen
+        assert screen.row_text(window.position.y).strip() == '+----- 日本語 -----+'
+        right = window.position.x + window.position.width - 1
+        assert screen.cell(window.position.y, right) == ('+', '')
+
     def test_child_window_assignment(self):
         """Test that child windows can be assigned."""
         term = Terminal()
@@ -190,3 +208,71 @@ class TestWindow:
         assert window.content.width == window.position.width
         assert window.content.height == window.position.height
 
+
+
+class TestInvalidate:
+    """Tests for dirty-rectangle invalidation."""
+
+    def create_window(self):
+        term = Mock(spec=Terminal)
+        term.move = Mock(return_value='')
+        term.width = 40
+        term.height = 12
+        window = Window(title="Test", width=20, height=8, x=0, y=0, term=term)
+        window.draw()
+        return window
+
+    def test_redraw_flag_means_full_damage(self):
+        """Test that setting redraw repaints the whole window."""
+        window = self.create_window()
+        window.redraw = True
+        window.draw()
+        assert window.damage == [Dimensions(0, 0, 20, 8)]
+        assert window.redraw is False
+
+    def test_invalidate_none_is_full_redraw(self):
+        """Test that invalidate() without a rect repaints everything."""
+        window = self.create_window()
+        window.invalidate(Dimensions(2, 2, 3, 1))
+        window.invalidate()
+        window.draw()
+        assert window.damage == [window.rect]
+
+    def test_invalidate_rect(self):
+        """Test that invalidate(rect) limits damage to that rect."""
+        window = self.create_window()
+        window.invalidate(Dimensions(2, 7, 5, 1))
+        assert window.redraw is True
+        window.draw()
+        assert window.damage == [Dimensions(2, 7, 5, 1)]
+        assert window.is_damaged(Dimensions(0, 7, 20, 1))
+        assert not window.is_damaged(Dimensions(0, 3, 20, 1))
+
+    def test_overlapping_rects_are_merged(self):
+        """Test that overlapping and adjacent rects collapse into one."""
+        window = self.create_window()
+        window.invalidate(Dimensions(0, 0, 5, 1))
+        window.invalidate(Dimensions(5, 0, 5, 1))
+        window.invalidate(Dimensions(8, 0, 4, 2))
+        window.invalidate(Dimensions(0, 6, 2, 2))
+        window.draw()
+        assert window.damage == [Dimensions(0, 0, 12, 2), Dimensions(0, 6, 2, 2)]
+
+    def test_partial_draw_only_touches_damage(self):
+        """Test that draw() leaves undamaged cells alone."""
+        window = self.create_window()
+        screen = window.screen
+        screen.put(3, 5, 'keep')
+        window.status_bar = 'Clock 12:00'
+        window.invalidate(Dimensions(0, 7, 20, 1))
+        window.draw()
+        assert 'Clock 12:00' in screen.row_text(7)
+        assert screen.row_text(3)[5:9] == 'keep'
+
+    def test_redraw_after_invalidate_is_full(self):
+        """Test that an explicit redraw overrides pending partial damage."""
+        window = self.create_window()
+        window.invalidate(Dimensions(2, 7, 5, 1))
+        window.redraw = True
+        window.draw()
+        assert window.damage == [window.rect]
@@ -0,0 +1,88 @@
+"""Tests for the text wrapping engine."""
+
+import random
+import textwrap
+
+import pytest
+from term_windows import line_spans, wrap, wrap_spans
+
+
+CASES = [
+    "",
+    "   ",
+    "short",
+    "trailing spaces   ",
+    "   leading spaces kept on the first row only",
+    "The quick brown fox jumps over the lazy dog " * 3,
+    "a well-known self-referential hyphen-heavy sentence",
+    "em--dashes--between words -- and alone",
+    "Supercalifragilisticexpialidocious antidisestablishmentarianism",
+    "---- ---x x---- a-b-c-d-e-f-g-h",
+    "mixed\twhitespace\x0bcharacters\rhere",
+    "non\xa0breaking\u2003spaces \xa0",
+]
+
+
+class TestWrap:
+    """Tests for wrap() and wrap_spans()."""
+
+    @pytest.mark.parametrize('text', CASES)
+    @pytest.mark.parametrize('width', [1, 2, 5, 8, 13, 40])
+    def test_matches_textwrap(self, text, width):
+        """Test that rows equal textwrap's for the same input."""
+        assert wrap(text, width) == textwrap.wrap(text, width, expand_tabs=False)
+
+    def test_matches_textwrap_on_random_text(self):
+        """Test agreement on randomly assembled words and separators."""
+        rng = random.Random(1234)
+        pieces = ['a', 'bc', '-', '--', ' ', '  ', 'x-y', 'well-known', '.', ',', '\xa0', '9']
+        for _ in range(2000):
+            text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 40)))
+            width = rng.randint(1, 20)
+            assert wrap(text, width) == textwrap.wrap(text, width), (text, width)
+
+    def test_spans_are_offsets_into_text(self):
+        """Test that spans slice the original text."""
+        text = "alpha beta gamma delta"
+        spans = wrap_spans(text, 11)
+        assert spans.typecode == 'Q'
+        rows = [text[spans[i]:spans[i + 1]] for i in range(0, len(spans), 2)]
+        assert rows == ["alpha beta", "gamma delta"]
+
+    def test_spans_of_a_slice(self):
+        """Test wrapping part of a text and appending to an array."""
+        text = "skip|one two three|skip"
+        spans = wrap_spans(text, 7, 5, 18)
+        wrap_spans(text, 7, 0, 4, out=spans)
+        assert list(spans) == [5, 12, 13, 18, 0, 4]
+
+    def test_wide_characters_take_two_columns(self):
+        """Test that rows are measured in display columns."""
+        assert wrap("日本語の テキスト", 6) == ["日本語", "の テ", "キスト"]
+        assert wrap("日本", 1) == ["日", "本"]
+        assert wrap("ab日", 3) == ["ab", "日"]
+
+    def test_combining_marks_stay_with_their_character(self):
+        """Test that zero-width marks neither take columns nor start rows."""
+        text = "e\u0301" * 4
+        assert wrap(text, 2) == ["e\u0301e\u0301", "e\u0301e\u0301"]
+
+    def test_invalid_width(self):
+        """Test that a non-positive width is rejected like textwrap does."""
+        with pytest.raises(ValueError):
+            wrap("text", 0)
+
+
+class TestLineSpans:
+    """Tests for line_spans()."""
+
+    @pytest.mark.parametrize('text', [
+        "", "\n", "a", "a\n", "a\nb", "a\r\nb\rc\n\nd", "x\x0by\x0cz\x1c w\x85",
+    ])
+    def test_matches_splitlines(self, text):
+        """Test that lines are split exactly as str.splitlines() splits them."""
+        assert [text[start:end] for start, end in line_spans(text)] == text.splitlines()
+
+    def test_range(self):
+        """Test splitting only part of a text."""
+        assert list(line_spans("ab\ncd\nef", 3, 8)) == [(3, 5), (6, 8)]